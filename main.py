@@ -3,7 +3,13 @@ import argparse
 
 from solana_due_diligence.config import load_config
 from solana_due_diligence.analysis import analyze_once
-from solana_due_diligence.streaming.controller import StreamController
+from solana_due_diligence.batch.runner import BatchRunner, read_mints
+from solana_due_diligence.log import setup_logging
+from solana_due_diligence.market.watch import run_watch
+from solana_due_diligence.profiling import enable_profiling
+from solana_due_diligence.providers.cassette import install_cassette
+from solana_due_diligence.server.app import run_server
+from solana_due_diligence.streaming.supervisor import create_controller
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -15,14 +21,48 @@ def build_parser() -> argparse.ArgumentParser:
     run.add_argument("--symbol", dest="symbol", default=None, help="Optional symbol override for report file naming")
     run.add_argument("--config", dest="config_path", default="config.yaml", help="Path to config.yaml")
     run.add_argument("--no-telegram", action="store_true", help="Do not send Telegram notifications")
+    _add_cassette_args(run)
+    _add_profile_arg(run)
+
+    batch = sub.add_parser("batch", help="Analyze a list of tokens with checkpointing and resume")
+    batch.add_argument("file", help="File with one mint per line, or '-' for stdin")
+    batch.add_argument("--config", dest="config_path", default="config.yaml", help="Path to config.yaml")
+    batch.add_argument("--concurrency", type=int, default=None, help="Tokens analyzed in parallel (default: batch.concurrency)")
+    batch.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <file>.checkpoint.jsonl)")
+    batch.add_argument("--no-telegram", action="store_true", help="Do not send Telegram notifications")
+    _add_cassette_args(batch)
+    _add_profile_arg(batch)
+
+    watch = sub.add_parser("watch", help="Track price/liquidity of a list of tokens and alert on threshold crossings")
+    watch.add_argument("file", help="File with one mint per line, or '-' for stdin")
+    watch.add_argument("--config", dest="config_path", default="config.yaml", help="Path to config.yaml")
+
+    serve = sub.add_parser("serve", help="Serve analysis, cached reports and signals over a local HTTP API")
+    serve.add_argument("--config", dest="config_path", default="config.yaml", help="Path to config.yaml")
+    serve.add_argument("--host", default=None, help="Bind address (default: server.host)")
+    serve.add_argument("--port", type=int, default=None, help="Port (default: server.port)")
 
     stream = sub.add_parser("stream", help="Stream new tokens (Bitquery)")
-    stream.add_argument("action", choices=["start", "stop", "status"], help="Stream action")
+    stream.add_argument("action", choices=["start", "stop", "status", "pause", "resume"], help="Stream action")
     stream.add_argument("--config", dest="config_path", default="config.yaml", help="Path to config.yaml")
+    stream.add_argument("--workers", type=int, default=None, help="Analysis worker processes (default: stream.workers)")
+    stream.add_argument("--force", action="store_true", help="stop: SIGTERM right away instead of draining in-flight work")
+    _add_profile_arg(stream)
+    stream.add_argument("--memory-profile", action="store_true", help="Sample RSS/GC/tracemalloc and shed caches above memory.soft_limit_mb")
 
     return parser
 
 
+def _add_cassette_args(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="CASSETTE", default=None, help="Record every provider response to this cassette file")
+    group.add_argument("--replay", metavar="CASSETTE", default=None, help="Serve provider responses from this cassette, no network")
+    parser.add_argument("--replay-latency", action="store_true", default=None, help="Replay responses with their recorded latency")
+
+
+def _add_profile_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", nargs="?", type=float, const=-1.0, default=None, metavar="THRESHOLD_MS",
+                        help="Profile each token; keep profiles of tokens slower than THRESHOLD_MS (default: profiling.threshold_ms)")
 
 
 def main() -> None:
@@ -33,20 +73,52 @@ def main() -> None:
     command = args.command or "run"
 
     config = load_config(getattr(args, "config_path", "config.yaml"))
+    if getattr(args, "profile", None) is not None and command in ("run", "batch"):
+        enable_profiling(config, threshold_ms=args.profile)
+    if command != "stream":
+        # The stream controller sets logging up from its own (hot-reloaded) config
+        setup_logging(config)
+
+    cassette = None
+    if command in ("run", "batch"):
+        cassette = install_cassette(config, record=getattr(args, "record", None), replay=getattr(args, "replay", None),
+                                    replay_latency=getattr(args, "replay_latency", None))
+    # A replayed run never talks to the network, Telegram included
+    replaying = cassette is not None and cassette.mode == "replay"
 
     if command == "run":
-        analyze_once(config, args.token, symbol_for_filename=getattr(args, "symbol", None), notify=not getattr(args, "no_telegram", False))
+        analyze_once(config, args.token, symbol_for_filename=getattr(args, "symbol", None),
+                     notify=not getattr(args, "no_telegram", False) and not replaying)
+        return
+
+    if command == "batch":
+        checkpoint = args.checkpoint or ("batch.checkpoint.jsonl" if args.file == "-" else f"{args.file}.checkpoint.jsonl")
+        runner = BatchRunner(config, checkpoint, concurrency=args.concurrency, notify=not args.no_telegram and not replaying)
+        runner.run(read_mints(args.file))
+        return
+
+    if command == "watch":
+        run_watch(config, read_mints(args.file))
+        return
+
+    if command == "serve":
+        run_server(config, host=args.host, port=args.port)
         return
 
     if command == "stream":
-        controller = StreamController(args.config_path)
+        controller = create_controller(args.config_path, args.action, workers=args.workers, memory_profile=args.memory_profile,
+                                       profile=args.profile)
         action = args.action
         if action == "start":
             controller.start()
         elif action == "stop":
-            controller.stop()
+            controller.stop(force=args.force)
         elif action == "status":
             controller.status()
+        elif action == "pause":
+            controller.pause()
+        elif action == "resume":
+            controller.resume()
         return
 
 
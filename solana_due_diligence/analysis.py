@@ -3,25 +3,49 @@
 Core analysis functionality for the Solana Due Diligence Bot.
 """
 
-import json
+import logging
+import time
 from pathlib import Path
-from typing import Any, Dict
-
-from rich import print
+from typing import Any, Dict, List, Optional, Tuple
 
 from solana_due_diligence.market.analyzer import MarketAnalyzer
+from solana_due_diligence.reporting.models import TokenReport, encode_report
 from solana_due_diligence.reporting.report import ReportBuilder
 from solana_due_diligence.tokenomics.analyzer import TokenomicsAnalyzer
 from solana_due_diligence.security.analyzer import SecurityAnalyzer
 from solana_due_diligence.community.analyzer import CommunityAnalyzer
-from solana_due_diligence.developer.analyzer import DeveloperAnalyzer
+from solana_due_diligence.developer.analyzer import DeveloperAnalyzer, extract_creator
+from solana_due_diligence.developer.creator_index import classify_creator, get_creator_index
 from solana_due_diligence.github.analyzer import GitHubAnalyzer
+from solana_due_diligence.log import timed
 from solana_due_diligence.metrics.analyzer import MetricsAnalyzer
-from solana_due_diligence.signals.engine import evaluate_buy_signal
+from solana_due_diligence.metrics.holder_snapshots import HolderSnapshotStore, exclude_pools, fetch_largest_accounts, get_holder_snapshots
+from solana_due_diligence.pipeline import DEFAULT_TIERS, EXPENSIVE_STAGES
+from solana_due_diligence.signals.engine import evaluate_buy_signal, evaluate_gates
+from solana_due_diligence.signals.rules import get_rule_set
+from solana_due_diligence.notify.outbox import get_outbox
 from solana_due_diligence.notify.telegram import send_message
+from solana_due_diligence.profiling import get_profiler
+
+
+SKIPPED_GATE_FAILED = {"skipped": "gate failed"}
+SKIPPED_BLOCKLISTED = {"skipped": "blocklisted"}
+
+log = logging.getLogger(__name__)
 
 
-def analyze_once(config: Dict[str, Any], mint_or_symbol: str, symbol_for_filename: str | None = None, notify: bool = True) -> Dict[str, Any]:
+def tier_stages(config: Dict[str, Any], tier: str) -> Tuple[str, ...]:
+    """Expensive stages run by ``tier``; tokenomics, market and security always run."""
+    tiers = (config.get("pipeline") or {}).get("tiers") or {}
+    if tier in tiers:
+        return tuple(tiers[tier] or ())
+    if tier in DEFAULT_TIERS:
+        return DEFAULT_TIERS[tier]
+    raise ValueError(f"unknown analysis tier {tier!r}")
+
+
+def analyze_once(config: Dict[str, Any], mint_or_symbol: str, symbol_for_filename: str | None = None, notify: bool = True,
+                 tier: Optional[str] = None) -> Dict[str, Any]:
     """
     Perform comprehensive due diligence analysis on a single token.
     
@@ -30,76 +54,207 @@ def analyze_once(config: Dict[str, Any], mint_or_symbol: str, symbol_for_filenam
         mint_or_symbol: Token mint address or symbol
         symbol_for_filename: Optional symbol override for report file naming
         notify: Whether to send Telegram notifications
+        tier: Analysis tier (``minimal``, ``standard``, ``deep``); defaults to ``pipeline.tier``
         
     Returns:
         Dictionary containing complete analysis results
     """
+    profiler = get_profiler(config)
+    if profiler is None:
+        return _analyze(config, mint_or_symbol, symbol_for_filename, notify, tier)
+    with profiler.profile(mint_or_symbol):
+        return _analyze(config, mint_or_symbol, symbol_for_filename, notify, tier)
+
+
+def _analyze(config: Dict[str, Any], mint_or_symbol: str, symbol_for_filename: str | None, notify: bool,
+             tier: Optional[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
     output_dir = Path(config["report"]["output_dir"])  # type: ignore[index]
     output_dir.mkdir(parents=True, exist_ok=True)
 
     symbol_for_filename = symbol_for_filename or mint_or_symbol
+    pcfg = config.get("pipeline", {})
+    blocklist = set(pcfg.get("blocklist") or [])
+    tier = tier or pcfg.get("tier", "deep")
+    stages = tier_stages(config, tier)
 
+    report = ReportBuilder(config)
+
+    if mint_or_symbol in blocklist:
+        # Short-circuit before any provider call
+        gates = {"passed": False, "reasons": ["Token is blocklisted"]}
+        report_data = {"input": {"token": mint_or_symbol}, "gates": gates, "tier": tier}
+        for name in ("tokenomics", "market", "security") + EXPENSIVE_STAGES:
+            report_data[name] = dict(SKIPPED_BLOCKLISTED)
+        report_data["summary"] = report.summarize({}, {})
+        report_data["signal"] = dict(gates)
+        report_data = _write_report(config, report, TokenReport.from_dict(report_data), output_dir, symbol_for_filename)
+        log.warning("Skipped blocklisted token", extra={"mint": mint_or_symbol})
+        return report_data
+
+    # Stage 1: cheap data that the hard gates depend on
     tokenomics = TokenomicsAnalyzer(config)
-    tokenomics_result = tokenomics.analyze(mint_or_symbol)
+    with timed(log, "tokenomics", mint_or_symbol):
+        tokenomics_result = tokenomics.analyze(mint_or_symbol)
+    snapshots = get_holder_snapshots(config)
+    if snapshots is not None:
+        # First analysis is the launch baseline; re-checks and watch polls add to the series
+        _record_holders(config, snapshots, tokenomics_result.get("mint") or mint_or_symbol, tokenomics_result)
 
     market = MarketAnalyzer(config)
-    market_result = market.analyze(mint_or_symbol)
+    with timed(log, "market", mint_or_symbol):
+        market_result = market.analyze(mint_or_symbol)
 
     security = SecurityAnalyzer(config)
     security_result = security.analyze(tokenomics_result, market_result)
 
-    token_symbol = None
-    solscan_meta = tokenomics_result.get("solscan") or {}
-    meta = solscan_meta.get("meta") if isinstance(solscan_meta, dict) else {}
-    if isinstance(meta, dict):
-        token_symbol = meta.get("symbol") or meta.get("tokenSymbol")
+    thresholds = (config.get("signals") or {}).get("thresholds")
+    gates = evaluate_gates({"security": security_result}, thresholds)
+    creator = extract_creator(tokenomics_result)
+    if creator and creator in blocklist:
+        gates["reasons"].append("Creator is blocklisted")
+    creator_index = get_creator_index(config)
+    if creator and creator_index and pcfg.get("reject_known_ruggers", True):
+        if "creator_known_rugger" in classify_creator(creator_index.lookup(creator)):
+            gates["reasons"].append("Creator is a known rugger")
+    gates["passed"] = not gates["reasons"]
+    skip_expensive = not gates["passed"] and bool(pcfg.get("fail_fast", True))
 
-    community = CommunityAnalyzer(config)
-    community_result = community.analyze(mint_or_symbol, token_symbol=token_symbol)
+    # Stage 2: expensive enrichment, only for candidates that can still pass, and only what the tier runs
+    skipped_by_tier = {"skipped": f"{tier} tier"}
+    community_result = developer_result = github_result = metrics_result = None
+    if skip_expensive:
+        community_result = dict(SKIPPED_GATE_FAILED)
+        developer_result = dict(SKIPPED_GATE_FAILED)
+        github_result = dict(SKIPPED_GATE_FAILED)
+        metrics_result = dict(SKIPPED_GATE_FAILED)
+    else:
+        token_symbol = None
+        solscan_meta = tokenomics_result.get("solscan") or {}
+        meta = solscan_meta.get("meta") if isinstance(solscan_meta, dict) else {}
+        if isinstance(meta, dict):
+            token_symbol = meta.get("symbol") or meta.get("tokenSymbol")
 
-    developer = DeveloperAnalyzer(config)
-    developer_result = developer.analyze(tokenomics_result)
+        if "community" in stages:
+            community = CommunityAnalyzer(config)
+            with timed(log, "community", mint_or_symbol):
+                community_result = community.analyze(mint_or_symbol, token_symbol=token_symbol)
 
-    github = GitHubAnalyzer(config)
-    github_result = github.analyze(tokenomics_result)
+        if "developer" in stages:
+            developer = DeveloperAnalyzer(config)
+            with timed(log, "developer", mint_or_symbol):
+                developer_result = developer.analyze(tokenomics_result)
 
-    metrics = MetricsAnalyzer(config)
-    # decimals for concentration normalization
-    decimals = tokenomics_result.get("supply", {}).get("decimals")
-    metrics_result = metrics.analyze(mint_or_symbol, decimals)
+        if "github" in stages:
+            github = GitHubAnalyzer(config)
+            with timed(log, "github", mint_or_symbol):
+                github_result = github.analyze(tokenomics_result)
+
+        if "metrics" in stages:
+            metrics = MetricsAnalyzer(config)
+            # decimals for concentration normalization
+            decimals = tokenomics_result.get("supply", {}).get("decimals")
+            with timed(log, "metrics", mint_or_symbol):
+                metrics_result = metrics.analyze(mint_or_symbol, decimals, holders=_holder_sample(tokenomics_result),
+                                                 creator=creator, total_supply=tokenomics_result.get("supply", {}).get("amount"))
 
-    report = ReportBuilder(config)
     report_data = {
         "input": {"token": mint_or_symbol},
+        "gates": gates,
         "tokenomics": tokenomics_result,
         "market": market_result,
         "security": security_result,
-        "community": community_result,
-        "developer": developer_result,
-        "github": github_result,
-        "metrics": metrics_result,
+        "community": community_result if community_result is not None else dict(skipped_by_tier),
+        "developer": developer_result if developer_result is not None else dict(skipped_by_tier),
+        "github": github_result if github_result is not None else dict(skipped_by_tier),
+        "metrics": metrics_result if metrics_result is not None else dict(skipped_by_tier),
         "summary": report.summarize(tokenomics_result, market_result),
+        "tier": tier,
     }
 
+    sig = evaluate_buy_signal(report_data, thresholds)
+    for reason in gates["reasons"]:
+        if reason not in sig["reasons"]:
+            sig["passed"] = False
+            sig["reasons"].append(reason)
+    report_data["signal"] = sig
+    rules = get_rule_set(config)
+    matched = rules.matching(report_data) if rules else []
+    report_data["profiles"] = [p.name for p in matched]
+
+    # The typed model keeps only the fields reports, signals and history use
+    report_data = _write_report(config, report, TokenReport.from_dict(report_data), output_dir, symbol_for_filename)
+
+    # Optional Telegram
+    if creator_index and creator:
+        creator_index.record_outcome(tokenomics_result["mint"], "signal_passed" if sig["passed"] else "signal_failed")
+    tcfg = config.get("telegram", {})
+    can_notify = notify and tcfg.get("enabled") and tcfg.get("bot_token")
+    label = symbol_for_filename or mint_or_symbol
+    if not sig["passed"]:
+        log.info("Signal not passed: %s", ", ".join(sig["reasons"]), extra={"mint": mint_or_symbol})
+    elif can_notify and tcfg.get("chat_id"):
+        _notify(config, tcfg.get("chat_id"), f"Buy signal for {label}: reasons OK")
+    if matched:
+        log.info("Matched profiles: %s", ", ".join(p.name for p in matched), extra={"mint": mint_or_symbol})
+    if can_notify and matched:
+        # One message per target, naming every profile routed there
+        targets: Dict[str, List[str]] = {}
+        for p in matched:
+            chat_id = p.chat_id or tcfg.get("chat_id")
+            if chat_id:
+                targets.setdefault(str(chat_id), []).append(p.name)
+        for chat_id, names in targets.items():
+            _notify(config, chat_id, f"Signal profile match for {label}: {', '.join(names)}")
+
+    log.info("Analysis done", extra={"mint": mint_or_symbol, "stage": "analysis", "passed": sig["passed"], "tier": tier,
+                                     "latency_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    return report_data
+
+
+def _notify(config: Dict[str, Any], chat_id: str, text: str) -> None:
+    outbox = get_outbox(config)
+    if outbox:
+        outbox.enqueue(chat_id, text)
+        log.info("Telegram notification queued", extra={"chat_id": chat_id})
+    elif send_message(config["telegram"].get("bot_token"), chat_id, text):
+        log.info("Telegram notification sent", extra={"chat_id": chat_id})
+    else:
+        log.error("Telegram notification failed", extra={"chat_id": chat_id})
+
+
+def _holder_sample(tokenomics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Solscan holders carry owner wallets; RPC largest accounts are token accounts the cluster analyzer resolves
+    solscan = tokenomics.get("solscan") or {}
+    sample = [{"owner": h.get("owner"), "amount": h.get("amount")} for h in solscan.get("holders_sample") or [] if h.get("owner")]
+    return sample or [{"address": h.get("address"), "amount": h.get("amount")} for h in tokenomics.get("top_holders_sample") or []]
+
+
+def _record_holders(config: Dict[str, Any], snapshots: HolderSnapshotStore, mint: str, tokenomics: Dict[str, Any]) -> None:
+    # Watch polls record RPC token accounts, so the baseline must be token accounts too (Solscan samples are owners)
+    holders = tokenomics.get("top_holders_sample")
+    try:
+        holders = exclude_pools(mint, holders) if holders else fetch_largest_accounts(config, [mint]).get(mint)
+    except Exception as e:
+        log.warning("Holder baseline unavailable: %s", e, extra={"mint": mint})
+        return
+    if holders:
+        snapshots.record(mint, holders)
+
+
+def _write_report(config: Dict[str, Any], report: ReportBuilder, model: TokenReport, output_dir: Path, symbol_for_filename: str) -> Dict[str, Any]:
     json_path = output_dir / f"{symbol_for_filename}.json"
     md_path = output_dir / f"{symbol_for_filename}.md"
+    report_data = model.to_dict()
 
     if config["report"].get("include_json", True):  # type: ignore[call-arg]
-        json_path.write_text(json.dumps(report_data, indent=2))
-        print(f"[green]Wrote[/green] {json_path}")
+        indent = 2 if config["report"].get("pretty_json", False) else None  # type: ignore[call-arg]
+        json_path.write_bytes(encode_report(model, indent=indent))
+        log.info("Wrote %s", json_path)
 
     if config["report"].get("include_markdown", True):  # type: ignore[call-arg]
         md_path.write_text(report.to_markdown(report_data))
-        print(f"[green]Wrote[/green] {md_path}")
-
-    # Optional buy-signal + Telegram
-    sig = evaluate_buy_signal(report_data)
-    tcfg = config.get("telegram", {})
-    if not sig["passed"]:
-        print(f"[yellow]Signal not passed:[/yellow] {', '.join(sig['reasons'])}")
-    elif notify and tcfg.get("enabled") and tcfg.get("bot_token") and tcfg.get("chat_id"):
-        text = f"Buy signal for {symbol_for_filename or mint_or_symbol}: reasons OK"
-        send_message(tcfg.get("bot_token"), tcfg.get("chat_id"), text)
-        print("[green]Telegram notification sent[/green]")
+        log.info("Wrote %s", md_path)
 
     return report_data
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from solana_due_diligence.analysis import analyze_once
+
+
+STAGES = ("tokenomics", "market", "security", "community", "developer", "github", "metrics")
+
+log = logging.getLogger(__name__)
+
+
+def read_mints(source: str) -> List[str]:
+    """Read mints from a file path, or from stdin when ``source`` is '-'. Order is kept, duplicates dropped."""
+    if source == "-":
+        lines: Iterable[str] = sys.stdin.read().splitlines()
+    else:
+        lines = Path(source).read_text().splitlines()
+    seen: Set[str] = set()
+    mints: List[str] = []
+    for line in lines:
+        mint = line.split("#", 1)[0].strip()
+        if mint and mint not in seen:
+            seen.add(mint)
+            mints.append(mint)
+    return mints
+
+
+def stage_results(report_data: Dict[str, Any]) -> Dict[str, str]:
+    results: Dict[str, str] = {}
+    for name in STAGES:
+        section = report_data.get(name)
+        if isinstance(section, dict) and section.get("skipped"):
+            results[name] = f"skipped: {section['skipped']}"
+        else:
+            results[name] = "ok"
+    return results
+
+
+class BatchRunner:
+    def __init__(self, config: Dict[str, Any], checkpoint_path: str | Path, concurrency: Optional[int] = None,
+                 notify: bool = True) -> None:
+        self.config = config
+        bcfg = config.get("batch", {})
+        self.concurrency = max(1, int(concurrency or bcfg.get("concurrency", 4)))
+        self.checkpoint_path = Path(checkpoint_path)
+        self.notify = notify
+        self._lock = threading.Lock()
+
+    def load_checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        """Completed entries by mint. Entries that errored are not considered complete."""
+        done: Dict[str, Dict[str, Any]] = {}
+        if not self.checkpoint_path.exists():
+            return done
+        with open(self.checkpoint_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn write from an interrupted run
+                if entry.get("mint") and not entry.get("error"):
+                    done[entry["mint"]] = entry
+        return done
+
+    def _checkpoint(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            with open(self.checkpoint_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+
+    def _analyze(self, mint: str) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        entry: Dict[str, Any] = {"mint": mint}
+        try:
+            report_data = analyze_once(self.config, mint, symbol_for_filename=mint, notify=self.notify)
+            sig = report_data.get("signal") or {}
+            entry["passed"] = bool(sig.get("passed"))
+            entry["reasons"] = sig.get("reasons", [])
+            entry["stages"] = stage_results(report_data)
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["elapsed"] = round(time.perf_counter() - t0, 3)
+        entry["completed_at"] = time.time()
+        self._checkpoint(entry)
+        return entry
+
+    def run(self, mints: List[str]) -> Dict[str, Any]:
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        done = self.load_checkpoint()
+        pending = [m for m in mints if m not in done]
+        total = len(pending)
+        if done:
+            log.info("Resuming: %d already done, %d remaining", len(mints) - total, total)
+
+        stats = {"completed": 0, "passed": 0, "errors": 0}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(self._analyze, m): m for m in pending}
+            try:
+                self._collect(futures, stats, total, started)
+            except KeyboardInterrupt:
+                # Drop queued mints; in-flight ones finish and checkpoint before the pool exits
+                pool.shutdown(wait=False, cancel_futures=True)
+                log.warning("Interrupted: %d of %d done; rerun to resume", stats["completed"], total)
+                raise
+
+        stats["elapsed"] = round(time.perf_counter() - started, 3)
+        log.info("Batch done: %d analyzed, %d passed, %d errors in %s", stats["completed"], stats["passed"],
+                 stats["errors"], _fmt_duration(stats["elapsed"]))
+        return stats
+
+    def _collect(self, futures: Dict[Any, str], stats: Dict[str, Any], total: int, started: float) -> None:
+        for fut in as_completed(futures):
+            entry = fut.result()
+            stats["completed"] += 1
+            if entry.get("error"):
+                stats["errors"] += 1
+                status = f"error: {entry['error']}"
+            elif entry.get("passed"):
+                stats["passed"] += 1
+                status = "passed"
+            else:
+                status = "not passed"
+            elapsed = time.perf_counter() - started
+            rate = stats["completed"] / elapsed if elapsed > 0 else 0.0
+            eta = (total - stats["completed"]) / rate if rate > 0 else 0.0
+            log.log(logging.ERROR if entry.get("error") else logging.INFO,
+                    "[%d/%d] %s — %.2f tok/s, ETA %s", stats["completed"], total, status, rate, _fmt_duration(eta),
+                    extra={"mint": entry["mint"], "completed": stats["completed"], "total": total})
+
+
+def _fmt_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
@@ -1,10 +1,14 @@
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 
 import yaml
 from dotenv import load_dotenv
 
+from solana_due_diligence.pipeline import DEFAULT_TIERS, EXPENSIVE_STAGES
+from solana_due_diligence.signals.rules import RuleError, get_rule_set
+
 
 def _expand_env(value: Any) -> Any:
     if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
@@ -26,3 +30,167 @@ def load_config(path: str | Path) -> Dict[str, Any]:
     with open(path, "r") as f:
         raw = yaml.safe_load(f) or {}
     return _expand_env(raw)  # type: ignore[return-value]
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def _number(value: Any, name: str, lo: float | None = None, hi: float | None = None) -> List[str]:
+    if value is None:
+        return []
+    try:
+        num = float(value)
+    except (TypeError, ValueError):
+        return [f"{name} must be a number, got {value!r}"]
+    if (lo is not None and num < lo) or (hi is not None and num > hi):
+        return [f"{name}={num} is outside [{lo}, {hi}]"]
+    return []
+
+
+def validate_config(config: Dict[str, Any]) -> None:
+    """Raise ConfigError listing every problem found; used before swapping a reloaded config in."""
+    if not isinstance(config, dict):
+        raise ConfigError("config must be a mapping")
+    errors: List[str] = []
+    for section, value in config.items():
+        if value is not None and not isinstance(value, (dict, list)):
+            errors.append(f"{section} must be a section, got {type(value).__name__}")
+    if errors:
+        raise ConfigError("; ".join(errors))
+    if not (config.get("report") or {}).get("output_dir"):
+        errors.append("report.output_dir is required")
+    thresholds = (config.get("signals") or {}).get("thresholds") or {}
+    if not isinstance(thresholds, dict):
+        errors.append("signals.thresholds must be a mapping")
+    else:
+        errors += _number(thresholds.get("min_liquidity_usd"), "signals.thresholds.min_liquidity_usd", lo=0)
+        errors += _number(thresholds.get("max_top10_concentration"), "signals.thresholds.max_top10_concentration", lo=0, hi=1)
+        errors += _number(thresholds.get("max_cluster_share"), "signals.thresholds.max_cluster_share", lo=0, hi=1)
+    try:
+        get_rule_set(config)  # also compiles the profiles once for every report analyzed with this config
+    except RuleError as e:
+        errors.append(str(e))
+    errors += _number((config.get("pipeline") or {}).get("dedupe_window_seconds"), "pipeline.dedupe_window_seconds", lo=0)
+    errors += _number((config.get("stream") or {}).get("workers"), "stream.workers", lo=1)
+    errors += _number((config.get("batch") or {}).get("concurrency"), "batch.concurrency", lo=1)
+    snapshots = config.get("holder_snapshots") or {}
+    errors += _number(snapshots.get("keyframe_every"), "holder_snapshots.keyframe_every", lo=1)
+    errors += _number(snapshots.get("dump_alert_pct"), "holder_snapshots.dump_alert_pct", lo=0, hi=100)
+    errors += _number(snapshots.get("retention_hours"), "holder_snapshots.retention_hours", lo=0)
+    level = (config.get("logging") or {}).get("level")
+    if level is not None and str(level).upper() not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+        errors.append(f"logging.level must be DEBUG, INFO, WARNING, ERROR or CRITICAL, got {level!r}")
+    server = config.get("server") or {}
+    errors += _number(server.get("port"), "server.port", lo=0, hi=65535)
+    errors += _number(server.get("max_concurrency"), "server.max_concurrency", lo=1)
+    errors += _number(server.get("freshness_seconds"), "server.freshness_seconds", lo=0)
+    errors += _number((config.get("stream") or {}).get("drain_timeout_seconds"), "stream.drain_timeout_seconds", lo=0)
+    offsets = ((config.get("stream") or {}).get("recheck") or {}).get("offsets_seconds")
+    if offsets is not None:
+        if not isinstance(offsets, list):
+            errors.append("stream.recheck.offsets_seconds must be a list")
+        else:
+            for i, offset in enumerate(offsets):
+                errors += _number(offset, f"stream.recheck.offsets_seconds[{i}]", lo=0)
+    errors += _number((config.get("watch") or {}).get("max_requests_per_minute"), "watch.max_requests_per_minute", lo=0)
+    lcfg = config.get("liquidity") or {}
+    if lcfg.get("prefer") not in (None, "onchain", "dexscreener"):
+        errors.append(f"liquidity.prefer must be onchain or dexscreener, got {lcfg.get('prefer')!r}")
+    errors += _number(lcfg.get("batch_window_ms"), "liquidity.batch_window_ms", lo=0, hi=1000)
+    errors += _number(lcfg.get("sol_usd"), "liquidity.sol_usd", lo=0)
+    for i, size in enumerate(lcfg.get("trade_sizes_sol") or []):
+        errors += _number(size, f"liquidity.trade_sizes_sol[{i}]", lo=0)
+    pcfg = config.get("profiling") or {}
+    errors += _number(pcfg.get("threshold_ms"), "profiling.threshold_ms", lo=0)
+    errors += _number(pcfg.get("keep"), "profiling.keep", lo=1)
+    pipeline = config.get("pipeline") or {}
+    tiers = pipeline.get("tiers") or {}
+    if not isinstance(tiers, dict):
+        errors.append("pipeline.tiers must be a mapping of tier name to stages")
+        tiers = {}
+    for name, stages in tiers.items():
+        unknown = [s for s in (stages or []) if s not in EXPENSIVE_STAGES] if isinstance(stages, list) else None
+        if unknown is None:
+            errors.append(f"pipeline.tiers.{name} must be a list")
+        elif unknown:
+            errors.append(f"pipeline.tiers.{name} has unknown stages {unknown}; expected some of {', '.join(EXPENSIVE_STAGES)}")
+    tier = pipeline.get("tier")
+    if tier is not None and tier not in tiers and tier not in DEFAULT_TIERS:
+        errors.append(f"pipeline.tier {tier!r} is not a defined tier")
+    auto_tiers = (config.get("stream") or {}).get("tiers") or {}
+    for key in ("standard_backlog", "minimal_backlog", "standard_lag_seconds", "minimal_lag_seconds", "recover_seconds"):
+        errors += _number(auto_tiers.get(key), f"stream.tiers.{key}", lo=0)
+    for key in ("standard_pressure", "minimal_pressure"):
+        errors += _number(auto_tiers.get(key), f"stream.tiers.{key}", lo=0, hi=1)
+    blocklist = (config.get("pipeline") or {}).get("blocklist")
+    if blocklist is not None and not isinstance(blocklist, list):
+        errors.append("pipeline.blocklist must be a list")
+    if errors:
+        raise ConfigError("; ".join(errors))
+
+
+class ConfigWatcher:
+    """Reloads a config file when it changes (or on request) and hands validated configs to ``on_reload``.
+
+    An invalid file is reported through ``on_error`` and the current config stays in place.
+    """
+
+    def __init__(self, path: str | Path, on_reload: Callable[[Dict[str, Any]], None],
+                 on_error: Optional[Callable[[str], None]] = None, interval: float = 2.0) -> None:
+        self.path = Path(path)
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.interval = interval
+        self._fingerprint = self._stat()
+        self._requested = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def request_reload(self) -> None:
+        """Safe to call from a signal handler; the watcher thread does the work."""
+        self._requested.set()
+
+    def check(self) -> bool:
+        fingerprint = self._stat()
+        if fingerprint == self._fingerprint and not self._requested.is_set():
+            return False
+        self._requested.clear()
+        self._fingerprint = fingerprint
+        return self.reload()
+
+    def reload(self) -> bool:
+        try:
+            new = load_config(self.path)
+            validate_config(new)
+        except (OSError, yaml.YAMLError, ConfigError) as e:
+            if self.on_error:
+                self.on_error(str(e))
+            return False
+        self.on_reload(new)
+        return True
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._requested.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._requested.wait(self.interval)
+            if self._stop.is_set():
+                break
+            self.check()
@@ -2,9 +2,27 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from solana_due_diligence.developer.creator_index import classify_creator, get_creator_index
 from solana_due_diligence.providers.solscan import SolscanClient
 
 
+def extract_creator(tokenomics: Dict[str, Any]) -> Optional[str]:
+    solscan = tokenomics.get("solscan") or {}
+    meta = solscan.get("meta") or {}
+    # Common fields observed
+    for key in ("creator", "creater", "creatorAddress", "mintAuthority", "updateAuthority"):
+        v = meta.get(key)
+        if isinstance(v, str) and len(v) > 20:
+            return v
+    return None
+
+
+def _launched_by(item: Dict[str, Any], creator: str) -> bool:
+    # A held token counts as a launch only when the listing names the creator as its authority
+    info = item.get("tokenInfo") or {}
+    return creator in (item.get("mintAuthority"), item.get("creator"), info.get("mintAuthority"), info.get("creator"))
+
+
 class DeveloperAnalyzer:
     def __init__(self, config: Dict[str, Any]) -> None:
         self.config = config
@@ -16,16 +34,12 @@ class DeveloperAnalyzer:
                 base_url=scfg.get("base_url", "https://api.solscan.io"),
                 api_key=scfg.get("api_key") or None,
             )
+        dcfg = config.get("developer", {})
+        self.serial_threshold = int(dcfg.get("serial_deployer_threshold", 5))
+        self.index = get_creator_index(config)
 
     def _extract_creator(self, tokenomics: Dict[str, Any]) -> Optional[str]:
-        solscan = tokenomics.get("solscan") or {}
-        meta = solscan.get("meta") or {}
-        # Common fields observed
-        for key in ("creator", "creater", "creatorAddress", "mintAuthority", "updateAuthority"):
-            v = meta.get(key)
-            if isinstance(v, str) and len(v) > 20:
-                return v
-        return None
+        return extract_creator(tokenomics)
 
     def analyze(self, tokenomics: Dict[str, Any]) -> Dict[str, Any]:
         if not self.solscan:
@@ -34,26 +48,51 @@ class DeveloperAnalyzer:
         creator = self._extract_creator(tokenomics)
         history: List[Dict[str, Any]] = []
         risk_flags: List[str] = []
+        history_source = None
+        stats = None
+        launched: List[str] = []
 
         if creator:
-            # Fetch tokens held by creator; heuristic: tokens where creator holds supply early
-            tokens = self.solscan.get_account_tokens(creator, limit=50, offset=0) or {}
-            items = tokens.get("data") or tokens.get("result") or []
-            for it in items:
-                mint = it.get("tokenAddress") or it.get("mint")
-                amount = it.get("tokenAmount") or it.get("amount")
-                if not mint:
-                    continue
-                history.append({"mint": mint, "amount": amount})
-
-            # Basic heuristics for risk flags
-            if len(history) >= 5:
+            stats = self.index.lookup(creator) if self.index else None
+            if stats and stats["history_fetched"]:
+                # Known creator: answer from the index without touching Solscan
+                history_source = "index"
+                for it in self.index.mints_for(creator, limit=50):
+                    history.append({"mint": it["mint"], "amount": None, "outcome": it["outcome"]})
+            else:
+                # Fetch tokens held by creator; heuristic: tokens where creator holds supply early
+                history_source = "solscan"
+                tokens = self.solscan.get_account_tokens(creator, limit=50, offset=0) or {}
+                items = tokens.get("data") or tokens.get("result") or []
+                for it in items:
+                    mint = it.get("tokenAddress") or it.get("mint")
+                    amount = it.get("tokenAmount") or it.get("amount")
+                    if not mint:
+                        continue
+                    history.append({"mint": mint, "amount": amount})
+                    if _launched_by(it, creator):
+                        launched.append(mint)
+                if self.index:
+                    # Holdings are not launches (bought or airdropped tokens would inflate
+                    # launch_count); streamed launches fill the rest of the index
+                    self.index.record_history(creator, launched)
+
+            if self.index:
+                if tokenomics.get("mint"):
+                    self.index.record_launch(creator, tokenomics["mint"])
+                stats = self.index.lookup(creator)
+
+            # Basic heuristics for risk flags; launches, not holdings, on either path
+            if (stats["launch_count"] if stats else len(launched)) >= 5:
                 risk_flags.append("creator_has_many_tokens")
+            risk_flags.extend(classify_creator(stats, self.serial_threshold))
         else:
             risk_flags.append("creator_not_found_in_meta")
 
         return {
             "creator": creator,
+            "creator_stats": stats,
+            "history_source": history_source,
             "history_sample": history[:20],
             "risk_flags": risk_flags,
         }
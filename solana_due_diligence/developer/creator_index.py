@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from solana_due_diligence.storage import open_sqlite
+
+
+RUGGED = "rugged"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS creators ("
+    "  creator TEXT PRIMARY KEY,"
+    "  first_seen REAL NOT NULL,"
+    "  last_seen REAL NOT NULL,"
+    "  launch_count INTEGER NOT NULL DEFAULT 0,"
+    "  rug_count INTEGER NOT NULL DEFAULT 0,"
+    "  history_fetched INTEGER NOT NULL DEFAULT 0"
+    ")",
+    "CREATE TABLE IF NOT EXISTS launches ("
+    "  mint TEXT PRIMARY KEY,"
+    "  creator TEXT NOT NULL,"
+    "  seen_at REAL NOT NULL,"
+    "  source TEXT NOT NULL,"
+    "  outcome TEXT"
+    ")",
+    "CREATE INDEX IF NOT EXISTS launches_by_creator ON launches (creator, seen_at)",
+)
+
+
+class CreatorIndex:
+    """Persistent map of creator wallets to the mints they launched.
+
+    Per-creator counters are kept denormalized on the ``creators`` row so the
+    serial-deployer / known-rugger checks are a single primary-key lookup.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def lookup(self, creator: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM creators WHERE creator = ?", (creator,)).fetchone()
+        if row is None:
+            return None
+        stats = dict(row)
+        stats["history_fetched"] = bool(stats["history_fetched"])
+        return stats
+
+    def mints_for(self, creator: str, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT mint, seen_at, source, outcome FROM launches WHERE creator = ? ORDER BY seen_at DESC LIMIT ?",
+                (creator, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def record_launch(self, creator: str, mint: str, seen_at: Optional[float] = None, source: str = "stream") -> bool:
+        """Record that ``creator`` launched ``mint``. Returns False if the mint was already known."""
+        return self._record(creator, [mint], seen_at or time.time(), source, history_fetched=False) > 0
+
+    def record_history(self, creator: str, mints: Iterable[str], seen_at: Optional[float] = None) -> int:
+        """Seed the index from a one-off provider lookup and mark the creator as fetched."""
+        return self._record(creator, list(mints), seen_at or time.time(), "solscan", history_fetched=True)
+
+    def record_outcome(self, mint: str, outcome: str) -> None:
+        """Set a launch's outcome; ``rugged`` is final, so a later re-analysis verdict never replaces it."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT creator, outcome FROM launches WHERE mint = ?", (mint,)).fetchone()
+                if row is not None and row["outcome"] not in (outcome, RUGGED):
+                    self._conn.execute("UPDATE launches SET outcome = ? WHERE mint = ?", (outcome, mint))
+                    delta = int(outcome == RUGGED) - int(row["outcome"] == RUGGED)
+                    if delta:
+                        self._conn.execute(
+                            "UPDATE creators SET rug_count = rug_count + ? WHERE creator = ?", (delta, row["creator"])
+                        )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _record(self, creator: str, mints: List[str], seen_at: float, source: str, history_fetched: bool) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for mint in mints:
+                    cur = self._conn.execute(
+                        "INSERT OR IGNORE INTO launches (mint, creator, seen_at, source) VALUES (?, ?, ?, ?)",
+                        (mint, creator, seen_at, source),
+                    )
+                    added += cur.rowcount
+                self._conn.execute(
+                    "INSERT INTO creators (creator, first_seen, last_seen, launch_count, history_fetched)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(creator) DO UPDATE SET"
+                    "  first_seen = MIN(first_seen, excluded.first_seen),"
+                    "  last_seen = MAX(last_seen, excluded.last_seen),"
+                    "  launch_count = launch_count + excluded.launch_count,"
+                    "  history_fetched = MAX(history_fetched, excluded.history_fetched)",
+                    (creator, seen_at, seen_at, added, int(history_fetched)),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+
+def classify_creator(stats: Optional[Dict[str, Any]], serial_threshold: int = 5) -> List[str]:
+    if not stats:
+        return []
+    flags: List[str] = []
+    if stats.get("launch_count", 0) >= serial_threshold:
+        flags.append("creator_serial_deployer")
+    if stats.get("rug_count", 0) > 0:
+        flags.append("creator_known_rugger")
+    return flags
+
+
+_indexes: Dict[str, CreatorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_creator_index(config: Dict[str, Any]) -> Optional[CreatorIndex]:
+    """Return the process-wide index for the configured path, or None when disabled."""
+    path = config.get("developer", {}).get("creator_index_path")
+    if not path:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = CreatorIndex(path)
+        return index
@@ -1,28 +1,34 @@
 from __future__ import annotations
 
-import json
 import time
 from typing import Any, Dict, Generator, Optional
 
 import requests
 
+from solana_due_diligence.ingestion.jsonstream import iter_array_items
+from solana_due_diligence.ingestion.pumpfun import PUMPFUN_PROGRAM_ID
+
 
 SUBSCRIPTION_QUERY = (
     "subscription{\n"
     "  Solana{\n"
     "    Instructions(\n"
-    "      where: { programId: {is: \"pumpfun1111111111111111111111111111111111\"} }\n"
+    "      where: { Instruction: { Program: { Address: {is: \"" + PUMPFUN_PROGRAM_ID + "\"} } } }\n"
     "      limit: {count: 100} orderBy: {descending: Block_Time} \n"
     "    ){\n"
-    "      Instruction{ ProgramId }\n"
-    "      Transaction{ Signature Block{ Time } }\n"
-    "      Accounts{ Address }\n"
+    "      Instruction{ Program{ Address Method } Accounts{ Address } Data }\n"
+    "      Transaction{ Signature }\n"
+    "      Block{ Time }\n"
     "    }\n"
     "  }\n"
     "}\n"
 )
 
 
+INSTRUCTIONS_PATH = ("data", "Solana", "Instructions")
+CHUNK_SIZE = 8192
+
+
 class BitqueryStream:
     def __init__(self, endpoint: str, api_key: Optional[str]) -> None:
         self.endpoint = endpoint
@@ -40,20 +46,15 @@ class BitqueryStream:
         backoff = 1
         while True:
             try:
-                resp = requests.post(self.endpoint, headers=self._headers(), json={"query": SUBSCRIPTION_QUERY}, timeout=60)
-                if resp.status_code != 200:
-                    time.sleep(backoff)
-                    backoff = min(backoff * 2, 30)
-                    continue
-                data = resp.json()
-                # Emit entries; in real-time scenarios, use websockets. Here we treat as a poll batch.
-                items = (
-                    data.get("data", {})
-                    .get("Solana", {})
-                    .get("Instructions", [])
-                )
-                for it in items:
-                    yield it
+                resp = requests.post(self.endpoint, headers=self._headers(), json={"query": SUBSCRIPTION_QUERY},
+                                     timeout=60, stream=True)
+                with resp:
+                    if resp.status_code != 200:
+                        time.sleep(backoff)
+                        backoff = min(backoff * 2, 30)
+                        continue
+                    # Emit each instruction as soon as it has been read, not after the whole page
+                    yield from iter_array_items(resp.iter_content(chunk_size=CHUNK_SIZE), INSTRUCTIONS_PATH)
                 time.sleep(5)
                 backoff = 1
             except Exception:
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+_STRING_END = re.compile(r'["\\]')
+_WHITESPACE = " \t\r\n"
+
+
+class ArrayItemParser:
+    """Incremental JSON scanner that yields the elements of one array as soon as each is complete.
+
+    ``path`` is the chain of object keys leading to the array, e.g.
+    ``("data", "Solana", "Instructions")``. Text is fed in arbitrary chunks;
+    only the element currently being read (plus an unterminated string) is
+    kept in memory, never the whole document.
+    """
+
+    def __init__(self, path: Sequence[str]) -> None:
+        self.path = tuple(path)
+        self._buf = ""
+        # (kind, key path, is the target array)
+        self._stack: List[Tuple[str, Tuple[str, ...], bool]] = []
+        self._in_string = False
+        self._escape = False
+        self._str_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self.items = 0
+
+    def feed(self, text: str) -> List[Any]:
+        buf = self._buf + text
+        out: List[Any] = []
+        i = len(self._buf)
+        n = len(buf)
+        stack = self._stack
+        while i < n:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                m = _STRING_END.search(buf, i)
+                if m is None:
+                    i = n
+                    break
+                i = m.start()
+                if buf[i] == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._item_start is None:
+                        self._last_string = json.loads(f'"{buf[self._str_start:i]}"')
+                i += 1
+                continue
+
+            c = buf[i]
+            in_target = bool(stack) and stack[-1][2]
+            if in_target and self._item_start is None and c not in _WHITESPACE and c not in ",]":
+                self._item_start = i
+            if c == '"':
+                self._in_string = True
+                self._str_start = i + 1
+            elif self._item_start is not None and not in_target:
+                # Inside an element: only nesting depth matters
+                if c in "{[":
+                    stack.append((c, (), False))
+                elif c in "}]":
+                    stack.pop()
+            elif c == ":":
+                self._pending_key = self._last_string
+            elif c in "{[":
+                parent = stack[-1] if stack else None
+                if parent is not None and parent[0] == "{":
+                    path = parent[1] + (self._pending_key or "",)
+                else:
+                    path = parent[1] if parent is not None else ()
+                is_target = c == "[" and path == self.path and (parent is None or parent[0] == "{")
+                stack.append((c, path, is_target))
+                self._pending_key = None
+            elif c in ",]}":
+                if in_target and self._item_start is not None:
+                    out.append(json.loads(buf[self._item_start:i]))
+                    self._item_start = None
+                    self.items += 1
+                if c in "]}":
+                    stack.pop()
+            i += 1
+
+        # Keep only what an unfinished element or string still needs
+        cut = n
+        if self._item_start is not None:
+            cut = self._item_start
+        elif self._in_string:
+            cut = self._str_start
+        self._buf = buf[cut:]
+        if self._item_start is not None:
+            self._item_start -= cut
+        if self._in_string:
+            self._str_start -= cut
+        return out
+
+    def close(self) -> None:
+        if self._item_start is not None or self._in_string:
+            raise ValueError("JSON stream ended inside an array element")
+
+
+def iter_array_items(chunks: Iterable[bytes], path: Sequence[str]) -> Iterator[Any]:
+    """Yield the elements of the array at ``path`` from a stream of UTF-8 byte chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parser = ArrayItemParser(path)
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(decoder.decode(chunk))
+    yield from parser.feed(decoder.decode(b"", final=True))
+    parser.close()
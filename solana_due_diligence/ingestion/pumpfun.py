@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+PUMPFUN_PROGRAM_ID = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+# Anchor instruction discriminator: first 8 bytes of sha256("global:<name>")
+CREATE_DISCRIMINATOR = hashlib.sha256(b"global:create").digest()[:8]
+
+# Account order of the pump.fun create instruction
+MINT_INDEX = 0
+BONDING_CURVE_INDEX = 2
+CREATOR_INDEX = 7
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {c: i for i, c in enumerate(_B58_ALPHABET)}
+_HEX = re.compile(r"(?:0x)?([0-9a-fA-F]{2})+")
+
+
+def b58decode(value: str) -> bytes:
+    num = 0
+    for c in value:
+        digit = _B58_INDEX.get(c)
+        if digit is None:
+            raise ValueError(f"invalid base58 character {c!r}")
+        num = num * 58 + digit
+    body = num.to_bytes((num.bit_length() + 7) // 8, "big") if num else b""
+    pad = len(value) - len(value.lstrip("1"))
+    return b"\x00" * pad + body
+
+
+def b58encode(raw: bytes) -> str:
+    num = int.from_bytes(raw, "big")
+    out = ""
+    while num:
+        num, rem = divmod(num, 58)
+        out = _B58_ALPHABET[rem] + out
+    return "1" * (len(raw) - len(raw.lstrip(b"\x00"))) + out
+
+
+# ed25519 field prime and curve constant, for the off-curve test of program addresses
+_P = 2 ** 255 - 19
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+
+
+def _on_curve(key: bytes) -> bool:
+    y = int.from_bytes(key, "little") & ((1 << 255) - 1)
+    if y >= _P:
+        return False
+    u, v = (y * y - 1) % _P, (_D * y * y + 1) % _P
+    x2 = u * pow(v, _P - 2, _P) % _P
+    return x2 == 0 or pow(x2, (_P - 1) // 2, _P) == 1
+
+
+def find_program_address(seeds: List[bytes], program_id: str) -> str:
+    """Solana PDA: the first bump (255 down) whose hash is off the ed25519 curve."""
+    program = b58decode(program_id)
+    for bump in range(255, -1, -1):
+        digest = hashlib.sha256(b"".join(seeds) + bytes([bump]) + program + b"ProgramDerivedAddress").digest()
+        if not _on_curve(digest):
+            return b58encode(digest)
+    raise ValueError("no viable program address")
+
+
+def bonding_curve_address(mint: str, program_id: str = PUMPFUN_PROGRAM_ID) -> str:
+    return find_program_address([b"bonding-curve", b58decode(mint)], program_id)
+
+
+def is_pubkey(value: Any) -> bool:
+    """Whether ``value`` is a base58 string decoding to exactly 32 bytes."""
+    if not isinstance(value, str) or not 32 <= len(value) <= 44:
+        return False
+    try:
+        return len(b58decode(value)) == 32
+    except ValueError:
+        return False
+
+
+def decode_instruction_data(data: Any) -> Optional[bytes]:
+    """Instruction data as bytes; providers ship it hex, base58 or base64 encoded."""
+    if not isinstance(data, str) or not data:
+        return None
+    if _HEX.fullmatch(data):
+        return bytes.fromhex(data.removeprefix("0x"))
+    try:
+        return b58decode(data)
+    except ValueError:
+        pass
+    try:
+        return base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class Launch:
+    mint: str
+    bonding_curve: Optional[str]
+    creator: Optional[str]
+    signature: Optional[str] = None
+    block_time: Optional[str] = None
+
+
+def _accounts(item: Dict[str, Any]) -> List[Optional[str]]:
+    # Bitquery nests accounts under Instruction; older queries had them top level
+    raw = (item.get("Instruction") or {}).get("Accounts") or item.get("Accounts") or []
+    return [a.get("Address") if isinstance(a, dict) else a for a in raw]
+
+
+class CreateFilter:
+    """Keeps only pump.fun create instructions and turns them into :class:`Launch` records.
+
+    Buys, sells and other program instructions are dropped before they can
+    reach the analysis queue; ``stats`` counts what was dropped and why.
+    """
+
+    def __init__(self, program_id: str = PUMPFUN_PROGRAM_ID) -> None:
+        self.program_id = program_id
+        self.stats = {"seen": 0, "accepted": 0, "other_program": 0, "not_create": 0, "invalid_mint": 0}
+
+    def parse(self, item: Dict[str, Any]) -> Optional[Launch]:
+        self.stats["seen"] += 1
+        instruction = item.get("Instruction") or {}
+        program = instruction.get("Program") or {}
+        program_id = program.get("Address") or instruction.get("ProgramId")
+        if program_id and program_id != self.program_id:
+            self.stats["other_program"] += 1
+            return None
+
+        data = decode_instruction_data(instruction.get("Data"))
+        if data is not None:
+            is_create = data[:8] == CREATE_DISCRIMINATOR
+        else:
+            is_create = program.get("Method") == "create"
+        accounts = _accounts(item)
+        if not is_create or len(accounts) <= CREATOR_INDEX:
+            self.stats["not_create"] += 1
+            return None
+
+        mint = accounts[MINT_INDEX]
+        if not is_pubkey(mint):
+            self.stats["invalid_mint"] += 1
+            return None
+        creator = accounts[CREATOR_INDEX]
+        bonding_curve = accounts[BONDING_CURVE_INDEX]
+        transaction = item.get("Transaction") or {}
+        self.stats["accepted"] += 1
+        return Launch(
+            mint=mint,
+            bonding_curve=bonding_curve if is_pubkey(bonding_curve) else None,
+            creator=creator if is_pubkey(creator) else None,
+            signature=transaction.get("Signature"),
+            block_time=(item.get("Block") or transaction.get("Block") or {}).get("Time"),
+        )
+
+    def noise_ratio(self) -> float:
+        seen = self.stats["seen"]
+        return round(1 - self.stats["accepted"] / seen, 3) if seen else 0.0
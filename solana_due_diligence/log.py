@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from rich.console import Console
+
+from solana_due_diligence import profiling
+
+
+ROOT = "solana_due_diligence"
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+_LEVEL_STYLES = {logging.DEBUG: "dim", logging.WARNING: "yellow", logging.ERROR: "red", logging.CRITICAL: "bold red"}
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {k: v for k, v in record.__dict__.items() if k not in _RESERVED and not k.startswith("_")}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus ``extra`` fields such as mint, stage and latency_ms."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        out.update(_fields(record))
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str, separators=(",", ":"))
+
+
+class ConsoleHandler(logging.Handler):
+    """Interactive renderer: level colours through rich, message text printed without markup parsing."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        super().__init__()
+        self.console = console or Console()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            fields = _fields(record)
+            text = record.getMessage()
+            if fields.get("mint"):
+                text = f"{fields['mint']}: {text}"
+            if fields.get("latency_ms") is not None:
+                text += f" ({fields.get('stage') or 'done'} {fields['latency_ms']} ms)"
+            if record.exc_text:
+                text += "\n" + record.exc_text
+            self.console.print(text, style=_LEVEL_STYLES.get(record.levelno), markup=False, highlight=False, soft_wrap=True)
+        except Exception:
+            self.handleError(record)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread and never blocks: a full queue drops the record and counts it."""
+
+    def __init__(self, q: "queue.Queue[Any]") -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge args here; formatting is the listener's job
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(config: Dict[str, Any], interactive: Optional[bool] = None, stream: Optional[TextIO] = None) -> NonBlockingQueueHandler:
+    """Route the package's loggers through a queue to a rich (interactive) or JSON-lines sink.
+
+    ``logging.format`` is ``auto`` (rich on a terminal, JSON otherwise),
+    ``rich`` or ``json``; ``logging.file`` adds a JSON-lines file. Calling it
+    again replaces the previous setup, e.g. after a config reload.
+    """
+    global _handler, _listener
+    lcfg = config.get("logging") or {}
+    stream = stream or sys.stdout
+    if interactive is None:
+        interactive = bool(getattr(stream, "isatty", lambda: False)())
+    fmt = lcfg.get("format", "auto")
+    sinks: List[logging.Handler] = []
+    if fmt == "rich" or (fmt == "auto" and interactive):
+        sinks.append(ConsoleHandler(Console(file=stream)))
+    else:
+        sink = logging.StreamHandler(stream)
+        sink.setFormatter(JSONFormatter())
+        sinks.append(sink)
+    if lcfg.get("file"):
+        file_sink = logging.FileHandler(lcfg["file"], encoding="utf-8")
+        file_sink.setFormatter(JSONFormatter())
+        sinks.append(file_sink)
+
+    with _lock:
+        logger = logging.getLogger(ROOT)
+        if _listener is not None:
+            _listener.stop()
+            for old in _listener.handlers:
+                old.close()
+        if _handler is not None:
+            logger.removeHandler(_handler)
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=int(lcfg.get("queue_size", 10000))))
+        logger.addHandler(handler)
+        logger.setLevel(str(lcfg.get("level", "INFO")).upper())
+        logger.propagate = False
+        for name, level in (lcfg.get("levels") or {}).items():
+            logging.getLogger(name).setLevel(str(level).upper())
+        listener = logging.handlers.QueueListener(handler.queue, *sinks, respect_handler_level=True)
+        listener.start()
+        if _listener is None:
+            atexit.register(shutdown_logging)
+        _handler, _listener = handler, listener
+    return handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for sink in _listener.handlers:
+                try:
+                    sink.flush()
+                except (OSError, ValueError):
+                    # The stream was closed before exit (e.g. captured stdout)
+                    pass
+            _listener = None
+
+
+@contextmanager
+def timed(logger: logging.Logger, stage: str, mint: Optional[str] = None, level: int = logging.DEBUG) -> Iterator[Dict[str, Any]]:
+    """Log ``stage`` with its latency when the block exits; the yielded dict adds fields to the record."""
+    fields: Dict[str, Any] = {}
+    t0 = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        profiling.add_stage(stage, ms)
+        if logger.isEnabledFor(level):
+            logger.log(level, "stage done", extra={"mint": mint, "stage": stage, "latency_ms": round(ms, 1), **fields})
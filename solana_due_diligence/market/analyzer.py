@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from solana_due_diligence.market import dexscreener
+from solana_due_diligence.market.liquidity import get_liquidity_reader
 
 
 class MarketAnalyzer:
@@ -14,7 +15,15 @@ class MarketAnalyzer:
         best = None
         if pairs:
             best = max(pairs, key=lambda p: (p.get("liquidity", {}).get("usd", 0) or 0))
-        return {
+        result: Dict[str, Any] = {
             "pairs_found": len(pairs or []),
             "best_pair": best,
         }
+        reader = get_liquidity_reader(self.config)
+        if reader is not None:
+            pool = best.get("pairAddress") if best and best.get("dexId") == "raydium" else None
+            try:
+                result["onchain"] = reader.analyze(mint, raydium_pool=pool)
+            except Exception as e:
+                result["onchain"] = {"error": str(e)}
+        return result
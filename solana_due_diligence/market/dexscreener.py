@@ -5,14 +5,42 @@ from typing import Any, Dict, List, Optional
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from solana_due_diligence.providers import http
 
+
+@http.single_flight(lambda config, mint: (config.get("market", {}).get("dexscreener_base"), mint))
 @retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3), reraise=True,
        retry=retry_if_exception_type(requests.RequestException))
 def fetch_pairs_for_token(config: Dict[str, Any], mint: str) -> Optional[List[Dict[str, Any]]]:
     base = config.get("market", {}).get("dexscreener_base", "https://api.dexscreener.com/latest/dex/tokens")
     url = f"{base}/{mint}"
-    r = requests.get(url, timeout=15)
+    r = http.session().get(url, timeout=15)
     if r.status_code != 200:
         return None
     data = r.json()
     return data.get("pairs")
+
+
+# Dexscreener accepts up to 30 comma-separated token addresses per request
+MAX_TOKENS_PER_REQUEST = 30
+
+
+@http.single_flight(lambda config, mints: (config.get("market", {}).get("dexscreener_base"), sorted(mints)))
+@retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3), reraise=True,
+       retry=retry_if_exception_type(requests.RequestException))
+def fetch_pairs_for_tokens(config: Dict[str, Any], mints: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Batched lookup; pairs are grouped by the mint they trade (base or quote side)."""
+    base = config.get("market", {}).get("dexscreener_base", "https://api.dexscreener.com/latest/dex/tokens")
+    wanted = set(mints[:MAX_TOKENS_PER_REQUEST])
+    url = f"{base}/{','.join(mints[:MAX_TOKENS_PER_REQUEST])}"
+    r = http.session().get(url, timeout=15)
+    if r.status_code != 200:
+        return {}
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for pair in r.json().get("pairs") or []:
+        for side in ("baseToken", "quoteToken"):
+            addr = (pair.get(side) or {}).get("address")
+            if addr in wanted:
+                grouped.setdefault(addr, []).append(pair)
+                break
+    return grouped
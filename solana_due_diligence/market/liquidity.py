@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from solana_due_diligence.ingestion.pumpfun import (
+    PUMPFUN_PROGRAM_ID,
+    b58decode,
+    b58encode,
+    bonding_curve_address,
+    find_program_address,
+)
+from solana_due_diligence.providers.rpc_pool import get_rpc_pool
+from solana_due_diligence.providers.solana_rpc import SolanaRPC
+
+
+PUMPSWAP_PROGRAM_ID = "pAMMBay6oceH9fJKBRHGP5D4bD4sWpmSwMn52FMfXEA"
+RAYDIUM_AMM_V4_PROGRAM_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+ASSOCIATED_TOKEN_PROGRAM_ID = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+# Raydium SOL/USDC pool vaults, read in the same batch to price SOL in USD
+SOL_USD_VAULTS = ("DQyrAcCrDXQ7NeoqGgDCZwBvWDcYmFCjSb9JtteuvPpz", "HLmqeL62xR1QoZ1HKKbXRrdN1p3phKpxRMb2VVopvBBz")
+
+BONDING_CURVE_DISCRIMINATOR = hashlib.sha256(b"account:BondingCurve").digest()[:8]
+# Tokens a fresh pump.fun curve sells before it graduates (793.1M at 6 decimals)
+INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000
+LAMPORTS_PER_SOL = 1_000_000_000
+# getMultipleAccounts takes at most 100 keys per call
+MAX_ACCOUNTS_PER_CALL = 100
+# Raydium AMM v4 pool state: decimals and vault offsets
+_RAYDIUM_DECIMALS = struct.Struct("<QQ")
+_RAYDIUM_VAULTS_AT = 336
+_RAYDIUM_SIZE = 752
+
+
+@dataclass(slots=True)
+class BondingCurve:
+    virtual_token_reserves: int
+    virtual_sol_reserves: int
+    real_token_reserves: int
+    real_sol_reserves: int
+    token_total_supply: int
+    complete: bool
+
+
+def decode_bonding_curve(data: Optional[bytes]) -> Optional[BondingCurve]:
+    """pump.fun ``BondingCurve`` account: discriminator, five u64 reserves/supply, complete flag."""
+    if not data or len(data) < 49 or data[:8] != BONDING_CURVE_DISCRIMINATOR:
+        return None
+    vt, vs, rt, rs, supply = struct.unpack_from("<5Q", data, 8)
+    return BondingCurve(vt, vs, rt, rs, supply, bool(data[48]))
+
+
+def decode_token_amount(data: Optional[bytes]) -> Optional[int]:
+    """Raw balance of an SPL / Token-2022 token account (u64 after mint and owner)."""
+    if not data or len(data) < 72:
+        return None
+    return struct.unpack_from("<Q", data, 64)[0]
+
+
+def decode_mint_decimals(data: Optional[bytes]) -> Optional[int]:
+    if not data or len(data) < 45:
+        return None
+    return data[44]
+
+
+def decode_raydium_pool(data: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    """Vaults, mints and decimals of a Raydium AMM v4 pool account."""
+    if not data or len(data) != _RAYDIUM_SIZE:
+        return None
+    base_decimals, quote_decimals = _RAYDIUM_DECIMALS.unpack_from(data, 32)
+    keys = [b58encode(data[i:i + 32]) for i in range(_RAYDIUM_VAULTS_AT, _RAYDIUM_VAULTS_AT + 128, 32)]
+    return {"base_vault": keys[0], "quote_vault": keys[1], "base_mint": keys[2], "quote_mint": keys[3],
+            "base_decimals": base_decimals, "quote_decimals": quote_decimals}
+
+
+def associated_token_address(owner: str, mint: str, token_program: str = TOKEN_PROGRAM_ID) -> str:
+    return find_program_address([b58decode(owner), b58decode(token_program), b58decode(mint)], ASSOCIATED_TOKEN_PROGRAM_ID)
+
+
+def pumpswap_pool_address(mint: str) -> str:
+    """Canonical PumpSwap pool a graduated pump.fun token migrates to (index 0, quoted in WSOL)."""
+    authority = find_program_address([b"pool-authority", b58decode(mint)], PUMPFUN_PROGRAM_ID)
+    return find_program_address(
+        [b"pool", (0).to_bytes(2, "little"), b58decode(authority), b58decode(mint), b58decode(WSOL_MINT)],
+        PUMPSWAP_PROGRAM_ID,
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def pool_accounts(mint: str) -> FrozenSet[str]:
+    """The pump.fun bonding curve and PumpSwap pool of ``mint`` and their token accounts (pool-held supply)."""
+    owners = (bonding_curve_address(mint), pumpswap_pool_address(mint))
+    return frozenset(owners) | {associated_token_address(o, mint, p) for o in owners for p in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID)}
+
+
+def price_impact(sol_reserve: float, token_reserve: float, sizes: List[float],
+                 max_sol_out: Optional[float] = None, max_tokens_out: Optional[float] = None) -> Dict[str, Dict[str, Optional[float]]]:
+    """Constant-product slippage in % (fees excluded) for buying and selling ``sizes`` SOL worth.
+
+    Buying ``x`` SOL moves the average price ``x / sol_reserve`` above spot;
+    selling tokens worth ``x`` at spot returns ``x / (sol_reserve + x)`` less.
+    A trade the pool cannot fill (a bonding curve's real reserves) is None.
+    """
+    out: Dict[str, Dict[str, Optional[float]]] = {"buy": {}, "sell": {}}
+    if sol_reserve <= 0 or token_reserve <= 0:
+        return out
+    for size in sizes:
+        key = f"{size:g}"
+        tokens_out = token_reserve * size / (sol_reserve + size)
+        fillable = max_tokens_out is None or tokens_out <= max_tokens_out
+        out["buy"][key] = round(size / sol_reserve * 100, 2) if fillable else None
+        sol_out = size * sol_reserve / (sol_reserve + size)
+        fillable = max_sol_out is None or sol_out <= max_sol_out
+        out["sell"][key] = round(size / (sol_reserve + size) * 100, 2) if fillable else None
+    return out
+
+
+class LiquidityReader:
+    """Liquidity straight from chain state, seconds after launch.
+
+    For each token it derives the pump.fun bonding curve and the canonical
+    PumpSwap pool vaults, adds the mint (for decimals) and the SOL/USD
+    reference vaults, and reads them all with ``getMultipleAccounts`` in one
+    JSON-RPC batch. A Raydium pool, when its address is known, costs a second
+    batch for its vaults. Concurrent callers within ``batch_window_ms`` share
+    a single batch.
+    """
+
+    def __init__(self, config: Dict[str, Any], rpc: Optional[SolanaRPC] = None) -> None:
+        lcfg = config.get("liquidity", {})
+        self.trade_sizes = [float(s) for s in lcfg.get("trade_sizes_sol") or [0.5, 1, 5, 10]]
+        self.sol_usd = lcfg.get("sol_usd")
+        self.sol_usd_vaults = tuple(lcfg.get("sol_usd_vaults") or SOL_USD_VAULTS)
+        self.window = float(lcfg.get("batch_window_ms", 25)) / 1000
+        if rpc is None:
+            s = config.get("solana", {})
+            rpc = SolanaRPC(rpc_url=s.get("rpc_url"), commitment=s.get("commitment", "confirmed"),
+                            timeout_seconds=s.get("timeout_seconds", 20), pool=get_rpc_pool(config))
+        self.rpc = rpc
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, Optional[str], Optional[str]], "_Slot"] = {}
+        self._leader = False
+
+    def fetch_accounts(self, addresses: List[str]) -> Dict[str, Optional[bytes]]:
+        """Raw data of each account (None when it does not exist), 100 keys per call, all calls in one batch."""
+        unique = list(dict.fromkeys(addresses))
+        chunks = [unique[i:i + MAX_ACCOUNTS_PER_CALL] for i in range(0, len(unique), MAX_ACCOUNTS_PER_CALL)]
+        results = self.rpc.batch([
+            ("getMultipleAccounts", [chunk, {"encoding": "base64", "commitment": self.rpc.commitment}]) for chunk in chunks
+        ])
+        out: Dict[str, Optional[bytes]] = {}
+        for chunk, res in zip(chunks, results):
+            for address, info in zip(chunk, (res or {}).get("value") or []):
+                data = (info or {}).get("data")
+                out[address] = base64.b64decode(data[0]) if isinstance(data, list) and data else None
+        return out
+
+    def read(self, tokens: List[Tuple[str, Optional[str], Optional[str]]]) -> Dict[str, Dict[str, Any]]:
+        """Liquidity of each ``(mint, bonding_curve, raydium_pool)``; curve and pool may be None."""
+        plans = []
+        addresses = list(self.sol_usd_vaults) if self.sol_usd is None else []
+        for mint, curve, pool in tokens:
+            curve = curve or bonding_curve_address(mint)
+            swap = pumpswap_pool_address(mint)
+            plan = {
+                "mint": mint, "curve": curve, "raydium": pool,
+                "swap_base": [associated_token_address(swap, mint, p) for p in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID)],
+                "swap_quote": associated_token_address(swap, WSOL_MINT),
+            }
+            plans.append(plan)
+            addresses += [mint, curve, *plan["swap_base"], plan["swap_quote"]] + ([pool] if pool else [])
+        accounts = self.fetch_accounts(addresses)
+
+        # Raydium vaults are only known once the pool account has been read
+        raydium = {p["mint"]: decode_raydium_pool(accounts.get(p["raydium"])) for p in plans if p["raydium"]}
+        vaults = [v for pool in raydium.values() if pool for v in (pool["base_vault"], pool["quote_vault"])]
+        if vaults:
+            accounts.update(self.fetch_accounts(vaults))
+
+        sol_usd = self._sol_usd(accounts)
+        return {p["mint"]: self._summarize(p, accounts, raydium.get(p["mint"]), sol_usd) for p in plans}
+
+    def _sol_usd(self, accounts: Dict[str, Optional[bytes]]) -> Optional[float]:
+        if self.sol_usd is not None:
+            return float(self.sol_usd)
+        sol = decode_token_amount(accounts.get(self.sol_usd_vaults[0]))
+        usdc = decode_token_amount(accounts.get(self.sol_usd_vaults[1]))
+        if not sol or not usdc:
+            return None
+        return round((usdc / 1e6) / (sol / LAMPORTS_PER_SOL), 4)
+
+    def _summarize(self, plan: Dict[str, Any], accounts: Dict[str, Optional[bytes]], raydium: Optional[Dict[str, Any]],
+                   sol_usd: Optional[float]) -> Dict[str, Any]:
+        decimals = decode_mint_decimals(accounts.get(plan["mint"]))
+        curve = decode_bonding_curve(accounts.get(plan["curve"]))
+        result: Dict[str, Any] = {"source": None, "bonding_curve": plan["curve"], "curve_complete": None,
+                                  "curve_progress": None, "sol_usd": sol_usd}
+        if curve is not None:
+            result["curve_complete"] = curve.complete
+            result["curve_progress"] = round(min(1.0, max(0.0, 1 - curve.real_token_reserves / INITIAL_REAL_TOKEN_RESERVES)), 4)
+        if curve is not None and not curve.complete:
+            decimals = 6 if decimals is None else decimals
+            return self._reserves(result, "pumpfun_curve", curve.real_sol_reserves, curve.virtual_sol_reserves,
+                                  curve.virtual_token_reserves, decimals, max_sol=curve.real_sol_reserves,
+                                  max_tokens=curve.real_token_reserves)
+        swap_tokens = next((a for a in (decode_token_amount(accounts.get(v)) for v in plan["swap_base"]) if a is not None), None)
+        swap_sol = decode_token_amount(accounts.get(plan["swap_quote"]))
+        if swap_tokens and swap_sol and decimals is not None:
+            return self._reserves(result, "pumpswap", swap_sol, swap_sol, swap_tokens, decimals)
+        if raydium and WSOL_MINT in (raydium["base_mint"], raydium["quote_mint"]):
+            base = decode_token_amount(accounts.get(raydium["base_vault"]))
+            quote = decode_token_amount(accounts.get(raydium["quote_vault"]))
+            if base and quote:
+                if raydium["quote_mint"] == WSOL_MINT:
+                    return self._reserves(result, "raydium", quote, quote, base, int(raydium["base_decimals"]))
+                return self._reserves(result, "raydium", base, base, quote, int(raydium["quote_decimals"]))
+        return result
+
+    def _reserves(self, result: Dict[str, Any], source: str, real_sol: int, sol: int, tokens: int, decimals: int,
+                  max_sol: Optional[int] = None, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        scale = 10 ** decimals
+        sol_reserve, token_reserve = sol / LAMPORTS_PER_SOL, tokens / scale
+        sol_usd = result["sol_usd"]
+        # Both sides count, as Dexscreener reports it; a curve's token side is worth what its SOL side is
+        liquidity_sol = 2 * real_sol / LAMPORTS_PER_SOL
+        result.update({
+            "source": source,
+            "sol_reserve": round(real_sol / LAMPORTS_PER_SOL, 6),
+            "token_reserve": round((max_tokens if max_tokens is not None else tokens) / scale, 6),
+            "price_sol": sol_reserve / token_reserve if token_reserve else None,
+            "liquidity_sol": round(liquidity_sol, 6),
+            "liquidity_usd": round(liquidity_sol * sol_usd, 2) if sol_usd else None,
+            "price_impact": price_impact(
+                sol_reserve, token_reserve, self.trade_sizes,
+                max_sol_out=max_sol / LAMPORTS_PER_SOL if max_sol is not None else None,
+                max_tokens_out=max_tokens / scale if max_tokens is not None else None,
+            ),
+        })
+        return result
+
+    def analyze(self, mint: str, bonding_curve: Optional[str] = None, raydium_pool: Optional[str] = None) -> Dict[str, Any]:
+        """One token's liquidity; callers arriving within ``batch_window_ms`` of each other share one batch."""
+        key = (mint, bonding_curve, raydium_pool)
+        with self._lock:
+            slot = self._pending.get(key)
+            if slot is None:
+                slot = self._pending[key] = _Slot()
+            leader = not self._leader
+            self._leader = True
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch, self._pending, self._leader = self._pending, {}, False
+            try:
+                results = self.read(list(batch))
+                for (m, _, _), s in batch.items():
+                    s.result = results.get(m)
+            except Exception as e:
+                for s in batch.values():
+                    s.error = e
+            finally:
+                for s in batch.values():
+                    s.done.set()
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        return dict(slot.result or {})
+
+
+class _Slot:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+_readers: Dict[str, LiquidityReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_liquidity_reader(config: Dict[str, Any]) -> Optional[LiquidityReader]:
+    """Process-wide reader (so concurrent analyses batch together), or None when ``liquidity.enabled`` is off."""
+    lcfg = config.get("liquidity", {})
+    if not lcfg.get("enabled", True):
+        return None
+    key = repr((sorted(lcfg.items(), key=str), (config.get("solana") or {}).get("rpc_url")))
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = _readers[key] = LiquidityReader(config)
+        return reader
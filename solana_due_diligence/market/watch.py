@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from solana_due_diligence.developer.creator_index import RUGGED, get_creator_index
+from solana_due_diligence.market import dexscreener
+from solana_due_diligence.metrics.holder_snapshots import HolderSnapshotStore, fetch_largest_accounts, get_holder_snapshots
+from solana_due_diligence.notify.outbox import get_outbox
+
+
+Fetcher = Callable[[List[str]], Dict[str, List[Dict[str, Any]]]]
+AlertHandler = Callable[[Dict[str, Any]], None]
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class WatchedToken:
+    mint: str
+    added_at: float
+    next_due: float = 0.0
+    interval: float = 0.0
+    polls: int = 0
+    price: Optional[float] = None
+    liquidity: Optional[float] = None
+    buys_h1: Optional[int] = None
+    sells_h1: Optional[int] = None
+    baseline_price: Optional[float] = None
+    peak_liquidity: float = 0.0
+    volatility: float = 0.0
+    holders_at: float = 0.0
+    top_sold_share: Optional[float] = None
+    active_alerts: Set[str] = field(default_factory=set)
+
+
+def _best_pair(pairs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not pairs:
+        return None
+    return max(pairs, key=lambda p: (p.get("liquidity", {}).get("usd", 0) or 0))
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class WatchEngine:
+    """Tracks price, liquidity and txn counts of analyzed tokens with batched Dexscreener polls.
+
+    A heap keyed by next-due time schedules tokens. Young or volatile tokens
+    are polled often and old, quiet ones rarely. Every poll takes up to 30 due
+    tokens in one request, and requests are paced by a token bucket. A large
+    watchlist therefore makes polls lag; it never raises the request rate.
+    """
+
+    def __init__(self, config: Dict[str, Any], fetcher: Optional[Fetcher] = None,
+                 on_alert: Optional[AlertHandler] = None, share: float = 1.0,
+                 holders: Optional[HolderSnapshotStore] = None, holder_fetcher: Optional[Fetcher] = None) -> None:
+        self.config = config
+        wcfg = config.get("watch", {})
+        self.max_tokens = int(wcfg.get("max_tokens", 5000))
+        self.max_age = float(wcfg.get("max_age_hours", 24)) * 3600
+        self.min_interval = float(wcfg.get("min_interval_seconds", 15))
+        self.max_interval = float(wcfg.get("max_interval_seconds", 900))
+        self.rate = float(wcfg.get("max_requests_per_minute", 120)) * share / 60.0
+        self.batch_size = min(int(wcfg.get("batch_size", dexscreener.MAX_TOKENS_PER_REQUEST)),
+                              dexscreener.MAX_TOKENS_PER_REQUEST)
+        self.price_up_pct = float(wcfg.get("price_up_pct", 100))
+        self.price_down_pct = float(wcfg.get("price_down_pct", 50))
+        self.liquidity_drop_pct = float(wcfg.get("liquidity_drop_pct", 50))
+        self.rug_liquidity_drop_pct = float(wcfg.get("rug_liquidity_drop_pct", 90))
+        self.fetcher: Fetcher = fetcher or (lambda mints: dexscreener.fetch_pairs_for_tokens(self.config, mints))
+        self.on_alert = on_alert or self._default_alert
+        # Holder snapshots ride along with price polls, at most one per token per interval
+        hcfg = config.get("holder_snapshots", {})
+        self.holders = holders if holders is not None else get_holder_snapshots(config)
+        self.holder_interval = float(hcfg.get("interval_seconds", 600))
+        self.holder_dump_pct = float(hcfg.get("dump_alert_pct", 50))
+        self.holder_fetcher: Fetcher = holder_fetcher or (lambda mints: fetch_largest_accounts(self.config, mints))
+        self.tokens: Dict[str, WatchedToken] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._bucket = 1.0
+        self._bucket_at = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"requests": 0, "polled": 0, "alerts": 0, "errors": 0, "holder_snapshots": 0, "lag_seconds": 0.0}
+
+    def add(self, mint: str, now: Optional[float] = None) -> None:
+        now = now if now is not None else time.time()
+        with self._lock:
+            if mint in self.tokens:
+                return
+            if len(self.tokens) >= self.max_tokens:
+                oldest = min(self.tokens.values(), key=lambda t: t.added_at)
+                del self.tokens[oldest.mint]
+            token = WatchedToken(mint=mint, added_at=now, interval=self.min_interval)
+            self.tokens[mint] = token
+            self._schedule(token, now)
+
+    def remove(self, mint: str) -> None:
+        with self._lock:
+            self.tokens.pop(mint, None)
+
+    def _schedule(self, token: WatchedToken, due: float) -> None:
+        token.next_due = due
+        heapq.heappush(self._heap, (due, next(self._seq), token.mint))
+
+    def _interval_for(self, token: WatchedToken, now: float) -> float:
+        age = now - token.added_at
+        if age < 600:
+            base = self.min_interval
+        elif age < 3600:
+            base = 60.0
+        elif age < 6 * 3600:
+            base = 300.0
+        else:
+            base = self.max_interval
+        # Volatile tokens get polled faster than their age alone would suggest
+        if token.volatility > 0.2:
+            base /= 4
+        elif token.volatility > 0.05:
+            base /= 2
+        return max(self.min_interval, min(self.max_interval, base))
+
+    def _take_due(self, now: float) -> List[WatchedToken]:
+        due: List[WatchedToken] = []
+        with self._lock:
+            while self._heap and len(due) < self.batch_size and self._heap[0][0] <= now:
+                ts, _, mint = heapq.heappop(self._heap)
+                token = self.tokens.get(mint)
+                if token is None or token.next_due != ts:
+                    continue  # removed or rescheduled
+                if now - token.added_at > self.max_age:
+                    del self.tokens[mint]
+                    continue
+                due.append(token)
+            if due:
+                self.stats["lag_seconds"] = round(now - due[0].next_due, 3)
+        return due
+
+    def next_wait(self, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.time()
+        with self._lock:
+            if not self._heap:
+                return 1.0
+            return max(0.0, self._heap[0][0] - now)
+
+    def _wait_for_budget(self) -> None:
+        while not self._stop.is_set():
+            if self.rate <= 0:
+                # max_requests_per_minute: 0 pauses polling
+                self._stop.wait(1.0)
+                continue
+            t = time.monotonic()
+            self._bucket = min(1.0, self._bucket + (t - self._bucket_at) * self.rate)
+            self._bucket_at = t
+            if self._bucket >= 1.0:
+                self._bucket -= 1.0
+                return
+            self._stop.wait((1.0 - self._bucket) / self.rate)
+
+    def poll_once(self, now: Optional[float] = None) -> int:
+        """Poll one batch of due tokens. Returns how many were polled."""
+        now = now if now is not None else time.time()
+        due = self._take_due(now)
+        if not due:
+            return 0
+        try:
+            self.stats["requests"] += 1
+            pairs_by_mint = self.fetcher([t.mint for t in due])
+        except Exception:
+            self.stats["errors"] += 1
+            pairs_by_mint = {}
+        if self.holders is not None:
+            self._snapshot_holders(due, now)
+        for token in due:
+            best = _best_pair(pairs_by_mint.get(token.mint) or [])
+            if best is not None:
+                self._update(token, best, now)
+            with self._lock:
+                if token.mint in self.tokens:
+                    token.interval = self._interval_for(token, now)
+                    self._schedule(token, now + token.interval)
+        self.stats["polled"] += len(due)
+        return len(due)
+
+    def _snapshot_holders(self, due: List[WatchedToken], now: float) -> None:
+        stale = [t for t in due if now - t.holders_at >= self.holder_interval]
+        if not stale or self.holders is None:
+            return
+        try:
+            holders_by_mint = self.holder_fetcher([t.mint for t in stale])
+        except Exception:
+            self.stats["errors"] += 1
+            return
+        for token in stale:
+            holders = holders_by_mint.get(token.mint)
+            if not holders:
+                continue
+            token.holders_at = now
+            self.holders.record(token.mint, holders, taken_at=now)
+            self.stats["holder_snapshots"] += 1
+            flow = self.holders.flow(token.mint)
+            if flow and flow["snapshots"] > 1:
+                token.top_sold_share = flow["top_sold_share"]
+
+    def _update(self, token: WatchedToken, pair: Dict[str, Any], now: float) -> None:
+        price = _float(pair.get("priceUsd"))
+        liquidity = _float((pair.get("liquidity") or {}).get("usd"))
+        h1 = (pair.get("txns") or {}).get("h1") or {}
+        if price is not None and token.price:
+            change = abs(price - token.price) / token.price
+            token.volatility = 0.7 * token.volatility + 0.3 * change
+        token.polls += 1
+        token.price = price if price is not None else token.price
+        token.liquidity = liquidity if liquidity is not None else token.liquidity
+        token.buys_h1, token.sells_h1 = h1.get("buys"), h1.get("sells")
+        if token.baseline_price is None and price:
+            token.baseline_price = price
+        if liquidity:
+            token.peak_liquidity = max(token.peak_liquidity, liquidity)
+        self._check_alerts(token, now)
+
+    def _check_alerts(self, token: WatchedToken, now: float) -> None:
+        conditions: Dict[str, bool] = {}
+        if token.price and token.baseline_price:
+            change_pct = (token.price / token.baseline_price - 1) * 100
+            conditions["price_up"] = change_pct >= self.price_up_pct
+            conditions["price_down"] = change_pct <= -self.price_down_pct
+        if token.peak_liquidity and token.liquidity is not None:
+            drop_pct = (1 - token.liquidity / token.peak_liquidity) * 100
+            conditions["liquidity_drop"] = drop_pct >= self.liquidity_drop_pct
+            conditions[RUGGED] = drop_pct >= self.rug_liquidity_drop_pct
+        if token.top_sold_share is not None:
+            conditions["holders_dump"] = token.top_sold_share * 100 >= self.holder_dump_pct
+        for kind, crossed in conditions.items():
+            # Alert once per crossing; re-arm when the condition clears
+            if crossed and kind not in token.active_alerts:
+                token.active_alerts.add(kind)
+                self.stats["alerts"] += 1
+                if kind == RUGGED:
+                    index = get_creator_index(self.config)
+                    if index:
+                        index.record_outcome(token.mint, RUGGED)
+                self.on_alert({
+                    "kind": kind,
+                    "mint": token.mint,
+                    "price_usd": token.price,
+                    "baseline_price_usd": token.baseline_price,
+                    "liquidity_usd": token.liquidity,
+                    "peak_liquidity_usd": token.peak_liquidity,
+                    "buys_h1": token.buys_h1,
+                    "sells_h1": token.sells_h1,
+                    "top_sold_share": token.top_sold_share,
+                    "at": now,
+                })
+            elif not crossed:
+                token.active_alerts.discard(kind)
+
+    def _default_alert(self, alert: Dict[str, Any]) -> None:
+        text = (f"Watch alert {alert['kind']} for {alert['mint']}: price ${alert['price_usd']} "
+                f"(start ${alert['baseline_price_usd']}), liquidity ${alert['liquidity_usd']}")
+        log.warning(text, extra={"mint": alert["mint"], "alert": alert["kind"]})
+        tcfg = self.config.get("telegram", {})
+        outbox = get_outbox(self.config)
+        if self.config.get("watch", {}).get("notify", True) and outbox and tcfg.get("chat_id"):
+            outbox.enqueue(tcfg["chat_id"], text)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="watch-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            wait = self.next_wait()
+            if wait > 0:
+                self._stop.wait(min(wait, 1.0))
+                continue
+            self._wait_for_budget()
+            if not self._stop.is_set():
+                self.poll_once()
+
+
+def should_watch(config: Dict[str, Any], report_data: Dict[str, Any]) -> bool:
+    """Whether an analyzed token joins the watchlist (watch.include: analyzed | gates_passed | signal_passed)."""
+    include = config.get("watch", {}).get("include", "gates_passed")
+    if include == "signal_passed":
+        return bool((report_data.get("signal") or {}).get("passed"))
+    if include == "gates_passed":
+        return bool((report_data.get("gates") or {}).get("passed"))
+    return True
+
+
+def run_watch(config: Dict[str, Any], mints: List[str]) -> None:
+    """Foreground watch of a fixed list of mints until interrupted."""
+    engine = WatchEngine(config)
+    for mint in mints:
+        engine.add(mint)
+    engine.start()
+    interval = float(config.get("watch", {}).get("stats_interval_seconds", 60))
+    log.info("Watching %d tokens", len(mints))
+    try:
+        while True:
+            time.sleep(interval)
+            log.info("Watch stats", extra={**engine.stats, "tokens": len(engine.tokens)})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop()
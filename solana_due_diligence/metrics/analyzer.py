@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from solana_due_diligence.metrics.clusters import HolderClusterAnalyzer
 from solana_due_diligence.providers.moralis import MoralisClient
 
 
@@ -15,6 +16,9 @@ class MetricsAnalyzer:
                 base_url=mcfg.get("base_url", "https://solana-gateway.moralis.io"),
                 api_key=mcfg.get("api_key") or None,
             )
+        self.clusters: Optional[HolderClusterAnalyzer] = None
+        if config.get("clusters", {}).get("enabled", False):
+            self.clusters = HolderClusterAnalyzer(config)
 
     @staticmethod
     def _compute_concentration(entries: List[Dict[str, Any]], decimals: int | None) -> Dict[str, Any]:
@@ -33,15 +37,21 @@ class MetricsAnalyzer:
         top20 = sum(amounts_sorted[:20]) / total
         return {"top10": top10, "top20": top20}
 
-    def analyze(self, mint: str, decimals: int | None) -> Dict[str, Any]:
-        if not self.client:
-            return {"moralis": None}
-        holders = self.client.get_token_holders(mint, limit=100) or {}
-        items = holders.get("result") or holders.get("data") or []
-        concentration = self._compute_concentration(items, decimals)
-        return {
-            "moralis": {
+    def analyze(self, mint: str, decimals: int | None, holders: Optional[List[Dict[str, Any]]] = None,
+                creator: Optional[str] = None, total_supply: Optional[float] = None) -> Dict[str, Any]:
+        """``holders`` (owner/address + amount) is the fallback holder list for clustering when Moralis is off."""
+        result: Dict[str, Any] = {"moralis": None}
+        items: List[Dict[str, Any]] = []
+        if self.client:
+            resp = self.client.get_token_holders(mint, limit=100) or {}
+            items = resp.get("result") or resp.get("data") or []
+            result["moralis"] = {
                 "holders_fetched": len(items),
-                "concentration": concentration,
+                "concentration": self._compute_concentration(items, decimals),
             }
-        }
+        if self.clusters is not None:
+            owned = [{"owner": i.get("ownerAddress") or i.get("owner"), "amount": i.get("amount") or i.get("balance")} for i in items]
+            owned = [h for h in owned if h["owner"]] or list(holders or [])
+            if owned:
+                result["clusters"] = self.clusters.analyze(owned, total=total_supply, creator=creator)
+        return result
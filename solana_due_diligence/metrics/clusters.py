@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from solana_due_diligence.providers.rpc_pool import get_rpc_pool
+from solana_due_diligence.providers.solana_rpc import SolanaRPC
+from solana_due_diligence.storage import open_sqlite
+
+
+# A wallet with this many signatures is not a fresh launch wallet; its first funding is not worth paging for
+MAX_SIGNATURES = 1000
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS funding_edges ("
+    "  wallet TEXT PRIMARY KEY,"
+    "  funder TEXT,"
+    "  slot INTEGER,"
+    "  signature TEXT,"
+    "  fetched_at REAL NOT NULL"
+    ")",
+    "CREATE INDEX IF NOT EXISTS funding_by_funder ON funding_edges (funder)",
+)
+
+
+class UnionFind:
+    """Disjoint sets over wallet addresses (union by size, path halving)."""
+
+    def __init__(self) -> None:
+        self.parent: Dict[str, str] = {}
+        self.size: Dict[str, int] = {}
+
+    def add(self, x: str) -> None:
+        if x not in self.parent:
+            self.parent[x] = x
+            self.size[x] = 1
+
+    def find(self, x: str) -> str:
+        self.add(x)
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: str, b: str) -> str:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+
+class FundingCache:
+    """First-funder edges per wallet, shared across tokens because sniper wallets recur.
+
+    A NULL funder means the wallet was looked up and had no usable funding
+    transfer (or too long a history); those are retried after ``negative_ttl``.
+    """
+
+    def __init__(self, path: str, negative_ttl: float = 86400.0) -> None:
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def get_many(self, wallets: Iterable[str], now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        now = now if now is not None else time.time()
+        wallets = list(wallets)
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for i in range(0, len(wallets), 500):
+                chunk = wallets[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in self._conn.execute(
+                    f"SELECT wallet, funder, slot, signature, fetched_at FROM funding_edges WHERE wallet IN ({marks})", chunk
+                ):
+                    if row["funder"] is None and now - row["fetched_at"] > self.negative_ttl:
+                        continue
+                    found[row["wallet"]] = dict(row)
+        return found
+
+    def put_many(self, edges: Iterable[Tuple[str, Optional[str], Optional[int], Optional[str]]], now: Optional[float] = None) -> None:
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO funding_edges (wallet, funder, slot, signature, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [(w, f, s, sig, now) for w, f, s, sig in edges],
+            )
+
+
+def funder_from_transaction(tx: Optional[Dict[str, Any]], wallet: str) -> Optional[str]:
+    """Who sent ``wallet`` its first SOL: the system transfer/createAccount source, else the fee payer."""
+    if not isinstance(tx, dict):
+        return None
+    message = (tx.get("transaction") or {}).get("message") or {}
+    instructions = list(message.get("instructions") or [])
+    for inner in (tx.get("meta") or {}).get("innerInstructions") or []:
+        instructions.extend(inner.get("instructions") or [])
+    for ix in instructions:
+        parsed = ix.get("parsed")
+        if ix.get("program") != "system" or not isinstance(parsed, dict):
+            continue
+        info = parsed.get("info") or {}
+        if parsed.get("type") in ("transfer", "transferWithSeed") and info.get("destination") == wallet:
+            return info.get("source")
+        if parsed.get("type") in ("createAccount", "createAccountWithSeed") and info.get("newAccount") == wallet:
+            return info.get("source")
+    keys = message.get("accountKeys") or []
+    payer = keys[0].get("pubkey") if keys and isinstance(keys[0], dict) else (keys[0] if keys else None)
+    return payer if payer and payer != wallet else None
+
+
+def _holder_amount(entry: Dict[str, Any]) -> float:
+    for key in ("amount", "balance", "uiAmount"):
+        try:
+            return float(entry.get(key) or 0)
+        except (TypeError, ValueError):
+            continue
+    return 0.0
+
+
+class HolderClusterAnalyzer:
+    """Groups top holders by who funded them and reports cluster-adjusted concentration.
+
+    First-funding transactions are fetched with batched JSON-RPC calls
+    (signatures, then transactions) over the RPC pool, a few batches in
+    parallel, and stop at ``time_budget_seconds``. Edges go to a SQLite cache
+    shared across tokens, and cached edges of funders add one more hop for
+    free. A union-find over holder -> funder edges yields the clusters.
+    """
+
+    def __init__(self, config: Dict[str, Any], rpc: Optional[SolanaRPC] = None, cache: Optional[FundingCache] = None) -> None:
+        ccfg = config.get("clusters", {})
+        self.max_holders = int(ccfg.get("max_holders", 100))
+        self.batch_size = int(ccfg.get("batch_size", 25))
+        self.concurrency = int(ccfg.get("concurrency", 4))
+        self.time_budget = float(ccfg.get("time_budget_seconds", 8))
+        self.ignore_funders = set(ccfg.get("ignore_funders") or [])
+        if rpc is None:
+            s = config.get("solana", {})
+            rpc = SolanaRPC(
+                rpc_url=s.get("rpc_url"),
+                commitment=s.get("commitment", "confirmed"),
+                timeout_seconds=s.get("timeout_seconds", 20),
+                pool=get_rpc_pool(config),
+            )
+        self.rpc = rpc
+        self.cache = cache if cache is not None else _get_cache(ccfg.get("cache_path", "state/funding.db"))
+
+    def resolve_owners(self, token_accounts: List[str]) -> Dict[str, str]:
+        """Owner wallet of each SPL token account, via getMultipleAccounts (100 per call)."""
+        owners: Dict[str, str] = {}
+        for i in range(0, len(token_accounts), 100):
+            chunk = token_accounts[i:i + 100]
+            res = self.rpc.batch([("getMultipleAccounts", [chunk, {"encoding": "jsonParsed"}])])[0] or {}
+            for account, info in zip(chunk, res.get("value") or []):
+                data = (info or {}).get("data")
+                owner = ((data.get("parsed") or {}).get("info") or {}).get("owner") if isinstance(data, dict) else None
+                if owner:
+                    owners[account] = owner
+        return owners
+
+    def _fetch_batch(self, wallets: List[str]) -> List[Tuple[str, Optional[str], Optional[int], Optional[str]]]:
+        sig_lists = self.rpc.batch([("getSignaturesForAddress", [w, {"limit": MAX_SIGNATURES}]) for w in wallets])
+        firsts: List[Tuple[str, str]] = []
+        edges: List[Tuple[str, Optional[str], Optional[int], Optional[str]]] = []
+        for wallet, sigs in zip(wallets, sig_lists):
+            if not sigs or len(sigs) >= MAX_SIGNATURES:
+                edges.append((wallet, None, None, None))
+            else:
+                firsts.append((wallet, sigs[-1]["signature"]))
+        txs = self.rpc.batch([
+            ("getTransaction", [sig, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}]) for _, sig in firsts
+        ])
+        for (wallet, sig), tx in zip(firsts, txs):
+            edges.append((wallet, funder_from_transaction(tx, wallet), (tx or {}).get("slot"), sig))
+        self.cache.put_many(edges)
+        return edges
+
+    def _funding_edges(self, wallets: List[str], deadline: float) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+        edges = self.cache.get_many(wallets)
+        missing = [w for w in wallets if w not in edges]
+        if not missing:
+            return edges, True
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        executor = _executor(self.concurrency)
+        futures = [executor.submit(self._fetch_batch, b) for b in batches]
+        done, pending = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for fut in pending:
+            # Over budget: queued batches are dropped, running ones still fill the cache for the next token
+            fut.cancel()
+        for fut in done:
+            try:
+                for wallet, funder, slot, sig in fut.result():
+                    edges[wallet] = {"wallet": wallet, "funder": funder, "slot": slot, "signature": sig}
+            except Exception:
+                continue
+        return edges, not pending and len(edges) >= len(wallets)
+
+    def analyze(self, holders: List[Dict[str, Any]], total: Optional[float] = None, creator: Optional[str] = None) -> Dict[str, Any]:
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        holders = sorted(holders, key=_holder_amount, reverse=True)[: self.max_holders]
+        unowned = [h["address"] for h in holders if not h.get("owner") and h.get("address")]
+        owners = self.resolve_owners(unowned) if unowned else {}
+        amounts: Dict[str, float] = {}
+        for h in holders:
+            owner = h.get("owner") or owners.get(h.get("address") or "")
+            if owner:
+                amounts[owner] = amounts.get(owner, 0.0) + _holder_amount(h)
+        wallets = list(amounts)
+        edges, complete = self._funding_edges(wallets, deadline)
+
+        uf = UnionFind()
+        for w in wallets:
+            uf.add(w)
+        funders = {e["funder"] for e in edges.values() if e.get("funder") and e["funder"] not in self.ignore_funders}
+        for w, e in edges.items():
+            if e.get("funder") in funders:
+                uf.union(w, e["funder"])
+        # One extra hop for free: funders whose own funder is already cached
+        for w, e in self.cache.get_many(funders).items():
+            if e.get("funder") and e["funder"] not in self.ignore_funders:
+                uf.union(w, e["funder"])
+
+        denominator = float(total) if total else (sum(amounts.values()) or 1.0)
+        groups: Dict[str, List[str]] = {}
+        for w in wallets:
+            groups.setdefault(uf.find(w), []).append(w)
+        creator_root = uf.find(creator) if creator and creator in uf.parent else None
+
+        clusters = []
+        for root, members in groups.items():
+            held = sum(amounts[m] for m in members)
+            funder_counts = Counter(edges[m]["funder"] for m in members if m in edges and edges[m].get("funder"))
+            clusters.append({
+                "funder": funder_counts.most_common(1)[0][0] if funder_counts else None,
+                "size": len(members),
+                "share": round(held / denominator, 4),
+                "creator_linked": root == creator_root,
+                "wallets": sorted(members, key=lambda m: -amounts[m])[:5],
+            })
+        clusters.sort(key=lambda c: -c["share"])
+        shares = sorted((amounts[w] / denominator for w in wallets), reverse=True)
+        multi = [c for c in clusters if c["size"] > 1]
+        return {
+            "holders_analyzed": len(wallets),
+            "funders_resolved": sum(1 for w in wallets if (edges.get(w) or {}).get("funder")),
+            "complete": complete,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "cluster_count": len(multi),
+            "raw_top10": round(sum(shares[:10]), 4),
+            "adjusted_top10": round(sum(c["share"] for c in clusters[:10]), 4),
+            "largest_cluster_share": multi[0]["share"] if multi else 0.0,
+            "creator_cluster_share": round(sum(c["share"] for c in clusters if c["creator_linked"]), 4),
+            "clusters": multi[:5],
+        }
+
+
+_caches: Dict[str, FundingCache] = {}
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_shared_lock = threading.Lock()
+
+
+def _get_cache(path: str) -> FundingCache:
+    with _shared_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = FundingCache(path)
+        return cache
+
+
+def _executor(workers: int) -> ThreadPoolExecutor:
+    with _shared_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clusters")
+        return executor
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from solana_due_diligence.ingestion.pumpfun import is_pubkey
+from solana_due_diligence.market.liquidity import pool_accounts
+from solana_due_diligence.providers.rpc_pool import get_rpc_pool
+from solana_due_diligence.providers.solana_rpc import SolanaRPC
+from solana_due_diligence.storage import open_sqlite
+
+
+INT64_MAX = 2 ** 63 - 1
+# Interned ids kept in memory before the address map is dropped and rebuilt from SQLite
+MAX_INTERNED = 200_000
+# With a retention set, record() prunes expired series at most this often
+PRUNE_INTERVAL = 3600.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS wallets ("
+    "  id INTEGER PRIMARY KEY,"
+    "  address TEXT NOT NULL UNIQUE"
+    ")",
+    "CREATE TABLE IF NOT EXISTS holder_snapshots ("
+    "  mint TEXT NOT NULL,"
+    "  seq INTEGER NOT NULL,"
+    "  taken_at REAL NOT NULL,"
+    "  keyframe INTEGER NOT NULL,"
+    "  data BLOB NOT NULL,"
+    "  PRIMARY KEY (mint, seq)"
+    ") WITHOUT ROWID",
+)
+
+State = Dict[int, int]
+
+
+def _pack(state: State) -> bytes:
+    """Sorted wallet ids (gap encoded) then balances, both int64, zlib compressed."""
+    ids = sorted(state)
+    gaps = array("q", (b - a for a, b in zip([0] + ids, ids)))
+    values = array("q", (state[i] for i in ids))
+    if sys.byteorder == "big":
+        gaps.byteswap()
+        values.byteswap()
+    return zlib.compress(gaps.tobytes() + values.tobytes())
+
+
+def _unpack(blob: bytes) -> State:
+    raw = zlib.decompress(blob)
+    half = len(raw) // 2
+    gaps, values = array("q"), array("q")
+    gaps.frombytes(raw[:half])
+    values.frombytes(raw[half:])
+    if sys.byteorder == "big":
+        gaps.byteswap()
+        values.byteswap()
+    state: State = {}
+    wallet = 0
+    for gap, value in zip(gaps, values):
+        wallet += gap
+        state[wallet] = value
+    return state
+
+
+def _amount(value: Any) -> Optional[int]:
+    try:
+        return min(int(value), INT64_MAX)
+    except (TypeError, ValueError):
+        try:
+            return min(int(float(value)), INT64_MAX)
+        except (TypeError, ValueError):
+            return None
+
+
+def normalize_holders(holders: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Raw balance per holder key; token accounts (``address``) win over ``owner`` so RPC and Solscan samples line up."""
+    out: Dict[str, int] = {}
+    for h in holders or []:
+        key = h.get("address") or h.get("owner")
+        amount = _amount(h.get("amount"))
+        if key and amount is not None:
+            out[key] = min(out.get(key, 0) + amount, INT64_MAX)
+    return out
+
+
+def exclude_pools(mint: str, holders: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop the bonding curve and PumpSwap pool accounts; their balance moves with trading, not with holders selling."""
+    if not is_pubkey(mint):
+        return list(holders or [])
+    pools = pool_accounts(mint)
+    return [h for h in holders or [] if (h.get("address") or h.get("owner")) not in pools and h.get("owner") not in pools]
+
+
+class HolderSnapshotStore:
+    """Per-token time series of top-holder balances in SQLite.
+
+    Holder addresses are interned to integer ids. Every ``keyframe_every``-th
+    snapshot stores the full balance array; the ones in between store only the
+    wallets whose balance changed and by how much. Arrays are int64, gap
+    encoded and compressed, so a 20-holder series costs a few hundred bytes
+    per keyframe and tens of bytes per quiet delta.
+
+    Snapshots cover the sampled top holders only: a wallet that drops out of
+    the sample reads as balance 0.
+
+    With ``retention_hours`` set, ``record`` drops series that have had no new
+    snapshot for that long (checked at most every ``PRUNE_INTERVAL``).
+    """
+
+    def __init__(self, path: str, keyframe_every: int = 12, retention_hours: float = 0) -> None:
+        self.path = path
+        self.keyframe_every = max(1, int(keyframe_every))
+        self.retention = float(retention_hours) * 3600
+        self._pruned_at = 0.0
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._addresses: Dict[int, str] = {}
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def _intern(self, addresses: List[str]) -> Dict[str, int]:
+        # Caller holds the lock
+        if len(self._ids) > MAX_INTERNED:
+            self._ids.clear()
+            self._addresses.clear()
+        missing = [a for a in addresses if a not in self._ids]
+        if missing:
+            self._conn.executemany("INSERT OR IGNORE INTO wallets (address) VALUES (?)", [(a,) for a in missing])
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in self._conn.execute(f"SELECT id, address FROM wallets WHERE address IN ({marks})", chunk):
+                    self._ids[row["address"]] = row["id"]
+                    self._addresses[row["id"]] = row["address"]
+        return {a: self._ids[a] for a in addresses}
+
+    def _resolve(self, ids: Iterable[int]) -> Dict[int, str]:
+        # Caller holds the lock
+        ids = list(ids)
+        missing = [i for i in ids if i not in self._addresses]
+        for k in range(0, len(missing), 500):
+            chunk = missing[k:k + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in self._conn.execute(f"SELECT id, address FROM wallets WHERE id IN ({marks})", chunk):
+                self._addresses[row["id"]] = row["address"]
+        return {i: self._addresses.get(i, str(i)) for i in ids}
+
+    def _latest(self, mint: str) -> Tuple[int, Optional[float], State]:
+        # Caller holds the lock; replays the last keyframe and the deltas after it
+        rows = self._conn.execute(
+            "SELECT seq, taken_at, keyframe, data FROM holder_snapshots WHERE mint = ? AND seq >= "
+            "(SELECT COALESCE(MAX(seq), 0) FROM holder_snapshots WHERE mint = ? AND keyframe = 1) ORDER BY seq",
+            (mint, mint),
+        ).fetchall()
+        seq, taken_at, state = -1, None, {}
+        for row in rows:
+            seq, taken_at = row["seq"], row["taken_at"]
+            state = _apply(state, row["keyframe"], _unpack(row["data"]))
+        return seq, taken_at, state
+
+    def record(self, mint: str, holders: Iterable[Dict[str, Any]], taken_at: Optional[float] = None) -> int:
+        """Append a snapshot of ``holders`` (address/owner + raw amount); returns its sequence number."""
+        taken_at = taken_at if taken_at is not None else time.time()
+        balances = normalize_holders(holders)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids = self._intern(list(balances))
+                state = {ids[a]: v for a, v in balances.items()}
+                last_seq, _, previous = self._latest(mint)
+                seq = last_seq + 1
+                keyframe = seq % self.keyframe_every == 0
+                if keyframe:
+                    payload = state
+                else:
+                    payload = {w: state.get(w, 0) - previous.get(w, 0) for w in previous.keys() | state.keys()}
+                    payload = {w: d for w, d in payload.items() if d}
+                self._conn.execute(
+                    "INSERT INTO holder_snapshots (mint, seq, taken_at, keyframe, data) VALUES (?, ?, ?, ?, ?)",
+                    (mint, seq, taken_at, int(keyframe), _pack(payload)),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                # Ids interned inside the rolled-back transaction do not exist
+                self._ids.clear()
+                self._addresses.clear()
+                raise
+        if self.retention and taken_at - self._pruned_at >= PRUNE_INTERVAL:
+            self._pruned_at = taken_at
+            self.prune(taken_at - self.retention)
+        return seq
+
+    def series(self, mint: str) -> List[Tuple[float, Dict[str, int]]]:
+        """Every snapshot of ``mint`` as (taken_at, address -> balance), oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT taken_at, keyframe, data FROM holder_snapshots WHERE mint = ? ORDER BY seq", (mint,)
+            ).fetchall()
+            states: List[Tuple[float, State]] = []
+            state: State = {}
+            for row in rows:
+                state = _apply(state, row["keyframe"], _unpack(row["data"]))
+                states.append((row["taken_at"], state))
+            names = self._resolve({w for _, s in states for w in s})
+        return [(t, {names[w]: v for w, v in s.items() if v}) for t, s in states]
+
+    def _first_and_latest(self, mint: str) -> Optional[Tuple[float, State, float, State, int]]:
+        # Caller holds the lock
+        first = self._conn.execute(
+            "SELECT taken_at, data FROM holder_snapshots WHERE mint = ? AND seq = 0", (mint,)
+        ).fetchone()
+        if first is None:
+            return None
+        seq, taken_at, latest = self._latest(mint)
+        return first["taken_at"], _unpack(first["data"]), taken_at, latest, seq + 1
+
+    def sellers(self, mint: str, min_sold: float = 0.5, top: int = 10) -> List[Dict[str, Any]]:
+        """Of the ``top`` holders in the first snapshot, those whose balance has since fallen by more than ``min_sold``."""
+        with self._lock:
+            ends = self._first_and_latest(mint)
+            if ends is None:
+                return []
+            _, launch, _, latest, _ = ends
+            leaders = sorted(launch, key=lambda w: -launch[w])[:top]
+            sold = []
+            for w in leaders:
+                start, now = launch[w], latest.get(w, 0)
+                if start > 0 and 1 - now / start > min_sold:
+                    sold.append((w, start, now))
+            names = self._resolve(w for w, _, _ in sold)
+        return [
+            {"address": names[w], "launch_amount": start, "current_amount": now, "sold_pct": round((1 - now / start) * 100, 1)}
+            for w, start, now in sold
+        ]
+
+    def flow(self, mint: str, top: int = 10, min_sold: float = 0.5) -> Optional[Dict[str, Any]]:
+        """Summary of how the launch top holders moved since the first snapshot, or None without snapshots."""
+        with self._lock:
+            ends = self._first_and_latest(mint)
+        if ends is None:
+            return None
+        first_at, launch, last_at, latest, count = ends
+        leaders = sorted(launch, key=lambda w: -launch[w])[:top]
+        held_then = sum(launch[w] for w in leaders)
+        held_now = sum(min(latest.get(w, 0), launch[w]) for w in leaders)
+        added = sum(max(0, latest.get(w, 0) - launch[w]) for w in leaders)
+        return {
+            "snapshots": count,
+            "span_seconds": round((last_at or first_at) - first_at, 1),
+            "top_holders": len(leaders),
+            "top_sold_share": round(1 - held_now / held_then, 4) if held_then else 0.0,
+            "top_accumulated_share": round(added / held_then, 4) if held_then else 0.0,
+            "sellers": sum(1 for w in leaders if launch[w] and 1 - latest.get(w, 0) / launch[w] > min_sold),
+            "new_holders": sum(1 for w, v in latest.items() if v and w not in launch),
+        }
+
+    def prune(self, older_than: float) -> int:
+        """Drop the series of tokens whose latest snapshot is older than ``older_than`` (epoch seconds).
+
+        Wallets no remaining snapshot refers to are removed too. Returns the
+        number of snapshots dropped.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._conn.execute(
+                    "DELETE FROM holder_snapshots WHERE mint IN "
+                    "(SELECT mint FROM holder_snapshots GROUP BY mint HAVING MAX(taken_at) < ?)",
+                    (older_than,),
+                ).rowcount
+                if removed:
+                    # Wallet ids live inside the packed arrays, so the survivors are read back to find them
+                    referenced = set()
+                    for row in self._conn.execute("SELECT data FROM holder_snapshots"):
+                        referenced.update(_unpack(row["data"]))
+                    self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS referenced_wallets (id INTEGER PRIMARY KEY)")
+                    self._conn.executemany("INSERT INTO referenced_wallets (id) VALUES (?)", [(i,) for i in referenced])
+                    self._conn.execute("DELETE FROM wallets WHERE id NOT IN (SELECT id FROM referenced_wallets)")
+                    self._conn.execute("DELETE FROM referenced_wallets")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            # Interned ids may point at deleted wallets
+            self._ids.clear()
+            self._addresses.clear()
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(DISTINCT mint) AS n FROM holder_snapshots").fetchone()["n"])
+
+
+def _apply(state: State, keyframe: int, payload: State) -> State:
+    if keyframe:
+        return dict(payload)
+    state = dict(state)
+    for w, d in payload.items():
+        state[w] = state.get(w, 0) + d
+    return state
+
+
+def fetch_largest_accounts(config: Dict[str, Any], mints: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Top token accounts of several mints in one JSON-RPC batch, pool accounts excluded."""
+    s = config.get("solana", {})
+    rpc = SolanaRPC(rpc_url=s.get("rpc_url"), commitment=s.get("commitment", "confirmed"),
+                    timeout_seconds=s.get("timeout_seconds", 20), pool=get_rpc_pool(config))
+    results = rpc.batch([("getTokenLargestAccounts", [m, {"commitment": rpc.commitment}]) for m in mints])
+    return {m: exclude_pools(m, (r or {}).get("value") or []) for m, r in zip(mints, results) if r}
+
+
+_stores: Dict[str, HolderSnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_holder_snapshots(config: Dict[str, Any]) -> Optional[HolderSnapshotStore]:
+    """Process-wide store for ``holder_snapshots.path``, or None when disabled."""
+    hcfg = config.get("holder_snapshots", {})
+    if not hcfg.get("enabled", False):
+        return None
+    path = hcfg.get("path", "state/holders.db")
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = HolderSnapshotStore(path, keyframe_every=int(hcfg.get("keyframe_every", 12)),
+                                                        retention_hours=float(hcfg.get("retention_hours", 168)))
+        return store
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from solana_due_diligence.notify.telegram import post_message
+from solana_due_diligence.storage import open_sqlite
+
+
+# Telegram rejects messages longer than this
+MAX_MESSAGE_CHARS = 4096
+GLOBAL_KEY = "*"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS outbox ("
+    "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    "  chat_id TEXT NOT NULL,"
+    "  text TEXT NOT NULL,"
+    "  created_at REAL NOT NULL,"
+    "  attempts INTEGER NOT NULL DEFAULT 0,"
+    "  next_attempt_at REAL NOT NULL,"
+    "  status TEXT NOT NULL DEFAULT 'pending',"
+    "  lease_until REAL"
+    ")",
+    "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, chat_id, next_attempt_at)",
+    "CREATE TABLE IF NOT EXISTS send_slots (key TEXT PRIMARY KEY, next_send_at REAL NOT NULL)",
+)
+
+Sender = Callable[[str, str, str], Tuple[bool, Optional[float]]]
+
+
+class TelegramOutbox:
+    """Persisted Telegram queue drained by a background sender thread.
+
+    Sends respect a global rate and a per-chat minimum interval; both are kept
+    in SQLite so every process sharing the file (stream workers) honours them.
+    When a chat has ``digest_after`` or more messages waiting, they go out as
+    one digest message instead of one message each.
+    """
+
+    def __init__(self, bot_token: str, path: str, global_rate: float = 25.0, per_chat_interval: float = 1.0,
+                 max_attempts: int = 5, digest_after: int = 3, sender: Optional[Sender] = None) -> None:
+        self.bot_token = bot_token
+        self.path = path
+        self.global_interval = 1.0 / max(global_rate, 0.001)
+        self.per_chat_interval = per_chat_interval
+        self.max_attempts = max_attempts
+        self.digest_after = max(2, digest_after)
+        self.lease_seconds = 60.0
+        self.sender: Sender = sender or (lambda chat_id, text, _token=bot_token: post_message(_token, chat_id, text))
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def enqueue(self, chat_id: str, text: str) -> int:
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO outbox (chat_id, text, created_at, next_attempt_at) VALUES (?, ?, ?, ?)",
+                (str(chat_id), text, now, now),
+            )
+        self._wake.set()
+        return int(cur.lastrowid)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) AS n FROM outbox WHERE status IN ('pending', 'sending')").fetchone()
+        return int(row["n"])
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="telegram-outbox", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Give queued messages up to ``timeout`` seconds to go out, then stop the sender."""
+        deadline = time.monotonic() + timeout
+        while self._thread is not None and self.pending_count() and time.monotonic() < deadline:
+            self._wake.set()
+            time.sleep(0.1)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                wait = self.send_next()
+            except Exception:
+                wait = 1.0
+            if wait > 0:
+                self._wake.wait(timeout=min(wait, 1.0))
+                self._wake.clear()
+
+    def send_next(self) -> float:
+        """Send at most one message (or digest). Returns seconds until more work may be due."""
+        claimed = self._claim(time.time())
+        if isinstance(claimed, float):
+            return claimed
+        chat_id, rows = claimed
+        text = _digest([r["text"] for r in rows]) if len(rows) > 1 else rows[0]["text"]
+        try:
+            ok, retry_after = self.sender(chat_id, text)
+        except Exception:
+            ok, retry_after = False, None
+        self._settle(chat_id, [r["id"] for r in rows], ok, retry_after)
+        return 0.0
+
+    def _claim(self, now: float) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = self._claim_locked(now)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _claim_locked(self, now: float) -> Any:
+        conn = self._conn
+        # Recover messages leased by a sender that died mid-send
+        conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending' AND lease_until < ?", (now,))
+        slots = {r["key"]: r["next_send_at"] for r in conn.execute("SELECT key, next_send_at FROM send_slots")}
+        global_wait = slots.get(GLOBAL_KEY, 0.0) - now
+        if global_wait > 0:
+            return global_wait
+
+        chats = conn.execute(
+            "SELECT chat_id, COUNT(*) AS n, MIN(id) AS first_id FROM outbox"
+            " WHERE status = 'pending' AND next_attempt_at <= ? GROUP BY chat_id ORDER BY first_id",
+            (now,),
+        ).fetchall()
+        ready = [c for c in chats if slots.get(c["chat_id"], 0.0) <= now]
+        if not ready:
+            waits = [slots.get(c["chat_id"], 0.0) - now for c in chats]
+            nxt = conn.execute("SELECT MIN(next_attempt_at) AS t FROM outbox WHERE status = 'pending'").fetchone()["t"]
+            if nxt is not None and nxt > now:
+                waits.append(nxt - now)
+            return max(min(waits), 0.05) if waits else 1.0
+
+        chat = ready[0]
+        limit = chat["n"] if chat["n"] >= self.digest_after else 1
+        rows = conn.execute(
+            "SELECT id, text FROM outbox WHERE status = 'pending' AND chat_id = ? AND next_attempt_at <= ?"
+            " ORDER BY id LIMIT ?",
+            (chat["chat_id"], now, limit),
+        ).fetchall()
+        rows = _fit_digest(rows)
+        conn.executemany(
+            "UPDATE outbox SET status = 'sending', lease_until = ? WHERE id = ?",
+            [(now + self.lease_seconds, r["id"]) for r in rows],
+        )
+        conn.execute("INSERT OR REPLACE INTO send_slots (key, next_send_at) VALUES (?, ?)",
+                     (chat["chat_id"], now + self.per_chat_interval))
+        conn.execute("INSERT OR REPLACE INTO send_slots (key, next_send_at) VALUES (?, ?)",
+                     (GLOBAL_KEY, now + self.global_interval))
+        return chat["chat_id"], rows
+
+    def _settle(self, chat_id: str, ids: List[int], ok: bool, retry_after: Optional[float]) -> None:
+        now = time.time()
+        marks = ",".join("?" * len(ids))
+        with self._lock:
+            if ok:
+                self._conn.execute(f"DELETE FROM outbox WHERE id IN ({marks})", ids)
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if retry_after is not None:
+                    # Rate limited: hold the whole chat, the messages themselves are fine
+                    self._conn.execute("INSERT OR REPLACE INTO send_slots (key, next_send_at) VALUES (?, ?)",
+                                       (chat_id, now + retry_after))
+                    self._conn.execute(f"UPDATE outbox SET status = 'pending' WHERE id IN ({marks})", ids)
+                else:
+                    for row in self._conn.execute(f"SELECT id, attempts FROM outbox WHERE id IN ({marks})", ids).fetchall():
+                        attempts = row["attempts"] + 1
+                        status = "dead" if attempts >= self.max_attempts else "pending"
+                        self._conn.execute(
+                            "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ? WHERE id = ?",
+                            (status, attempts, now + min(2.0 ** attempts, 300.0), row["id"]),
+                        )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+def _digest(texts: List[str]) -> str:
+    return f"{len(texts)} signals:\n" + "\n".join(f"• {t}" for t in texts)
+
+
+def _fit_digest(rows: List[Any]) -> List[Any]:
+    fitted: List[Any] = []
+    for row in rows:
+        if fitted and len(_digest([r["text"] for r in fitted + [row]])) > MAX_MESSAGE_CHARS:
+            break
+        fitted.append(row)
+    return fitted
+
+
+_outboxes: Dict[str, TelegramOutbox] = {}
+_outboxes_lock = threading.Lock()
+
+
+def get_outbox(config: Dict[str, Any]) -> Optional[TelegramOutbox]:
+    """Process-wide outbox with its sender thread running, or None when disabled."""
+    tcfg = config.get("telegram", {})
+    ocfg = tcfg.get("outbox") or {}
+    if not ocfg.get("enabled") or not tcfg.get("bot_token"):
+        return None
+    path = ocfg.get("path", "state/outbox.db")
+    with _outboxes_lock:
+        outbox = _outboxes.get(path)
+        if outbox is None:
+            outbox = TelegramOutbox(
+                tcfg["bot_token"],
+                path,
+                global_rate=float(ocfg.get("global_rate", 25)),
+                per_chat_interval=float(ocfg.get("per_chat_interval_seconds", 1.0)),
+                max_attempts=int(ocfg.get("max_attempts", 5)),
+                digest_after=int(ocfg.get("digest_after", 3)),
+            )
+            outbox.start()
+            atexit.register(outbox.close, float(ocfg.get("drain_on_exit_seconds", 10)))
+            _outboxes[path] = outbox
+        return outbox
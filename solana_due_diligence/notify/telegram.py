@@ -1,13 +1,31 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 
+from solana_due_diligence.providers import http
+
+
+def post_message(bot_token: str, chat_id: str, text: str) -> Tuple[bool, Optional[float]]:
+    """Send one message. Returns (ok, retry_after) where retry_after is set when Telegram answers 429."""
+    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    r = http.session().post(url, json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"}, timeout=15)
+    if r.status_code == 429:
+        retry_after = 1.0
+        try:
+            retry_after = float(r.json().get("parameters", {}).get("retry_after", retry_after))
+        except Exception:
+            pass
+        return False, retry_after
+    return r.status_code == 200, None
+
 
 def send_message(bot_token: str, chat_id: str, text: str) -> bool:
     if not bot_token or not chat_id:
         return False
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    r = requests.post(url, json={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"}, timeout=15)
-    return r.status_code == 200
+    try:
+        ok, _ = post_message(bot_token, chat_id, text)
+    except requests.RequestException:
+        return False
+    return ok
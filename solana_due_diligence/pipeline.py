@@ -0,0 +1,14 @@
+"""Analysis stages and tiers, kept free of provider imports so config validation can use them."""
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+
+# Stages that cost external calls beyond the cheap gate data
+EXPENSIVE_STAGES = ("community", "developer", "github", "metrics")
+# Expensive stages each analysis tier runs; pipeline.tiers overrides them
+DEFAULT_TIERS: Dict[str, Tuple[str, ...]] = {
+    "minimal": (),
+    "standard": ("developer", "metrics"),
+    "deep": EXPENSIVE_STAGES,
+}
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+log = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["TokenProfile"]] = ContextVar("token_profile", default=None)
+# Functions listed in a kept profile's JSON summary
+TOP_FUNCTIONS = 30
+
+
+class TokenProfile:
+    """Wall time of one token's analysis by stage and by provider call, plus an optional cProfile."""
+
+    def __init__(self, mint: str, cpu: bool = True) -> None:
+        self.mint = mint
+        self.started_at = time.time()
+        self.wall_ms = 0.0
+        self.stages: Dict[str, float] = {}
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.cpu: Optional[cProfile.Profile] = cProfile.Profile() if cpu else None
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, ms: float) -> None:
+        with self._lock:
+            self.stages[stage] = round(self.stages.get(stage, 0.0) + ms, 1)
+
+    def add_call(self, key: str, ms: float, error: bool = False) -> None:
+        with self._lock:
+            entry = self.calls.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + ms, 1)
+            entry["max_ms"] = round(max(entry["max_ms"], ms), 1)
+            entry["errors"] += int(error)
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+        if self.cpu is None:
+            return []
+        stats = pstats.Stats(self.cpu).stats  # type: ignore[attr-defined]
+        rows = sorted(stats.items(), key=lambda kv: -kv[1][3])[:limit]
+        return [
+            {"function": f"{path}:{line}({name})", "calls": nc, "self_ms": round(tt * 1000, 1), "cumulative_ms": round(ct * 1000, 1)}
+            for (path, line, name), (_, nc, tt, ct, _) in rows
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        calls = sorted(self.calls.items(), key=lambda kv: -kv[1]["total_ms"])
+        return {
+            "mint": self.mint,
+            "started_at": round(self.started_at, 3),
+            "wall_ms": self.wall_ms,
+            "stages": dict(sorted(self.stages.items(), key=lambda kv: -kv[1])),
+            # Security checks, signals, report writing and notifications
+            "other_ms": round(max(0.0, self.wall_ms - sum(self.stages.values())), 1),
+            "calls": {k: v for k, v in calls},
+            "network_ms": round(sum(v["total_ms"] for k, v in calls if not k.startswith("wait ")), 1),
+            "rate_limit_wait_ms": round(sum(v["total_ms"] for k, v in calls if k.startswith("wait ")), 1),
+        }
+
+
+def add_stage(stage: str, ms: float) -> None:
+    prof = _current.get()
+    if prof is not None:
+        prof.add_stage(stage, ms)
+
+
+@contextmanager
+def call(key: str) -> Iterator[None]:
+    """Time a provider call (or rate-limit wait) into the active token profile, if any."""
+    prof = _current.get()
+    if prof is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        prof.add_call(key, (time.perf_counter() - t0) * 1000, error=failed)
+
+
+class Profiler:
+    """Profiles every analysis and keeps those slower than ``profiling.threshold_ms``.
+
+    A kept token gets ``<dir>/<time>-<mint>.json`` (stages, provider calls,
+    top functions) and, with ``cpu``, a ``.prof`` file for pstats/snakeviz;
+    ``<dir>/index.jsonl`` lists one line per kept profile. Calls made on
+    helper thread pools are not attributed to the token.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        pcfg = config.get("profiling", {})
+        self.dir = Path(pcfg.get("dir", "profiles"))
+        self.threshold_ms = float(pcfg.get("threshold_ms", 10000))
+        self.cpu = bool(pcfg.get("cpu", True))
+        self.keep = int(pcfg.get("keep", 200))
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, mint: str) -> Iterator[TokenProfile]:
+        prof = TokenProfile(mint, cpu=self.cpu)
+        token = _current.set(prof)
+        if prof.cpu is not None:
+            try:
+                prof.cpu.enable()
+            except ValueError:
+                # Another profiler owns this thread
+                prof.cpu = None
+        t0 = time.perf_counter()
+        try:
+            yield prof
+        finally:
+            if prof.cpu is not None:
+                prof.cpu.disable()
+            prof.wall_ms = round((time.perf_counter() - t0) * 1000, 1)
+            _current.reset(token)
+            if prof.wall_ms >= self.threshold_ms:
+                try:
+                    self._keep(prof)
+                except OSError as e:
+                    log.error("Could not write profile: %s", e, extra={"mint": mint})
+
+    def _keep(self, prof: TokenProfile) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(prof.started_at))
+        base = self.dir / f"{stamp}-{prof.mint}"
+        summary = prof.summary()
+        if prof.cpu is not None:
+            prof.cpu.dump_stats(str(base.with_suffix(".prof")))
+            summary["cpu_profile"] = base.with_suffix(".prof").name
+        summary["top_functions"] = prof.top_functions()
+        base.with_suffix(".json").write_text(json.dumps(summary, indent=2))
+        slowest = max(prof.stages.items(), key=lambda kv: kv[1])[0] if prof.stages else None
+        entry = {"mint": prof.mint, "started_at": summary["started_at"], "wall_ms": prof.wall_ms,
+                 "slowest_stage": slowest, "network_ms": summary["network_ms"], "file": base.with_suffix(".json").name}
+        with self._lock:
+            with open(self.dir / "index.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._prune()
+        log.warning("Slow analysis profiled (%.0f ms, slowest stage %s)", prof.wall_ms, slowest,
+                    extra={"mint": prof.mint, "profile": str(base.with_suffix(".json"))})
+
+    def _prune(self) -> None:
+        # Caller holds the lock; drops the oldest profiles beyond `keep`
+        kept = sorted(self.dir.glob("*.json"))
+        for old in kept[:max(0, len(kept) - self.keep)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".prof").unlink(missing_ok=True)
+
+
+_profilers: Dict[str, Profiler] = {}
+_profilers_lock = threading.Lock()
+
+
+def get_profiler(config: Dict[str, Any]) -> Optional[Profiler]:
+    """Process-wide profiler when ``profiling.enabled`` (or ``--profile``) is on, else None."""
+    pcfg = config.get("profiling", {})
+    if not pcfg.get("enabled", False):
+        return None
+    key = json.dumps(pcfg, sort_keys=True, default=str)
+    with _profilers_lock:
+        profiler = _profilers.get(key)
+        if profiler is None:
+            profiler = _profilers[key] = Profiler(config)
+        return profiler
+
+
+def enable_profiling(config: Dict[str, Any], threshold_ms: Optional[float] = None) -> Dict[str, Any]:
+    """``--profile [THRESHOLD_MS]``: switch profiling on in ``config`` (in place); a negative threshold keeps the configured one."""
+    pcfg = {**(config.get("profiling") or {}), "enabled": True}
+    if threshold_ms is not None and threshold_ms >= 0:
+        pcfg["threshold_ms"] = threshold_ms
+    config["profiling"] = pcfg
+    return config
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import zlib
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from solana_due_diligence.providers import http
+from solana_due_diligence.storage import open_sqlite
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS interactions ("
+    "  id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    "  key TEXT NOT NULL,"
+    "  seq INTEGER NOT NULL,"
+    "  method TEXT NOT NULL,"
+    "  endpoint TEXT NOT NULL,"
+    "  status INTEGER NOT NULL,"
+    "  content_type TEXT,"
+    "  body BLOB NOT NULL,"
+    "  elapsed REAL NOT NULL,"
+    "  recorded_at REAL NOT NULL"
+    ")",
+    "CREATE UNIQUE INDEX IF NOT EXISTS interactions_key ON interactions (key, seq)",
+)
+
+
+class CassetteMiss(Exception):
+    """A replayed run made a request that was never recorded.
+
+    Deliberately not a ``requests.RequestException``: provider retries must
+    not turn a miss into a slow series of back-offs.
+    """
+
+
+def request_key(method: str, url: str, params: Any = None, json_body: Any = None, data: Any = None) -> str:
+    """Stable key for a provider request; credentials in the URL never leave the hash."""
+    full_url = requests.Request(method.upper(), url, params=params).prepare().url
+    if isinstance(json_body, dict) and "jsonrpc" in json_body:
+        # JSON-RPC ids differ per call, and any pooled RPC endpoint may serve it
+        json_body = {k: v for k, v in json_body.items() if k != "id"}
+        full_url = "jsonrpc"
+    elif isinstance(json_body, list) and json_body and all(isinstance(c, dict) and "jsonrpc" in c for c in json_body):
+        json_body = [{k: v for k, v in c.items() if k != "id"} for c in json_body]
+        full_url = "jsonrpc"
+    raw = http.flight_key(method.upper(), full_url, json_body, data)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CassetteStore:
+    """SQLite record of provider responses for one run, replayable without network.
+
+    Record mode stores status, body (zlib), content type and elapsed time per
+    request. Identical requests are stored in order and replayed in the same
+    order; once a key's recordings are used up its last response is repeated,
+    which keeps retries and re-checks deterministic. Only the host and path
+    are kept in clear text, so API keys in query strings are not written out.
+    """
+
+    def __init__(self, path: str, mode: str, replay_latency: bool = False) -> None:
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"cassette mode must be {RECORD!r} or {REPLAY!r}, got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        self._cursors: Dict[str, int] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def request(self, send, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Serve ``method url`` from the cassette, or perform it through ``send`` and record it."""
+        key = request_key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"))
+        if self.mode == REPLAY:
+            return self._replay(key, method, url)
+        t0 = time.perf_counter()
+        resp = send()
+        self._record(key, method, url, resp, time.perf_counter() - t0)
+        return resp
+
+    def _record(self, key: str, method: str, url: str, resp: requests.Response, elapsed: float) -> None:
+        parts = urlsplit(url)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq = self._conn.execute("SELECT COUNT(*) AS n FROM interactions WHERE key = ?", (key,)).fetchone()["n"]
+                self._conn.execute(
+                    "INSERT INTO interactions (key, seq, method, endpoint, status, content_type, body, elapsed, recorded_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, seq, method.upper(), f"{parts.scheme}://{parts.netloc.rpartition('@')[2]}{parts.path}",
+                     resp.status_code, resp.headers.get("content-type"), zlib.compress(resp.content),
+                     round(elapsed, 4), time.time()),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stats["recorded"] += 1
+
+    def _replay(self, key: str, method: str, url: str) -> requests.Response:
+        with self._lock:
+            seq = self._cursors.get(key, 0)
+            row = self._conn.execute(
+                "SELECT status, content_type, body, elapsed FROM interactions WHERE key = ? AND seq <= ?"
+                " ORDER BY seq DESC LIMIT 1",
+                (key, seq),
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"no recording for {method.upper()} {urlsplit(url).path}")
+            self._cursors[key] = seq + 1
+            self.stats["replayed"] += 1
+        if self.replay_latency:
+            time.sleep(row["elapsed"])
+        resp = requests.Response()
+        resp.status_code = row["status"]
+        resp._content = zlib.decompress(row["body"])
+        resp._content_consumed = True
+        resp.headers = CaseInsensitiveDict({"content-type": row["content_type"]} if row["content_type"] else {})
+        resp.encoding = "utf-8"
+        resp.url = url
+        resp.elapsed = timedelta(seconds=row["elapsed"])
+        return resp
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) AS n FROM interactions").fetchone()["n"])
+
+
+def install_cassette(config: Dict[str, Any], record: Optional[str] = None, replay: Optional[str] = None,
+                     replay_latency: Optional[bool] = None) -> Optional[CassetteStore]:
+    """Route provider requests through a cassette from CLI flags or the ``cassette`` config section."""
+    ccfg = config.get("cassette") or {}
+    mode, path = ccfg.get("mode"), ccfg.get("path")
+    if record:
+        mode, path = RECORD, record
+    elif replay:
+        mode, path = REPLAY, replay
+    if mode not in (RECORD, REPLAY) or not path:
+        return None
+    latency = bool(ccfg.get("replay_latency", False)) if replay_latency is None else replay_latency
+    store = CassetteStore(path, mode, replay_latency=latency)
+    http.set_cassette(store)
+    return store
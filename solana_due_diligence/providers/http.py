@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import copy
+import functools
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from solana_due_diligence import profiling
+
+
+_local = threading.local()
+_rate_limiter: Optional[Any] = None
+_cassette: Optional[Any] = None
+# Bumped by close_sessions; each thread replaces its session when it sees a newer generation
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def set_rate_limiter(limiter: Optional[Any]) -> None:
+    """Install a process-wide limiter exposing ``acquire(host)``; called before every provider request."""
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def set_cassette(cassette: Optional[Any]) -> None:
+    """Install a process-wide record/replay store exposing ``request(send, method, url, **kwargs)``."""
+    global _cassette
+    _cassette = cassette
+
+
+class _Session(requests.Session):
+    def request(self, method, url, *args, **kwargs):  # type: ignore[override]
+        if _cassette is not None:
+            return _cassette.request(lambda: self._send(method, url, *args, **kwargs), method, url, **kwargs)
+        return self._send(method, url, *args, **kwargs)
+
+    def _send(self, method, url, *args, **kwargs):
+        host = urlsplit(url).hostname or ""
+        if _rate_limiter is not None:
+            with profiling.call(f"wait {host}"):
+                _rate_limiter.acquire(host)
+        with profiling.call(_call_key(method, host, kwargs.get("json"))):
+            return super().request(method, url, *args, **kwargs)
+
+
+def _call_key(method: str, host: str, body: Any) -> str:
+    # JSON-RPC calls share one URL; the method tells them apart (a batch goes by its first call)
+    if isinstance(body, list) and body and isinstance(body[0], dict):
+        return f"{method.upper()} {host} {body[0].get('method')} (batch)"
+    if isinstance(body, dict) and body.get("method"):
+        return f"{method.upper()} {host} {body['method']}"
+    return f"{method.upper()} {host}"
+
+
+def session() -> requests.Session:
+    """Per-thread pooled session so repeated provider calls reuse warm connections."""
+    s = getattr(_local, "session", None)
+    if s is not None and _local.generation != _generation:
+        # Closed here, by its own thread, so no request of another thread is cut off
+        s.close()
+        s = None
+    if s is None:
+        s = _Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        _local.session = s
+        _local.generation = _generation
+    return s
+
+
+def close_sessions() -> None:
+    """Mark every thread's session stale; each drops its pooled connections on its next request."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+flight_stats = {"calls": 0, "shared": 0}
+
+
+def _normalize(value: Any) -> Any:
+    # Params built as {"limit": 50} and {"limit": "50"} hit the same upstream URL
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def flight_key(*parts: Any) -> str:
+    return json.dumps(_normalize(list(parts)), sort_keys=True, separators=(",", ":"))
+
+
+def coalesce(key: str, fn: Callable[[], Any]) -> Any:
+    """Run ``fn`` once for all threads asking for ``key`` at the same time; each gets the result (or error).
+
+    Only in-flight calls are shared; nothing is cached after the call returns.
+    Waiters copy a snapshot taken before the leader gets its result back, so
+    any caller may mutate what it receives.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+            flight_stats["calls"] += 1
+        else:
+            flight.waiters += 1
+            flight_stats["shared"] += 1
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result)
+    result = None
+    try:
+        result = fn()
+        return result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+            waiters = flight.waiters
+        if waiters and flight.error is None:
+            flight.result = copy.deepcopy(result)
+        flight.done.set()
+
+
+def single_flight(key: Callable[..., Tuple[Any, ...]]):
+    """Decorator coalescing concurrent calls whose ``key(*args, **kwargs)`` (endpoint + params) match.
+
+    Apply it above ``@retry`` so one caller does the retries and the rest wait on its outcome.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return coalesce(flight_key(fn.__qualname__, *key(*args, **kwargs)), lambda: fn(*args, **kwargs))
+        return wrapper
+    return decorate
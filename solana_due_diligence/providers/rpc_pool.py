@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import requests
+
+from solana_due_diligence.providers import http
+
+
+# Reads worth a duplicate request when the first one is slow
+DEFAULT_HEDGE_METHODS = ("getTokenSupply", "getTokenLargestAccounts", "getAccountInfo", "getMultipleAccounts")
+# JSON-RPC errors that say the node, not the request, is at fault
+NODE_ERROR_CODES = {-32005, -32004, -32014}
+
+Transport = Callable[[str, Dict[str, Any], float], Dict[str, Any]]
+
+
+class RPCEndpointError(requests.RequestException):
+    pass
+
+
+class Endpoint:
+    __slots__ = ("url", "weight", "rate", "burst", "tokens", "refilled_at", "latency", "errors",
+                 "samples", "cooldown_until", "calls", "failures")
+
+    def __init__(self, url: str, weight: float = 1.0, rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        self.url = url
+        self.weight = max(float(weight), 0.01)
+        self.rate = float(rate) if rate else None
+        self.burst = float(burst or rate or 1.0)
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+        self.latency: Optional[float] = None
+        self.errors = 0.0
+        self.samples: Deque[float] = deque(maxlen=200)
+        self.cooldown_until = 0.0
+        self.calls = 0
+        self.failures = 0
+
+    def refill(self, now: float) -> None:
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def quota_wait(self) -> float:
+        return 0.0 if not self.rate or self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+    def score(self) -> float:
+        # Lower is better: expected latency, inflated by recent errors, divided by weight.
+        # Unmeasured endpoints score best so each one gets probed, unless they only ever failed.
+        latency = self.latency if self.latency is not None else (1.0 if self.failures else 0.0)
+        return latency * (1.0 + 20.0 * self.errors) / self.weight
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self.samples) < 20:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _post(url: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    r = http.session().post(url, json=payload, timeout=timeout)
+    if r.status_code == 429:
+        raise RPCEndpointError(f"HTTP 429 from {url}", response=r)
+    if r.status_code != 200:
+        raise RPCEndpointError(f"HTTP {r.status_code}: {r.text[:200]}", response=r)
+    return r.json()
+
+
+class RPCPool:
+    """Routes Solana JSON-RPC calls over several endpoints by latency, errors, weight and quota.
+
+    Each endpoint keeps an EWMA of latency and error rate plus recent latency
+    samples. A call goes to the healthy endpoint with the best score that has
+    quota left, and fails over to the next one on transport or node errors.
+    Hedged methods get a duplicate request on the runner-up endpoint when the
+    first has not answered within its p95 latency; the first answer wins.
+    """
+
+    def __init__(self, endpoints: List[Dict[str, Any]], timeout: float = 20.0, hedge: bool = True,
+                 hedge_quantile: float = 0.95, hedge_min_delay: float = 0.05, hedge_default_delay: float = 0.25,
+                 hedge_methods: Optional[List[str]] = None, alpha: float = 0.2,
+                 transport: Optional[Transport] = None) -> None:
+        if not endpoints:
+            raise ValueError("RPC pool needs at least one endpoint")
+        self.endpoints = [Endpoint(e["url"], e.get("weight", 1.0), e.get("rate"), e.get("burst")) for e in endpoints]
+        self.timeout = timeout
+        self.hedge = hedge and len(self.endpoints) > 1
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_methods = set(hedge_methods if hedge_methods is not None else DEFAULT_HEDGE_METHODS)
+        self.alpha = alpha
+        self.transport: Transport = transport or _post
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ids = 0
+
+    def _pick(self, exclude: Set[str], block: bool) -> Optional[Endpoint]:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                candidates = [e for e in self.endpoints if e.url not in exclude]
+                if not candidates:
+                    return None
+                for e in candidates:
+                    e.refill(now)
+                healthy = [e for e in candidates if e.cooldown_until <= now] or candidates
+                ready = [e for e in healthy if e.quota_wait() == 0.0]
+                if ready:
+                    best = min(ready, key=Endpoint.score)
+                    if best.rate:
+                        best.tokens -= 1.0
+                    return best
+                if not block:
+                    return None
+                delay = min(e.quota_wait() for e in healthy)
+            time.sleep(delay)
+
+    def _observe(self, ep: Endpoint, elapsed: float, ok: bool, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            ep.calls += 1
+            ep.errors = (1 - self.alpha) * ep.errors + self.alpha * (0.0 if ok else 1.0)
+            if ok:
+                ep.latency = elapsed if ep.latency is None else (1 - self.alpha) * ep.latency + self.alpha * elapsed
+                ep.samples.append(elapsed)
+            else:
+                ep.failures += 1
+                # Back off an endpoint that keeps failing or asked us to
+                if retry_after is not None or ep.errors > 0.5:
+                    ep.cooldown_until = time.monotonic() + (retry_after if retry_after is not None else 5.0)
+
+    def _send(self, ep: Endpoint, payload: Dict[str, Any]) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        try:
+            data = self.transport(ep.url, payload, self.timeout)
+            error = data.get("error") if isinstance(data, dict) else None
+            if isinstance(error, dict) and error.get("code") in NODE_ERROR_CODES:
+                raise RPCEndpointError(f"{ep.url}: {error.get('message')}")
+        except (requests.RequestException, ValueError) as e:
+            retry_after = None
+            response = getattr(e, "response", None)
+            if response is not None and response.status_code == 429:
+                try:
+                    retry_after = float(response.headers.get("retry-after") or 1.0)
+                except ValueError:
+                    retry_after = 1.0
+            self._observe(ep, time.perf_counter() - t0, ok=False, retry_after=retry_after)
+            raise e if isinstance(e, requests.RequestException) else RPCEndpointError(str(e))
+        self._observe(ep, time.perf_counter() - t0, ok=True)
+        return data
+
+    def _hedge_delay(self, ep: Endpoint) -> float:
+        with self._lock:
+            q = ep.quantile(self.hedge_quantile)
+            # Too few samples for a quantile yet
+            fallback = ep.latency * 2 if ep.latency is not None else self.hedge_default_delay
+        return max(self.hedge_min_delay, q if q is not None else fallback)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="rpc-hedge")
+            return self._executor
+
+    def call(self, method: str, params: List[Any], hedge: Optional[bool] = None) -> Dict[str, Any]:
+        """Send one JSON-RPC call and return the decoded response (which may carry a JSON-RPC ``error``)."""
+        with self._lock:
+            self._ids += 1
+            payload = {"jsonrpc": "2.0", "id": self._ids, "method": method, "params": params}
+            self.stats["calls"] += 1
+        hedge = self.hedge and (method in self.hedge_methods if hedge is None else hedge)
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+        while True:
+            ep = self._pick(tried, block=True)
+            if ep is None:
+                raise last_error or RPCEndpointError("no RPC endpoint available")
+            tried.add(ep.url)
+            try:
+                if hedge:
+                    return self._hedged(ep, payload, tried)
+                return self._send(ep, payload)
+            except requests.RequestException as e:
+                last_error = e
+                with self._lock:
+                    self.stats["failovers"] += 1
+
+    def call_batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Dict[str, Any]]:
+        """Send several calls as one JSON-RPC batch; responses come back in call order."""
+        # Ids only need to be unique within the batch; positional ids also keep cassette replays aligned
+        payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+        with self._lock:
+            self.stats["calls"] += 1
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+        while True:
+            ep = self._pick(tried, block=True)
+            if ep is None:
+                raise last_error or RPCEndpointError("no RPC endpoint available")
+            tried.add(ep.url)
+            try:
+                data = self._send(ep, payload)  # type: ignore[arg-type]
+            except requests.RequestException as e:
+                last_error = e
+                with self._lock:
+                    self.stats["failovers"] += 1
+                continue
+            by_id = {d.get("id"): d for d in data if isinstance(d, dict)} if isinstance(data, list) else {}
+            return [by_id.get(p["id"], {}) for p in payload]
+
+    def _hedged(self, primary: Endpoint, payload: Dict[str, Any], tried: Set[str]) -> Dict[str, Any]:
+        executor = self._pool()
+        futures: Dict[Future, Endpoint] = {executor.submit(self._send, primary, payload): primary}
+        done, _ = wait(futures, timeout=self._hedge_delay(primary))
+        if not done:
+            backup = self._pick(tried, block=False)
+            if backup is not None:
+                tried.add(backup.url)
+                futures[executor.submit(self._send, backup, payload)] = backup
+                with self._lock:
+                    self.stats["hedged"] += 1
+        pending = set(futures)
+        error: Optional[Exception] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                try:
+                    result = fut.result()
+                except requests.RequestException as e:
+                    error = e
+                    continue
+                if futures[fut] is not primary:
+                    with self._lock:
+                        self.stats["hedge_wins"] += 1
+                # The slower duplicate finishes in the background and still feeds the EWMA
+                return result
+        raise error  # type: ignore[misc]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "latency_ms": round(e.latency * 1000, 1) if e.latency is not None else None,
+                    "p95_ms": round(q * 1000, 1) if (q := e.quantile(0.95)) is not None else None,
+                    "error_rate": round(e.errors, 3),
+                    "calls": e.calls,
+                    "failures": e.failures,
+                    "cooling_down": e.cooldown_until > time.monotonic(),
+                }
+                for e in self.endpoints
+            ]
+
+
+_pools: Dict[tuple, RPCPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_rpc_pool(config: Dict[str, Any]) -> Optional[RPCPool]:
+    """Process-wide pool for ``solana.endpoints``, or None when only ``solana.rpc_url`` is configured."""
+    scfg = config.get("solana", {})
+    endpoints = [e if isinstance(e, dict) else {"url": e} for e in scfg.get("endpoints") or [] if e]
+    endpoints = [e for e in endpoints if e.get("url")]
+    if not endpoints:
+        return None
+    key = tuple((e["url"], e.get("weight"), e.get("rate"), e.get("burst")) for e in endpoints)
+    hcfg = scfg.get("hedge") or {}
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = RPCPool(
+                endpoints,
+                timeout=float(scfg.get("timeout_seconds", 20)),
+                hedge=bool(hcfg.get("enabled", True)),
+                hedge_quantile=float(hcfg.get("quantile", 0.95)),
+                hedge_min_delay=float(hcfg.get("min_delay_ms", 50)) / 1000,
+                hedge_methods=hcfg.get("methods"),
+            )
+        return pool
@@ -1,33 +1,67 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from solana_due_diligence.providers import http
+from solana_due_diligence.providers.rpc_pool import RPCPool
+
 
 class SolanaRPCError(Exception):
     pass
 
 
+def _result(data: Dict[str, Any]) -> Any:
+    if "error" in data:
+        raise SolanaRPCError(str(data["error"]))
+    return data.get("result")
+
+
 class SolanaRPC:
-    def __init__(self, rpc_url: str, commitment: str = "confirmed", timeout_seconds: int = 20) -> None:
+    def __init__(self, rpc_url: str, commitment: str = "confirmed", timeout_seconds: int = 20,
+                 pool: Optional[RPCPool] = None) -> None:
         self.rpc_url = rpc_url
         self.commitment = commitment
         self.timeout = timeout_seconds
+        self.pool = pool
+
+    # The JSON-RPC id differs per call, so the key is the method and params only
+    @http.single_flight(lambda self, method, params: (self.rpc_url, method, params))
+    def _call(self, method: str, params: list[Any]) -> Any:
+        if self.pool is not None:
+            # The pool already fails over across endpoints; retrying on top would multiply requests
+            return _result(self.pool.call(method, params))
+        return self._call_direct(method, params)
 
     @retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3), reraise=True,
            retry=retry_if_exception_type((requests.RequestException, SolanaRPCError)))
-    def _call(self, method: str, params: list[Any]) -> Any:
+    def _call_direct(self, method: str, params: list[Any]) -> Any:
         payload = {"jsonrpc": "2.0", "id": int(time.time()*1000) % 1000000, "method": method, "params": params}
-        r = requests.post(self.rpc_url, json=payload, timeout=self.timeout)
+        r = http.session().post(self.rpc_url, json=payload, timeout=self.timeout)
+        if r.status_code != 200:
+            raise SolanaRPCError(f"HTTP {r.status_code}: {r.text[:200]}")
+        return _result(r.json())
+
+    def batch(self, calls: List[Tuple[str, list[Any]]]) -> List[Any]:
+        """One JSON-RPC batch request; each call's result, or None where that call errored."""
+        if not calls:
+            return []
+        responses = self.pool.call_batch(calls) if self.pool is not None else self._batch_direct(calls)
+        return [None if "error" in resp else resp.get("result") for resp in responses]
+
+    @retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3), reraise=True,
+           retry=retry_if_exception_type(requests.RequestException))
+    def _batch_direct(self, calls: List[Tuple[str, list[Any]]]) -> List[Dict[str, Any]]:
+        payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+        r = http.session().post(self.rpc_url, json=payload, timeout=self.timeout)
         if r.status_code != 200:
             raise SolanaRPCError(f"HTTP {r.status_code}: {r.text[:200]}")
         data = r.json()
-        if "error" in data:
-            raise SolanaRPCError(str(data["error"]))
-        return data.get("result")
+        by_id = {d.get("id"): d for d in data if isinstance(d, dict)} if isinstance(data, list) else {}
+        return [by_id.get(i, {}) for i in range(len(calls))]
 
     def get_token_supply(self, mint: str) -> Optional[Dict[str, Any]]:
         params = [mint, {"commitment": self.commitment}]
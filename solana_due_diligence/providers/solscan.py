@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from solana_due_diligence.providers import http
+
 
 class SolscanClient:
     def __init__(self, base_url: str, api_key: Optional[str]) -> None:
@@ -17,11 +19,12 @@ class SolscanClient:
             headers["token"] = self.api_key
         return headers
 
+    @http.single_flight(lambda self, path, params=None: (self.base_url, path, params))
     @retry(wait=wait_exponential(multiplier=0.5, min=1, max=8), stop=stop_after_attempt(3), reraise=True,
            retry=retry_if_exception_type(requests.RequestException))
     def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         url = f"{self.base_url}{path}"
-        r = requests.get(url, headers=self._headers(), params=params or {}, timeout=20)
+        r = http.session().get(url, headers=self._headers(), params=params or {}, timeout=20)
         if r.status_code != 200:
             return None
         try:
@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+
+class _Record:
+    """Slotted dataclass base with dict conversion in the report's JSON shape.
+
+    ``_keys`` renames fields to their report keys, ``_nested`` and ``_lists``
+    name the model types of nested sections. Keys a model does not declare are
+    dropped on the way in, which is what trims raw provider payloads.
+    """
+
+    __slots__ = ()
+    _keys: ClassVar[Dict[str, str]] = {}
+    _nested: ClassVar[Dict[str, Any]] = {}
+    _lists: ClassVar[Dict[str, Any]] = {}
+    _specs: ClassVar[Dict[type, Tuple[Tuple[str, str, Any, Any], ...]]] = {}
+
+    @classmethod
+    def _spec(cls) -> Tuple[Tuple[str, str, Any, Any], ...]:
+        spec = _Record._specs.get(cls)
+        if spec is None:
+            spec = tuple(
+                (f.name, cls._keys.get(f.name, f.name), cls._nested.get(f.name), cls._lists.get(f.name))
+                for f in fields(cls)  # type: ignore[arg-type]
+                if f.name != "skipped"
+            )
+            _Record._specs[cls] = spec
+        return spec
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]):
+        if not isinstance(data, dict):
+            data = {}
+        if data.get("skipped"):
+            return cls(skipped=data["skipped"])  # type: ignore[call-arg]
+        kwargs: Dict[str, Any] = {}
+        for name, key, nested, listed in cls._spec():
+            value = data.get(key)
+            if value is None:
+                if listed is not None:
+                    value = []
+                elif nested is not None and name not in cls._optional():
+                    value = nested.from_dict({})
+            elif nested is not None:
+                value = nested.from_dict(value)
+            elif listed is not None:
+                value = [listed.from_dict(v) if listed is not str else v for v in value]
+            kwargs[name] = value
+        return cls(**kwargs)
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        skipped = getattr(self, "skipped", None)
+        if skipped:
+            return {"skipped": skipped}
+        out: Dict[str, Any] = {}
+        for name, key, nested, listed in self._spec():
+            value = getattr(self, name)
+            if nested is not None and value is not None:
+                value = value.to_dict()
+            elif listed is not None and listed is not str:
+                value = [v.to_dict() for v in value]
+            elif isinstance(value, list):
+                value = list(value)
+            out[key] = value
+        return out
+
+
+@dataclass(slots=True)
+class Verdict(_Record):
+    passed: bool = False
+    reasons: List[str] = field(default_factory=list)
+    _lists = {"reasons": str}
+
+
+@dataclass(slots=True)
+class Supply(_Record):
+    amount: Any = None
+    decimals: Optional[int] = None
+    ui_amount: Any = None
+
+
+@dataclass(slots=True)
+class LargestAccount(_Record):
+    address: Optional[str] = None
+    amount: Any = None
+    ui_amount: Any = None
+    _keys = {"ui_amount": "uiAmount"}
+
+
+@dataclass(slots=True)
+class SolscanHolder(_Record):
+    owner: Optional[str] = None
+    amount: Any = None
+    decimals: Optional[int] = None
+    owner_program: Optional[str] = None
+    _keys = {"owner_program": "ownerProgram"}
+
+
+@dataclass(slots=True)
+class TokenMeta(_Record):
+    """The handful of Solscan meta fields the analyzers read, with key variants normalized."""
+
+    symbol: Optional[str] = None
+    name: Optional[str] = None
+    decimals: Optional[int] = None
+    creator: Optional[str] = None
+    mint_authority: Optional[str] = None
+    freeze_authority: Optional[str] = None
+    update_authority: Optional[str] = None
+    _keys = {
+        "mint_authority": "mintAuthority",
+        "freeze_authority": "freezeAuthority",
+        "update_authority": "updateAuthority",
+    }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TokenMeta":
+        m = data if isinstance(data, dict) else {}
+        creator = None
+        for key in ("creator", "creater", "creatorAddress"):
+            v = m.get(key)
+            if isinstance(v, str) and len(v) > 20:
+                creator = v
+                break
+        return cls(
+            symbol=m.get("symbol") or m.get("tokenSymbol"),
+            name=m.get("name") or m.get("tokenName"),
+            decimals=m.get("decimals"),
+            creator=creator,
+            mint_authority=m.get("mintAuthority") or m.get("mint_authority"),
+            freeze_authority=m.get("freezeAuthority") or m.get("freeze_authority"),
+            update_authority=m.get("updateAuthority"),
+        )
+
+
+@dataclass(slots=True)
+class SolscanInfo(_Record):
+    meta: TokenMeta = field(default_factory=TokenMeta)
+    holder_count: Optional[int] = None
+    holders_sample: List[SolscanHolder] = field(default_factory=list)
+    _nested = {"meta": TokenMeta}
+    _lists = {"holders_sample": SolscanHolder}
+
+
+@dataclass(slots=True)
+class Tokenomics(_Record):
+    mint: Optional[str] = None
+    supply: Supply = field(default_factory=Supply)
+    top_holders_sample: List[LargestAccount] = field(default_factory=list)
+    solscan: Optional[SolscanInfo] = None
+    skipped: Optional[str] = None
+    _nested = {"supply": Supply, "solscan": SolscanInfo}
+    _lists = {"top_holders_sample": LargestAccount}
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ("solscan",)
+
+
+@dataclass(slots=True)
+class PairSummary(_Record):
+    """Trimmed Dexscreener pair; ``to_dict`` keeps Dexscreener's nesting for the fields it retains."""
+
+    dex_id: Optional[str] = None
+    pair_address: Optional[str] = None
+    url: Optional[str] = None
+    base_symbol: Optional[str] = None
+    quote_symbol: Optional[str] = None
+    price_usd: Any = None
+    price_native: Any = None
+    liquidity_usd: Optional[float] = None
+    volume_h24: Optional[float] = None
+    price_change_h24: Optional[float] = None
+    buys_h24: Optional[int] = None
+    sells_h24: Optional[int] = None
+    fdv: Optional[float] = None
+    market_cap: Optional[float] = None
+    pair_created_at: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "PairSummary":
+        p = data if isinstance(data, dict) else {}
+        h24 = (p.get("txns") or {}).get("h24") or {}
+        return cls(
+            dex_id=p.get("dexId"),
+            pair_address=p.get("pairAddress"),
+            url=p.get("url"),
+            base_symbol=(p.get("baseToken") or {}).get("symbol"),
+            quote_symbol=(p.get("quoteToken") or {}).get("symbol"),
+            price_usd=p.get("priceUsd"),
+            price_native=p.get("priceNative"),
+            liquidity_usd=(p.get("liquidity") or {}).get("usd"),
+            volume_h24=(p.get("volume") or {}).get("h24"),
+            price_change_h24=(p.get("priceChange") or {}).get("h24"),
+            buys_h24=h24.get("buys"),
+            sells_h24=h24.get("sells"),
+            fdv=p.get("fdv"),
+            market_cap=p.get("marketCap"),
+            pair_created_at=p.get("pairCreatedAt"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dexId": self.dex_id,
+            "pairAddress": self.pair_address,
+            "url": self.url,
+            "baseToken": {"symbol": self.base_symbol},
+            "quoteToken": {"symbol": self.quote_symbol},
+            "priceUsd": self.price_usd,
+            "priceNative": self.price_native,
+            "liquidity": {"usd": self.liquidity_usd},
+            "volume": {"h24": self.volume_h24},
+            "priceChange": {"h24": self.price_change_h24},
+            "txns": {"h24": {"buys": self.buys_h24, "sells": self.sells_h24}},
+            "fdv": self.fdv,
+            "marketCap": self.market_cap,
+            "pairCreatedAt": self.pair_created_at,
+        }
+
+
+@dataclass(slots=True)
+class OnchainLiquidity(_Record):
+    """Reserves read from the bonding curve or pool vaults; reserves in SOL and whole tokens."""
+
+    source: Optional[str] = None
+    bonding_curve: Optional[str] = None
+    curve_complete: Optional[bool] = None
+    curve_progress: Optional[float] = None
+    sol_usd: Optional[float] = None
+    sol_reserve: Optional[float] = None
+    token_reserve: Optional[float] = None
+    price_sol: Optional[float] = None
+    liquidity_sol: Optional[float] = None
+    liquidity_usd: Optional[float] = None
+    # {"buy": {"<SOL size>": pct}, "sell": {...}}
+    price_impact: Optional[Dict[str, Dict[str, Optional[float]]]] = None
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Market(_Record):
+    pairs_found: int = 0
+    best_pair: Optional[PairSummary] = None
+    onchain: Optional[OnchainLiquidity] = None
+    skipped: Optional[str] = None
+    _nested = {"best_pair": PairSummary, "onchain": OnchainLiquidity}
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ("best_pair", "onchain")
+
+
+@dataclass(slots=True)
+class Authorities(_Record):
+    mint_authority: Optional[str] = None
+    freeze_authority: Optional[str] = None
+    mint_revoked: bool = False
+    freeze_revoked: bool = False
+
+
+@dataclass(slots=True)
+class LiquidityPool(_Record):
+    dex: Optional[str] = None
+    liquidity_usd: Optional[float] = None
+    pair_created_at: Optional[int] = None
+    # Where liquidity_usd came from: dexscreener, pumpfun_curve, pumpswap or raydium
+    source: Optional[str] = None
+    liquidity_sol: Optional[float] = None
+    curve_progress: Optional[float] = None
+    price_impact: Optional[Dict[str, Dict[str, Optional[float]]]] = None
+
+
+@dataclass(slots=True)
+class Security(_Record):
+    authorities: Authorities = field(default_factory=Authorities)
+    lp: LiquidityPool = field(default_factory=LiquidityPool)
+    notes: List[str] = field(default_factory=list)
+    skipped: Optional[str] = None
+    _nested = {"authorities": Authorities, "lp": LiquidityPool}
+    _lists = {"notes": str}
+
+
+@dataclass(slots=True)
+class Engagement(_Record):
+    likes: int = 0
+    retweets: int = 0
+    quotes: int = 0
+    replies: int = 0
+
+
+@dataclass(slots=True)
+class XStats(_Record):
+    query: Optional[str] = None
+    posts: int = 0
+    engagement: Engagement = field(default_factory=Engagement)
+    _nested = {"engagement": Engagement}
+
+
+@dataclass(slots=True)
+class Community(_Record):
+    x: Optional[XStats] = None
+    skipped: Optional[str] = None
+    _nested = {"x": XStats}
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ("x",)
+
+
+@dataclass(slots=True)
+class CreatorStats(_Record):
+    creator: Optional[str] = None
+    first_seen: Optional[float] = None
+    last_seen: Optional[float] = None
+    launch_count: int = 0
+    rug_count: int = 0
+    history_fetched: bool = False
+
+
+@dataclass(slots=True)
+class CreatorToken(_Record):
+    mint: Optional[str] = None
+    amount: Any = None
+    outcome: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Developer(_Record):
+    creator: Optional[str] = None
+    creator_stats: Optional[CreatorStats] = None
+    history_source: Optional[str] = None
+    history_sample: List[CreatorToken] = field(default_factory=list)
+    risk_flags: List[str] = field(default_factory=list)
+    skipped: Optional[str] = None
+    _nested = {"creator_stats": CreatorStats}
+    _lists = {"history_sample": CreatorToken, "risk_flags": str}
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ("creator_stats",)
+
+
+@dataclass(slots=True)
+class Repo(_Record):
+    full_name: Optional[str] = None
+    html_url: Optional[str] = None
+    stargazers: Optional[int] = None
+    language: Optional[str] = None
+    updated_at: Optional[str] = None
+    score: int = 0
+
+
+@dataclass(slots=True)
+class GitHub(_Record):
+    repos: List[Repo] = field(default_factory=list)
+    skipped: Optional[str] = None
+    _lists = {"repos": Repo}
+
+
+@dataclass(slots=True)
+class Concentration(_Record):
+    top10: Optional[float] = None
+    top20: Optional[float] = None
+
+
+@dataclass(slots=True)
+class MoralisStats(_Record):
+    holders_fetched: int = 0
+    concentration: Concentration = field(default_factory=Concentration)
+    _nested = {"concentration": Concentration}
+
+
+@dataclass(slots=True)
+class HolderCluster(_Record):
+    funder: Optional[str] = None
+    size: int = 0
+    share: float = 0.0
+    creator_linked: bool = False
+    wallets: List[str] = field(default_factory=list)
+    _lists = {"wallets": str}
+
+
+@dataclass(slots=True)
+class HolderClusters(_Record):
+    holders_analyzed: int = 0
+    funders_resolved: int = 0
+    complete: bool = False
+    elapsed_seconds: Optional[float] = None
+    cluster_count: int = 0
+    raw_top10: Optional[float] = None
+    adjusted_top10: Optional[float] = None
+    largest_cluster_share: Optional[float] = None
+    creator_cluster_share: Optional[float] = None
+    clusters: List[HolderCluster] = field(default_factory=list)
+    _lists = {"clusters": HolderCluster}
+
+
+@dataclass(slots=True)
+class Metrics(_Record):
+    moralis: Optional[MoralisStats] = None
+    clusters: Optional[HolderClusters] = None
+    skipped: Optional[str] = None
+    _nested = {"moralis": MoralisStats, "clusters": HolderClusters}
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ("moralis", "clusters")
+
+
+@dataclass(slots=True)
+class Summary(_Record):
+    headline: Optional[str] = None
+    notes: List[str] = field(default_factory=list)
+    _lists = {"notes": str}
+
+
+@dataclass(slots=True)
+class TokenReport(_Record):
+    token: Optional[str] = None
+    gates: Verdict = field(default_factory=Verdict)
+    tokenomics: Tokenomics = field(default_factory=Tokenomics)
+    market: Market = field(default_factory=Market)
+    security: Security = field(default_factory=Security)
+    community: Community = field(default_factory=Community)
+    developer: Developer = field(default_factory=Developer)
+    github: GitHub = field(default_factory=GitHub)
+    metrics: Metrics = field(default_factory=Metrics)
+    summary: Summary = field(default_factory=Summary)
+    signal: Optional[Verdict] = None
+    # Names of the signals.profiles the report matched
+    profiles: List[str] = field(default_factory=list)
+    # Analysis tier that produced the report (minimal, standard, deep)
+    tier: Optional[str] = None
+    _lists = {"profiles": str}
+    _nested = {
+        "gates": Verdict,
+        "tokenomics": Tokenomics,
+        "market": Market,
+        "security": Security,
+        "community": Community,
+        "developer": Developer,
+        "github": GitHub,
+        "metrics": Metrics,
+        "summary": Summary,
+        "signal": Verdict,
+    }
+
+    @classmethod
+    def _optional(cls) -> Tuple[str, ...]:
+        return ("signal",)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TokenReport":
+        data = data if isinstance(data, dict) else {}
+        report = super(TokenReport, cls).from_dict(data)
+        report.token = (data.get("input") or {}).get("token")
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = super(TokenReport, self).to_dict()
+        out.pop("token", None)
+        return {"input": {"token": self.token}, **out}
+
+
+def encode_report(report: TokenReport, indent: Optional[int] = None) -> bytes:
+    """Compact JSON by default; ``decode_report(encode_report(r)) == r``."""
+    if indent:
+        return json.dumps(report.to_dict(), indent=indent).encode()
+    return json.dumps(report.to_dict(), separators=(",", ":")).encode()
+
+
+def decode_report(raw: bytes | str) -> TokenReport:
+    return TokenReport.from_dict(json.loads(raw))
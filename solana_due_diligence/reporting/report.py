@@ -3,6 +3,10 @@ from __future__ import annotations
 from typing import Any, Dict
 
 
+def _skipped(section: Any) -> bool:
+    return isinstance(section, dict) and bool(section.get("skipped"))
+
+
 class ReportBuilder:
     def __init__(self, config: Dict[str, Any]) -> None:
         self.config = config
@@ -39,6 +43,8 @@ class ReportBuilder:
         lines.append(f"# Solana Meme Coin Due Diligence — {token}")
         lines.append("")
         lines.append("## Tokenomics")
+        if _skipped(tokenomics):
+            lines.append(f"- skipped: {tokenomics['skipped']}")
         lines.append(f"- Mint: {tokenomics.get('mint')}")
         s = tokenomics.get("supply", {})
         lines.append(f"- Supply (amount): {s.get('amount')} (decimals: {s.get('decimals')})")
@@ -54,6 +60,8 @@ class ReportBuilder:
                 lines.append(f"- Name/Symbol: {name} / {symbol}")
         lines.append("")
         lines.append("## Market")
+        if _skipped(market):
+            lines.append(f"- skipped: {market['skipped']}")
         lines.append(f"- Pairs found: {market.get('pairs_found')}")
         best = market.get("best_pair") or {}
         if best:
@@ -66,6 +74,8 @@ class ReportBuilder:
                 lines.append(f"- 24h Txns: {txns['h24'].get('buys')} buys / {txns['h24'].get('sells')} sells")
         lines.append("")
         lines.append("## Security")
+        if _skipped(security):
+            lines.append(f"- skipped: {security['skipped']}")
         auth = security.get("authorities", {}) if isinstance(security, dict) else {}
         lines.append(f"- Mint authority: {auth.get('mint_authority')} (revoked: {auth.get('mint_revoked')})")
         lines.append(f"- Freeze authority: {auth.get('freeze_authority')} (revoked: {auth.get('freeze_revoked')})")
@@ -73,6 +83,8 @@ class ReportBuilder:
         lines.append(f"- LP DEX: {lp.get('dex')}, Liquidity USD: {lp.get('liquidity_usd')}")
         lines.append("")
         lines.append("## Community")
+        if _skipped(community):
+            lines.append(f"- skipped: {community['skipped']}")
         x = community.get("x", {}) if isinstance(community, dict) else {}
         if x:
             lines.append(f"- X query: {x.get('query')}")
@@ -81,16 +93,32 @@ class ReportBuilder:
             lines.append(f"- Engagement — likes: {eng.get('likes')}, retweets: {eng.get('retweets')}, quotes: {eng.get('quotes')}, replies: {eng.get('replies')}")
         lines.append("")
         lines.append("## Developer")
+        if _skipped(developer):
+            lines.append(f"- skipped: {developer['skipped']}")
         lines.append(f"- Creator wallet: {developer.get('creator')}")
+        cstats = developer.get('creator_stats') if isinstance(developer, dict) else None
+        if cstats:
+            lines.append(f"- Creator launches indexed: {cstats.get('launch_count')} (rugs: {cstats.get('rug_count')})")
         rf = developer.get('risk_flags', []) if isinstance(developer, dict) else []
         if rf:
             lines.append(f"- Risk flags: {', '.join(rf)}")
         hist = developer.get('history_sample', []) if isinstance(developer, dict) else []
         lines.append(f"- Creator tokens sample: {len(hist)}")
         lines.append("")
+        clusters = (report_data.get("metrics") or {}).get("clusters")
+        if clusters:
+            lines.append("## Holder Clusters")
+            lines.append(f"- Holders analyzed: {clusters.get('holders_analyzed')} (funders resolved: {clusters.get('funders_resolved')}, complete: {clusters.get('complete')})")
+            lines.append(f"- Top-10 concentration: {clusters.get('raw_top10')} raw, {clusters.get('adjusted_top10')} cluster-adjusted")
+            lines.append(f"- Largest cluster share: {clusters.get('largest_cluster_share')} (creator-linked: {clusters.get('creator_cluster_share')})")
+            for c in clusters.get("clusters", []):
+                lines.append(f"- Cluster funded by {c.get('funder')}: {c.get('size')} wallets, share {c.get('share')}{' (creator)' if c.get('creator_linked') else ''}")
+            lines.append("")
         lines.append("## GitHub")
         repos = github.get('repos', []) if isinstance(github, dict) else []
-        if repos:
+        if _skipped(github):
+            lines.append(f"- skipped: {github['skipped']}")
+        elif repos:
             for r in repos:
                 lines.append(f"- {r.get('full_name')} — {r.get('language')} — ⭐ {r.get('stargazers')} — {r.get('html_url')}")
         else:
@@ -98,6 +126,18 @@ class ReportBuilder:
         lines.append("")
         lines.append("## Summary")
         lines.append(f"- {summary.get('headline')}")
+        sig = report_data.get("signal")
+        if sig:
+            lines.append(f"- Buy signal passed: {sig.get('passed')}")
+        if report_data.get("tier"):
+            lines.append(f"- Analysis tier: {report_data['tier']}")
+        if report_data.get("profiles"):
+            lines.append(f"- Matched profiles: {', '.join(report_data['profiles'])}")
+        gates = report_data.get("gates")
+        if gates:
+            lines.append(f"- Hard gates passed: {gates.get('passed')}")
+            for r in gates.get("reasons", []):
+                lines.append(f"- Gate failed: {r}")
         for n in summary.get("notes", []):
             lines.append(f"- {n}")
         lines.append("")
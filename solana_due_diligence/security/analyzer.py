@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional  # noqa: F401
+from typing import Any, Dict, Optional
 
 
 class SecurityAnalyzer:
@@ -23,6 +23,18 @@ class SecurityAnalyzer:
         liquidity_usd = liq.get("usd")
         dex = best.get("dexId")
         pair_age = best.get("createdAt") or best.get("pairCreatedAt")
+        source = "dexscreener" if liquidity_usd is not None else None
+
+        # On-chain reserves are current from launch on; Dexscreener lags new tokens by minutes
+        onchain = market.get("onchain") or {}
+        prefer = self.config.get("liquidity", {}).get("prefer", "onchain")
+        if onchain.get("source") and (prefer == "onchain" or liquidity_usd is None):
+            onchain_usd = onchain.get("liquidity_usd")
+            if onchain_usd is None and onchain.get("liquidity_sol") is not None:
+                onchain_usd = _usd_from_pair(onchain["liquidity_sol"], best)
+            if onchain_usd is not None or liquidity_usd is None:
+                liquidity_usd, source = onchain_usd, onchain["source"]
+                dex = dex or ("pump.fun" if source == "pumpfun_curve" else source)
 
         notes = []
         if is_mint_revoked:
@@ -34,7 +46,9 @@ class SecurityAnalyzer:
         else:
             notes.append(f"Freeze authority present: {freeze_authority}")
         if liquidity_usd is not None:
-            notes.append(f"Liquidity USD: {liquidity_usd}")
+            notes.append(f"Liquidity USD: {liquidity_usd} ({source})")
+        if onchain.get("curve_progress") is not None and not onchain.get("curve_complete"):
+            notes.append(f"Bonding curve {onchain['curve_progress'] * 100:.1f}% complete")
         if dex:
             notes.append(f"Primary DEX: {dex}")
 
@@ -49,6 +63,20 @@ class SecurityAnalyzer:
                 "dex": dex,
                 "liquidity_usd": liquidity_usd,
                 "pair_created_at": pair_age,
+                "source": source,
+                "liquidity_sol": onchain.get("liquidity_sol"),
+                "curve_progress": onchain.get("curve_progress"),
+                "price_impact": onchain.get("price_impact"),
             },
             "notes": notes,
         }
+
+
+def _usd_from_pair(liquidity_sol: float, pair: Dict[str, Any]) -> Optional[float]:
+    # A SOL-quoted pair prices SOL as priceUsd / priceNative
+    if (pair.get("quoteToken") or {}).get("symbol") not in ("SOL", "WSOL"):
+        return None
+    try:
+        return round(liquidity_sol * float(pair["priceUsd"]) / float(pair["priceNative"]), 2)
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
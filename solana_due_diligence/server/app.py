@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from solana_due_diligence.analysis import analyze_once
+from solana_due_diligence.ingestion.pumpfun import is_pubkey
+from solana_due_diligence.reporting.models import decode_report
+from solana_due_diligence.signals.engine import awaiting_data, evaluate_buy_signal
+from solana_due_diligence.signals.rules import get_rule_set
+from solana_due_diligence.streaming.memory import register_shedder
+
+
+MAX_BODY_BYTES = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+Analyze = Callable[[Dict[str, Any], str, bool], Dict[str, Any]]
+
+log = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisService:
+    """One warm pipeline shared by all API requests.
+
+    Analyses run on a bounded thread pool, so provider sessions and caches
+    stay warm between requests. Concurrent requests for a mint share one
+    analysis, and finished reports are served from memory while younger than
+    ``freshness_seconds``.
+    """
+
+    def __init__(self, config: Dict[str, Any], analyze: Optional[Analyze] = None) -> None:
+        self.config = config
+        scfg = config.get("server", {})
+        self.freshness = float(scfg.get("freshness_seconds", 300))
+        self.cache_size = int(scfg.get("cache_size", 1024))
+        self.analyze_fn: Analyze = analyze or (lambda cfg, mint, notify: analyze_once(cfg, mint, symbol_for_filename=mint, notify=notify))
+        self.executor = ThreadPoolExecutor(max_workers=int(scfg.get("max_concurrency", 4)), thread_name_prefix="api-analyze")
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"analyses": 0, "cache_hits": 0, "collapsed": 0, "errors": 0}
+        register_shedder("api_report_cache", self._cache.clear)
+
+    def cached(self, mint: str, max_age: Optional[float] = None) -> Optional[Tuple[float, Dict[str, Any]]]:
+        entry = self._cache.get(mint)
+        if entry is None:
+            return None
+        limit = self.freshness if max_age is None else max_age
+        if time.time() - entry[0] > limit:
+            return None
+        self._cache.move_to_end(mint)
+        return entry
+
+    def _store(self, mint: str, report: Dict[str, Any]) -> None:
+        self._cache[mint] = (time.time(), report)
+        self._cache.move_to_end(mint)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def analyze(self, mint: str, max_age: Optional[float] = None, notify: bool = False) -> Tuple[Dict[str, Any], str]:
+        """Report for ``mint`` and where it came from: ``cache``, ``collapsed`` or ``analysis``."""
+        entry = self.cached(mint, max_age)
+        if entry is not None:
+            self.stats["cache_hits"] += 1
+            return entry[1], "cache"
+        inflight = self._inflight.get(mint)
+        if inflight is not None:
+            self.stats["collapsed"] += 1
+            return await asyncio.shield(inflight), "collapsed"
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.analyze_fn, self.config, mint, notify)
+        self._inflight[mint] = future
+        try:
+            report = await asyncio.shield(future)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._inflight.pop(mint, None)
+        self.stats["analyses"] += 1
+        self._store(mint, report)
+        return report, "analysis"
+
+    def report(self, mint: str) -> Optional[Dict[str, Any]]:
+        """Last report for ``mint``: from memory, else the JSON written to the report directory."""
+        if not is_pubkey(mint):
+            return None
+        entry = self._cache.get(mint)
+        if entry is not None:
+            return entry[1]
+        path = Path(self.config["report"]["output_dir"]) / f"{mint}.json"
+        try:
+            return decode_report(path.read_bytes()).to_dict()
+        except (OSError, ValueError):
+            return None
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class APIServer:
+    """Minimal HTTP/1.1 JSON API on asyncio streams with keep-alive.
+
+    Routes:
+      GET  /health
+      GET  /analyze/<mint>[?max_age=<seconds>]   POST /analyze {"mint", "max_age", "notify"}
+      GET  /reports/<mint>
+      POST /signal {"mint"} or {"report": {...}}
+    """
+
+    def __init__(self, config: Dict[str, Any], service: Optional[AnalysisService] = None) -> None:
+        self.config = config
+        scfg = config.get("server", {})
+        self.idle_timeout = float(scfg.get("idle_timeout_seconds", 30))
+        self.service = service or AnalysisService(config)
+        self.requests = 0
+        self.started_at = time.time()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._connection, host, port)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), timeout=self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                self.requests += 1
+                self._write(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as e:
+            self._write(writer, e.status, {"error": str(e)}, False)
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers: Dict[str, str] = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = h.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = b""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(411, "chunked request bodies are not supported; send Content-Length")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "request body too large")
+        if length:
+            body = await reader.readexactly(length)
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, headers, body, keep_alive
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        parts = urlsplit(target)
+        segments = [unquote(s) for s in parts.path.strip("/").split("/") if s]
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        data: Dict[str, Any] = {}
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "body must be JSON")
+            if not isinstance(data, dict):
+                raise HTTPError(400, "body must be a JSON object")
+        route = segments[0] if segments else ""
+
+        if route == "health" and method == "GET":
+            return 200, {"ok": True, "uptime_seconds": round(time.time() - self.started_at, 1),
+                         "requests": self.requests, **self.service.stats}
+
+        if route == "analyze":
+            if method == "GET" and len(segments) == 2:
+                mint, max_age, notify = segments[1], query.get("max_age"), False
+            elif method == "POST" and len(segments) == 1:
+                mint, max_age, notify = data.get("mint"), data.get("max_age"), bool(data.get("notify", False))
+            else:
+                raise HTTPError(405 if len(segments) <= 2 else 404, "use GET /analyze/<mint> or POST /analyze")
+            if not mint:
+                raise HTTPError(400, "mint is required")
+            mint = self._mint(mint)
+            try:
+                age = float(max_age) if max_age is not None else None
+            except (TypeError, ValueError):
+                raise HTTPError(400, "max_age must be a number")
+            report, source = await self.service.analyze(mint, age, notify)
+            return 200, {"source": source, "report": report}
+
+        if route == "reports" and len(segments) == 2:
+            if method != "GET":
+                raise HTTPError(405, "use GET /reports/<mint>")
+            report = self.service.report(self._mint(segments[1]))
+            if report is None:
+                raise HTTPError(404, f"no report for {segments[1]}")
+            return 200, {"report": report}
+
+        if route == "signal":
+            if method != "POST":
+                raise HTTPError(405, "use POST /signal")
+            report = data.get("report")
+            if report is None and data.get("mint"):
+                report = self.service.report(self._mint(data["mint"]))
+            if not isinstance(report, dict):
+                raise HTTPError(404 if data.get("mint") else 400, "report not found" if data.get("mint") else "send mint or report")
+            thresholds = dict((self.config.get("signals") or {}).get("thresholds") or {})
+            thresholds.update(data.get("thresholds") or {})
+            signal = evaluate_buy_signal(report, thresholds)
+            rules = get_rule_set(self.config)
+            profiles = [p.name for p in rules.matching({**report, "signal": signal})] if rules else []
+            return 200, {"signal": signal, "profiles": profiles, "awaiting_data": awaiting_data({**report, "signal": signal})}
+
+        raise HTTPError(404, f"no route for {method} {parts.path}")
+
+    @staticmethod
+    def _mint(value: Any) -> str:
+        # Mints name report files and start paid provider calls; accept only real addresses
+        if not is_pubkey(value):
+            raise HTTPError(400, "mint must be a base58 Solana address")
+        return value
+
+
+async def _serve(config: Dict[str, Any], host: str, port: int) -> None:
+    server = APIServer(config)
+    srv = await server.start(host, port)
+    log.info("Serving due-diligence API on http://%s:%d", host, port)
+    try:
+        async with srv:
+            await srv.serve_forever()
+    finally:
+        server.service.close()
+
+
+def run_server(config: Dict[str, Any], host: Optional[str] = None, port: Optional[int] = None) -> None:
+    scfg = config.get("server", {})
+    try:
+        asyncio.run(_serve(config, host or scfg.get("host", "127.0.0.1"), int(port or scfg.get("port", 8787))))
+    except KeyboardInterrupt:
+        log.warning("API server stopped")
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
-def evaluate_buy_signal(report_data: Dict[str, Any], thresholds: Dict[str, float] | None = None) -> Dict[str, Any]:
-    thr = {
-        "min_liquidity_usd": 5000.0,
-        "max_top10_concentration": 0.6,
-    }
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "min_liquidity_usd": 5000.0,
+    "max_top10_concentration": 0.6,
+    "max_cluster_share": 0.3,
+}
+
+
+def evaluate_gates(report_data: Dict[str, Any], thresholds: Dict[str, float] | None = None) -> Dict[str, Any]:
+    """Hard gates that only need the cheap first-stage data (authorities and liquidity)."""
+    thr = dict(DEFAULT_THRESHOLDS)
     if thresholds:
         thr.update(thresholds)
 
@@ -18,31 +23,69 @@ def evaluate_buy_signal(report_data: Dict[str, Any], thresholds: Dict[str, float
     freeze_revoked = bool(auth.get("freeze_revoked"))
 
     # Liquidity
-    market = report_data.get("market", {})
     lp = security.get("lp", {})
     liq = lp.get("liquidity_usd") or 0
 
-    # Concentration (optional from moralis metrics)
-    moralis = report_data.get("metrics", {})
-    concentration = None
-    if isinstance(moralis, dict):
-        m = moralis.get("moralis") or {}
-        concentration = (m.get("concentration") or {}).get("top10")
-
     reasons = []
-    passed = True
-
     if not mint_revoked:
-        passed = False
         reasons.append("Mint authority not revoked")
     if not freeze_revoked:
-        passed = False
         reasons.append("Freeze authority not revoked")
     if liq < thr["min_liquidity_usd"]:
-        passed = False
         reasons.append(f"Liquidity below ${thr['min_liquidity_usd']}")
+
+    return {"passed": not reasons, "reasons": reasons}
+
+
+def evaluate_buy_signal(report_data: Dict[str, Any], thresholds: Dict[str, float] | None = None) -> Dict[str, Any]:
+    thr = dict(DEFAULT_THRESHOLDS)
+    if thresholds:
+        thr.update(thresholds)
+
+    gates = evaluate_gates(report_data, thr)
+    reasons = list(gates["reasons"])
+    passed = gates["passed"]
+
+    # Concentration (optional from moralis metrics)
+    moralis = report_data.get("metrics", {})
+    concentration = None
+    if isinstance(moralis, dict):
+        m = moralis.get("moralis") or {}
+        concentration = (m.get("concentration") or {}).get("top10")
+
     if concentration is not None and concentration > thr["max_top10_concentration"]:
         passed = False
         reasons.append("Top-10 holder concentration too high")
 
+    # Wallets funded by the same source count as one holder
+    clusters = moralis.get("clusters") if isinstance(moralis, dict) else None
+    if clusters and (clusters.get("largest_cluster_share") or 0) > thr["max_cluster_share"]:
+        passed = False
+        reasons.append("Largest funding cluster holds too much supply")
+
     return {"passed": passed, "reasons": reasons}
+
+
+def awaiting_data(report_data: Dict[str, Any]) -> List[str]:
+    """What a failed signal is still waiting on, or [] when the failure is definitive.
+
+    Fresh launches often have no Dexscreener pair or holder data yet. Only a
+    failure whose sole reason is missing liquidity counts as waiting; an
+    authority, blocklist or concentration failure will not change on a re-check.
+    """
+    signal = report_data.get("signal") or {}
+    reasons = signal.get("reasons") or []
+    if signal.get("passed") or not reasons or not all(r.startswith("Liquidity below") for r in reasons):
+        return []
+    market = report_data.get("market") or {}
+    lp = (report_data.get("security") or {}).get("lp") or {}
+    missing: List[str] = []
+    if not market.get("pairs_found"):
+        missing.append("no pairs")
+    elif not lp.get("liquidity_usd"):
+        missing.append("zero liquidity")
+    else:
+        return []
+    if not (report_data.get("tokenomics") or {}).get("top_holders_sample"):
+        missing.append("no holders")
+    return missing
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import operator
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+
+_BINARY: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "in": lambda a, b: a in b,
+    "not_in": lambda a, b: a not in b,
+}
+_UNARY: Dict[str, Callable[[Any], bool]] = {
+    "exists": lambda v: v is not None,
+    "missing": lambda v: v is None,
+}
+_CONDITION = re.compile(r"^\s*([A-Za-z0-9_.]+)\s+(==|!=|>=|<=|>|<|not_in|in|exists|missing)(?=\s|$)\s*(.*?)\s*$")
+_MISSING = object()
+
+
+class RuleError(ValueError):
+    pass
+
+
+def parse_condition(text: str) -> Tuple[Tuple[str, ...], str, Any]:
+    """``"security.lp.liquidity_usd >= 20000"`` -> (path, op, value); values are YAML literals."""
+    m = _CONDITION.match(text) if isinstance(text, str) else None
+    if m is None:
+        raise RuleError(f"cannot parse condition {text!r}; expected '<field.path> <op> <value>'")
+    path, op, raw = m.group(1), m.group(2), m.group(3)
+    if op in _UNARY:
+        if raw:
+            raise RuleError(f"{op!r} takes no value in {text!r}")
+        return tuple(path.split(".")), op, None
+    if not raw:
+        raise RuleError(f"missing value in {text!r}")
+    try:
+        value = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise RuleError(f"bad value in {text!r}: {e}") from None
+    if op in ("in", "not_in") and not isinstance(value, (list, str)):
+        raise RuleError(f"{op!r} needs a list in {text!r}")
+    return tuple(path.split(".")), op, value
+
+
+def _resolve(data: Any, path: Tuple[str, ...]) -> Any:
+    for part in path:
+        if isinstance(data, dict):
+            data = data.get(part, _MISSING)
+        elif isinstance(data, list) and part.isdigit() and int(part) < len(data):
+            data = data[int(part)]
+        else:
+            return None
+        if data is _MISSING:
+            return None
+    return data
+
+
+def _predicate(op: str, value: Any) -> Callable[[Any], bool]:
+    if op in _UNARY:
+        return _UNARY[op]
+    compare = _BINARY[op]
+    if op in ("in", "not_in"):
+        value = list(value) if isinstance(value, list) else value
+        return lambda v: v is not None and compare(v, value)
+
+    def test(v: Any) -> bool:
+        # A missing field or an incomparable type never satisfies a comparison
+        if v is None:
+            return op == "!=" and value is not None
+        try:
+            return bool(compare(v, value))
+        except TypeError:
+            return False
+    return test
+
+
+@dataclass(slots=True)
+class Profile:
+    name: str
+    chat_id: Optional[str]
+    all_mask: int
+    any_mask: int
+    none_mask: int
+
+    def matches(self, bits: int) -> bool:
+        return (bits & self.all_mask) == self.all_mask and (not self.any_mask or bool(bits & self.any_mask)) \
+            and not bits & self.none_mask
+
+
+class RuleSet:
+    """Signal profiles from ``signals.profiles``, compiled once into bitmask evaluators.
+
+    Each profile lists conditions under ``all``, ``any`` and ``none``. Every
+    distinct field path is resolved once per report and every distinct
+    condition is tested once, setting one bit; a profile then matches with
+    three mask tests. A hundred profiles built from the same few dozen
+    conditions cost about as much as one.
+    """
+
+    def __init__(self, profiles: List[Dict[str, Any]]) -> None:
+        self.paths: List[Tuple[str, ...]] = []
+        self.conditions: List[str] = []
+        self._tests: List[Tuple[int, Callable[[Any], bool]]] = []
+        path_index: Dict[Tuple[str, ...], int] = {}
+        condition_index: Dict[Tuple[Any, ...], int] = {}
+        self.profiles: List[Profile] = []
+        names = set()
+        for i, spec in enumerate(profiles or []):
+            if not isinstance(spec, dict) or not spec.get("name"):
+                raise RuleError(f"signals.profiles[{i}] needs a name")
+            name = str(spec["name"])
+            if name in names:
+                raise RuleError(f"duplicate signal profile {name!r}")
+            names.add(name)
+            masks = {}
+            for group in ("all", "any", "none"):
+                conditions = spec.get(group) or []
+                if not isinstance(conditions, list):
+                    raise RuleError(f"signals.profiles.{name}.{group} must be a list")
+                mask = 0
+                for text in conditions:
+                    path, op, value = parse_condition(text)
+                    key = (path, op, json.dumps(value, sort_keys=True, default=str))
+                    bit = condition_index.get(key)
+                    if bit is None:
+                        pi = path_index.get(path)
+                        if pi is None:
+                            pi = path_index[path] = len(self.paths)
+                            self.paths.append(path)
+                        bit = condition_index[key] = len(self._tests)
+                        self._tests.append((pi, _predicate(op, value)))
+                        self.conditions.append(str(text).strip())
+                    mask |= 1 << bit
+                masks[group] = mask
+            if not masks["all"] and not masks["any"]:
+                raise RuleError(f"signal profile {name!r} has no 'all' or 'any' conditions")
+            chat_id = spec.get("chat_id")
+            self.profiles.append(Profile(name, str(chat_id) if chat_id else None, masks["all"], masks["any"], masks["none"]))
+
+    def evaluate(self, report_data: Dict[str, Any]) -> int:
+        """Bit ``i`` is set when condition ``i`` holds for the report."""
+        values = [_resolve(report_data, path) for path in self.paths]
+        bits = 0
+        for i, (pi, test) in enumerate(self._tests):
+            if test(values[pi]):
+                bits |= 1 << i
+        return bits
+
+    def matching(self, report_data: Dict[str, Any]) -> List[Profile]:
+        bits = self.evaluate(report_data)
+        return [p for p in self.profiles if p.matches(bits)]
+
+    def reasons(self, profile: Profile, bits: int) -> List[str]:
+        """Conditions that kept ``profile`` from matching, for explaining a miss."""
+        failed = (profile.all_mask & ~bits) | (profile.none_mask & bits)
+        out = [("not: " if profile.none_mask >> i & 1 else "") + c for i, c in enumerate(self.conditions) if failed >> i & 1]
+        if profile.any_mask and not bits & profile.any_mask:
+            out.append("none of: " + ", ".join(c for i, c in enumerate(self.conditions) if profile.any_mask >> i & 1))
+        return out
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+
+# Keyed on id() of the profiles list; each entry keeps the list alive so the id cannot be reused
+_rule_sets: Dict[int, Tuple[Any, RuleSet]] = {}
+_rule_sets_lock = threading.Lock()
+
+
+def get_rule_set(config: Dict[str, Any]) -> Optional[RuleSet]:
+    """Compiled ``signals.profiles``, or None when none are configured.
+
+    Compiled once per loaded config (``validate_config`` warms the cache), so
+    the per-report call is a dict lookup.
+    """
+    profiles = (config.get("signals") or {}).get("profiles")
+    if not profiles:
+        return None
+    with _rule_sets_lock:
+        entry = _rule_sets.get(id(profiles))
+        if entry is None or entry[0] is not profiles:
+            if len(_rule_sets) > 16:
+                # Hot reloads add a set each time; old ones are unreachable
+                _rule_sets.clear()
+            entry = _rule_sets[id(profiles)] = (profiles, RuleSet(profiles))
+        return entry[1]
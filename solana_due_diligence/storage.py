@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+
+def open_sqlite(path: str | Path) -> sqlite3.Connection:
+    """Open a SQLite database shared between threads (and processes) of the bot."""
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=30, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
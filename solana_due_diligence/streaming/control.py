@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+log = logging.getLogger(__name__)
+
+COMMANDS = ("stats", "pause", "resume", "drain")
+# One request and one reply per connection; both are single JSON lines
+MAX_REQUEST_BYTES = 64 * 1024
+
+Handler = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+
+def control_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+class ControlServer:
+    """Unix domain socket a running stream serves commands on (``stats``, ``pause``, ``resume``, ``drain``).
+
+    The socket file is created owner-only, so only the user running the
+    stream can control it. A stale socket left by a crashed stream is
+    replaced on start.
+    """
+
+    def __init__(self, path: str, handler: Handler) -> None:
+        self.path = Path(path)
+        self.handler = handler
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+        sock.listen(8)
+        sock.settimeout(0.5)
+        self._sock = sock
+        self._thread = threading.Thread(target=self._serve, name="stream-control", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()  # type: ignore[union-attr]
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._handle, args=(conn,), name="stream-control-conn", daemon=True).start()
+
+    def _handle(self, conn: socket.socket) -> None:
+        with conn:
+            conn.settimeout(5)
+            try:
+                request = json.loads(_read_line(conn))
+                cmd = request.get("cmd") if isinstance(request, dict) else None
+                if cmd not in COMMANDS:
+                    reply: Dict[str, Any] = {"ok": False, "error": f"unknown command {cmd!r}; expected one of {', '.join(COMMANDS)}"}
+                else:
+                    reply = {"ok": True, **self.handler(cmd, request)}
+            except (ValueError, OSError) as e:
+                reply = {"ok": False, "error": str(e)}
+            except Exception as e:
+                log.error("Control command failed: %s", e, exc_info=True)
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                conn.sendall(json.dumps(reply, default=str).encode() + b"\n")
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    buf = b""
+    while b"\n" not in buf:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        buf += chunk
+        if len(buf) > MAX_REQUEST_BYTES:
+            raise ValueError("control request too large")
+    return buf.split(b"\n", 1)[0]
+
+
+def send_command(path: str, cmd: str, timeout: float = 5.0, **args: Any) -> Dict[str, Any]:
+    """Send one command to a running stream. Raises OSError when no stream is listening on ``path``."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps({"cmd": cmd, **args}).encode() + b"\n")
+        line = _read_line(sock)
+    if not line:
+        raise ConnectionError("stream closed the control connection without replying")
+    return json.loads(line)
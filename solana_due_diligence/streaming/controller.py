@@ -1,35 +1,114 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import signal
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-from rich import print
 from rich.console import Console
 
-from solana_due_diligence.config import load_config
+from solana_due_diligence.config import ConfigWatcher, load_config, validate_config
+from solana_due_diligence.developer.creator_index import get_creator_index
 from solana_due_diligence.ingestion.bitquery_stream import BitqueryStream
+from solana_due_diligence.ingestion.pumpfun import CreateFilter, Launch
+from solana_due_diligence import log as logs
+from solana_due_diligence.log import setup_logging
 from solana_due_diligence.analysis import analyze_once
+from solana_due_diligence.market.watch import WatchEngine, should_watch
+from solana_due_diligence.profiling import enable_profiling
+from solana_due_diligence.providers import http
+from solana_due_diligence.providers.rpc_pool import get_rpc_pool
+from solana_due_diligence.streaming.control import ControlServer, control_supported, send_command
+from solana_due_diligence.streaming.dedupe import RecentMints
+from solana_due_diligence.streaming.delay_queue import DelayQueue, open_delay_queue
+from solana_due_diligence.streaming.memory import MemoryMonitor, read_status, register_shedder
+from solana_due_diligence.streaming.shared_state import SharedState
+from solana_due_diligence.streaming.tiers import TierSelector, launch_lag
+
+
+log = logging.getLogger(__name__)
 
 
 class StreamController:
-    def __init__(self, config_path: str = "config.yaml"):
+    # Sections that are only read at startup; changes need a restart
+    RESTART_SECTIONS = ("stream", "memory", "bitquery")
+
+    def __init__(self, config_path: str = "config.yaml", memory_profile: bool = False, profile: Optional[float] = None):
+        self.config_path = config_path
+        # --profile [THRESHOLD_MS]; survives config reloads
+        self.profile = profile
         self.config = load_config(config_path)
+        validate_config(self.config)
+        if profile is not None:
+            enable_profiling(self.config, threshold_ms=profile)
+        setup_logging(self.config)
+        self.watcher: Optional[ConfigWatcher] = None
         self.console = Console()
         self.running = False
         self.pid_file = Path("stream.pid")
+        pcfg = self.config.get("pipeline", {})
+        self.recent = RecentMints(window_seconds=float(pcfg.get("dedupe_window_seconds", 3600)))
+        self.memory_profile = memory_profile or bool(self.config.get("memory", {}).get("enabled", False))
+        self.memory: Optional[MemoryMonitor] = None
+        self.watch: Optional[WatchEngine] = None
+        self.delay: Optional[DelayQueue] = None
+        self.ingest = CreateFilter()
+        scfg = self.config.get("stream", {})
+        self.control_path = scfg.get("control_socket", "state/stream.sock")
+        self.pending_path = Path(scfg.get("pending_path", "state/pending_mints.jsonl"))
+        self.drain_timeout = float(scfg.get("drain_timeout_seconds", 600))
+        self.control: Optional[ControlServer] = None
+        # Control state: mints received while paused or draining wait in `held`
+        self._control_lock = threading.Lock()
+        self._dispatch_lock = threading.Lock()
+        self.paused = False
+        self.draining = False
+        self.held: Deque[Tuple[str, int]] = deque()
+        self.inflight: Dict[str, float] = {}
+        self.counters = {"received": 0, "analyzed": 0, "errors": 0}
+        self._finished: Deque[float] = deque(maxlen=10000)
+        self.started_at = time.time()
+        self.tiers = TierSelector(self.config)
+        self._lag = 0.0
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._reload_handler)
 
     def _signal_handler(self, signum, frame):
-        self.console.print("\n[yellow]Shutting down stream controller...[/yellow]")
-        self.stop()
+        log.warning("Shutting down stream controller")
+        # Unblocks the stream read; start() shuts down in its finally
+        raise KeyboardInterrupt
+
+    def _reload_handler(self, signum, frame):
+        if self.watcher is not None:
+            self.watcher.request_reload()
+
+    def _apply_config(self, new_config: Dict[str, Any]):
+        """Swap in a validated config; warm state (dedupe set, connections, workers) is kept."""
+        if self.profile is not None:
+            enable_profiling(new_config, threshold_ms=self.profile)
+        old_config, self.config = self.config, new_config
+        self.recent.window = float(new_config.get("pipeline", {}).get("dedupe_window_seconds", self.recent.window))
+        stale = [s for s in self.RESTART_SECTIONS if old_config.get(s) != new_config.get(s)]
+        if old_config.get("logging") != new_config.get("logging"):
+            setup_logging(new_config)
+        if old_config.get("pipeline", {}).get("tier") != new_config.get("pipeline", {}).get("tier"):
+            self.tiers = TierSelector(new_config)
+        log.info("Config reloaded")
+        if stale:
+            log.warning("Changes to %s take effect after a restart", ", ".join(stale))
+
+    def _config_error(self, error: str):
+        log.error("Config reload rejected, keeping current config: %s", error)
 
     def start(self):
         if self.pid_file.exists():
@@ -48,11 +127,12 @@ class StreamController:
             f.write(str(os.getpid()))
 
         self.running = True
-        self.console.print("[green]Starting live token stream...[/green]")
+        self.started_at = time.time()
+        log.info("Starting live token stream")
         
         bcfg = self.config.get("bitquery", {})
         if not bcfg.get("enabled"):
-            self.console.print("[yellow]Bitquery streaming disabled in config[/yellow]")
+            log.warning("Bitquery streaming disabled in config")
             return
 
         stream = BitqueryStream(
@@ -60,63 +140,401 @@ class StreamController:
             api_key=bcfg.get("api_key")
         )
 
+        scfg = self.config.get("stream", {})
+        if scfg.get("watch_config", True):
+            self.watcher = ConfigWatcher(self.config_path, self._apply_config, on_error=self._config_error,
+                                         interval=float(scfg.get("watch_interval_seconds", 2)))
+            self.watcher.start()
+
+        if self.config.get("watch", {}).get("enabled"):
+            self.watch = WatchEngine(self.config)
+            self.watch.start()
+
+        self.delay = open_delay_queue(self.config)
+        if self.delay is not None:
+            threading.Thread(target=self._recheck_loop, name="recheck", daemon=True).start()
+
+        if self.memory_profile:
+            # Only caches: the dedupe window is needed for correct results and is never shed
+            register_shedder("http_sessions", http.close_sessions)
+            self.memory = MemoryMonitor(self.config)
+            self.memory.start()
+            log.info("Memory profiling on; status in %s", self.memory.status_path)
+
+        if control_supported():
+            self.control = ControlServer(self.control_path, self._control)
+            self.control.start()
+            log.info("Control socket at %s", self.control_path)
+
         try:
+            self._on_start()
+            self._load_pending()
             for item in stream.subscribe_new_tokens():
                 if not self.running:
                     break
                     
-                # Extract mint from instruction data (simplified)
-                accounts = item.get("Accounts", [])
-                if accounts and len(accounts) > 0:
-                    mint = accounts[0].get("Address")
-                    if mint and len(mint) > 20:  # Basic validation
-                        self.console.print(f"[blue]New token detected: {mint}[/blue]")
-                        try:
-                            analyze_once(self.config, mint, symbol_for_filename=mint, notify=True)
-                        except Exception as e:
-                            self.console.print(f"[red]Error analyzing {mint}: {e}[/red]")
-                            
+                launch = self.ingest.parse(item)
+                if launch:
+                    self._lag = launch_lag(launch.block_time)
+                    self._record_launch(launch)
+                    self._handle_mint(launch.mint)
+
         except KeyboardInterrupt:
-            self.console.print("\n[yellow]Stream interrupted by user[/yellow]")
+            log.warning("Stream interrupted by user")
         except Exception as e:
-            self.console.print(f"[red]Stream error: {e}[/red]")
+            log.error("Stream error: %s", e, exc_info=True)
         finally:
-            self.stop()
+            self._shutdown()
 
-    def stop(self):
-        if not self.running:
-            if self.pid_file.exists():
-                self.console.print("[yellow]No active stream found[/yellow]")
+    def _record_launch(self, launch: Launch):
+        index = get_creator_index(self.config)
+        if index is not None and launch.creator:
+            index.record_launch(launch.creator, launch.mint)
+
+    def _print_ingest_stats(self):
+        log.info("Ingestion stats", extra={**self.ingest.stats, "noise_ratio": self.ingest.noise_ratio()})
+
+    def _on_start(self):
+        """Hook run once the stream is about to be consumed."""
+
+    def _on_stop(self):
+        """Hook run when a running stream stops."""
+        self._print_ingest_stats()
+
+    def _recheck_loop(self):
+        # Feeds due re-checks back in; their dedupe is the delay queue's own
+        while self.running:
+            if self.paused or self.draining:
+                time.sleep(1)
+                continue
+            try:
+                for mint, attempt in self.delay.pop_due():
+                    self._handle_mint(mint, attempt)
+            except Exception as e:
+                log.error("Re-check error: %s", e)
+            time.sleep(1)
+
+    def _handle_mint(self, mint: str, attempt: int = 0):
+        if attempt == 0 and self.recent.seen_recently(mint):
             return
+        with self._control_lock:
+            self.counters["received"] += 1
+            if self.paused or self.draining:
+                self.held.append((mint, attempt))
+                return
+        self._dispatch(mint, attempt)
+
+    def _dispatch(self, mint: str, attempt: int = 0):
+        # The stream loop, the re-check loop and resume all dispatch here; analysis runs one mint at a time
+        with self._dispatch_lock:
+            if attempt:
+                log.info("Re-checking (attempt %d)", attempt, extra={"mint": mint, "attempt": attempt})
+            else:
+                log.info("New token detected", extra={"mint": mint})
+            self.inflight[mint] = time.time()
+            # Re-checks are old by design; only fresh launches count towards the lag. Analysis runs
+            # inline with the stream here, so falling behind shows up as launch lag, not as a queue
+            tier = self.tiers.observe(backlog=len(self.held), lag=0.0 if attempt else self._lag)
+            try:
+                report_data = analyze_once(self.config, mint, symbol_for_filename=mint, notify=True, tier=tier)
+                self.counters["analyzed"] += 1
+                if self.watch is not None and should_watch(self.config, report_data):
+                    self.watch.add(mint)
+                if self.delay is not None:
+                    due = self.delay.settle(mint, attempt, report_data)
+                    if due is not None:
+                        log.info("Data not available yet; re-check in %.0fs", due - time.time(), extra={"mint": mint})
+            except Exception as e:
+                self.counters["errors"] += 1
+                log.error("Error analyzing: %s", e, extra={"mint": mint}, exc_info=True)
+                if self.delay is not None and attempt:
+                    self.delay.defer(mint, attempt + 1, ["analysis error"])
+            # Interrupted analyses stay in `inflight` and are spilled on shutdown
+            self.inflight.pop(mint, None)
+            self._finished.append(time.monotonic())
+
+    # Control socket
+
+    def _control(self, cmd: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        if cmd == "stats":
+            return self._control_stats()
+        if cmd == "pause":
+            with self._control_lock:
+                self.paused = True
+            log.warning("Stream paused; new mints are held until resume")
+            return {"paused": True}
+        if cmd == "resume":
+            with self._control_lock:
+                self.paused = False
+                held = len(self.held)
+            log.info("Stream resumed; releasing %d held mints", held)
+            self._release_held()
+            return {"paused": False, "released": held}
+        # drain
+        with self._control_lock:
+            started = not self.draining
+            self.draining = True
+        if started:
+            threading.Thread(target=self._drain, name="drain", daemon=True).start()
+        return {"draining": True, "inflight": self._inflight_count(), "queue_depth": self._queue_depth()}
+
+    def _release_held(self):
+        def run():
+            while not (self.paused or self.draining):
+                with self._control_lock:
+                    if not self.held:
+                        return
+                    mint, attempt = self.held.popleft()
+                self._dispatch(mint, attempt)
+        threading.Thread(target=run, name="release-held", daemon=True).start()
+
+    def _drain(self):
+        log.warning("Draining: finishing in-flight work, holding new mints")
+        deadline = time.monotonic() + self.drain_timeout
+        while time.monotonic() < deadline and (self._inflight_count() or self._queue_depth()):
+            time.sleep(0.5)
+        if self._inflight_count() or self._queue_depth():
+            log.warning("Drain timed out after %.0fs; unfinished mints are kept for the next start", self.drain_timeout)
+        else:
+            log.info("Drained")
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def _queue_depth(self) -> int:
+        """Mints accepted for analysis but not started yet."""
+        return 0
+
+    def _inflight_count(self) -> int:
+        return len(self.inflight)
+
+    def _inflight(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [{"mint": m, "seconds": round(now - t, 1)} for m, t in list(self.inflight.items())]
+
+    def _control_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        pool = get_rpc_pool(self.config)
+        return {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "paused": self.paused,
+            "draining": self.draining,
+            "tier": self.tiers.tier,
+            "tier_switches": self.tiers.switches,
+            **self.counters,
+            "per_minute": sum(1 for t in list(self._finished) if now - t <= 60),
+            "held": len(self.held),
+            "queue_depth": self._queue_depth(),
+            "inflight": self._inflight(),
+            "rechecks_pending": len(self.delay) if self.delay is not None else None,
+            "watching": len(self.watch.tokens) if self.watch is not None else None,
+            "ingestion": {**self.ingest.stats, "noise_ratio": self.ingest.noise_ratio()},
+            "providers": {
+                "rpc": pool.snapshot() if pool is not None else [],
+                "single_flight": dict(http.flight_stats),
+            },
+            "caches": {"recent_mints": len(self.recent)},
+            "log_dropped": logs._handler.dropped if logs._handler is not None else 0,
+        }
 
+    # Pending mints survive a restart
+
+    def _unfinished(self) -> List[Tuple[str, int]]:
+        """Mints that were accepted but not analyzed, collected once work has stopped."""
+        with self._control_lock:
+            items = list(self.held)
+            self.held.clear()
+        return items + [(m, 0) for m in list(self.inflight)]
+
+    def _spill_pending(self):
+        items = self._unfinished()
+        if not items:
+            return
+        self.pending_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.pending_path, "a", encoding="utf-8") as f:
+            for mint, attempt in items:
+                f.write(json.dumps({"mint": mint, "attempt": attempt}) + "\n")
+        log.info("Saved %d unfinished mints to %s", len(items), self.pending_path)
+
+    def _load_pending(self):
+        if not self.pending_path.exists():
+            return
+        items = []
+        with open(self.pending_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    items.append((entry["mint"], int(entry.get("attempt", 0))))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        self.pending_path.unlink()
+        if items:
+            log.info("Resuming %d unfinished mints from the last run", len(items))
+            with self._control_lock:
+                self.held.extend(items)
+            self._release_held()
+
+    def stop(self, force: bool = False):
+        """Stop this stream, or from the CLI ask the running one to drain (``force``: SIGTERM right away)."""
+        if self.running:
+            self._shutdown()
+            return
+        pid = self._read_pid()
+        if pid is None:
+            self.console.print("[yellow]No active stream found[/yellow]")
+            return
+        reply = None if force else self._remote("drain")
+        if reply is not None:
+            self.console.print(f"[yellow]Draining stream (PID {pid}): {reply.get('inflight')} in flight, "
+                               f"{reply.get('queue_depth')} queued[/yellow]")
+        else:
+            os.kill(pid, signal.SIGTERM)
+            self.console.print(f"[yellow]Sent SIGTERM to stream (PID {pid})[/yellow]")
+        deadline = time.monotonic() + self.drain_timeout + 60
+        while time.monotonic() < deadline:
+            if not _alive(pid):
+                self.console.print("[green]Stream stopped[/green]")
+                return
+            time.sleep(0.5)
+        self.console.print(f"[red]Stream (PID {pid}) still running; use --force to stop it now[/red]")
+
+    def _shutdown(self):
+        if not self.running:
+            return
         self.running = False
+        if self.control is not None:
+            self.control.stop()
+            self.control = None
+        self._on_stop()
+        self._spill_pending()
+        if self.memory is not None:
+            self.memory.stop()
+            self.memory = None
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.watch is not None:
+            self.watch.stop()
+            self.watch = None
         if self.pid_file.exists():
             self.pid_file.unlink()
-        self.console.print("[green]Stream stopped[/green]")
+        log.info("Stream stopped")
+
+    def pause(self):
+        self._remote_action("pause", "Stream paused; new mints are held")
+
+    def resume(self):
+        self._remote_action("resume", "Stream resumed")
+
+    def _remote_action(self, cmd: str, done: str):
+        reply = self._remote(cmd)
+        if reply is None:
+            self.console.print("[yellow]No active stream found[/yellow]")
+        elif not reply.get("ok"):
+            self.console.print(f"[red]{cmd} failed: {reply.get('error')}[/red]")
+        else:
+            released = f" ({reply['released']} held mints released)" if reply.get("released") else ""
+            self.console.print(f"[green]{done}{released}[/green]")
+
+    def _remote(self, cmd: str) -> Optional[Dict[str, Any]]:
+        """Reply of the running stream's control socket, or None when nothing is listening."""
+        if not control_supported() or not Path(self.control_path).exists():
+            return None
+        try:
+            return send_command(self.control_path, cmd)
+        except (OSError, ValueError):
+            return None
+
+    def _read_pid(self) -> Optional[int]:
+        if not self.pid_file.exists():
+            return None
+        try:
+            pid = int(self.pid_file.read_text().strip())
+        except ValueError:
+            pid = None
+        if pid is None or not _alive(pid):
+            self.pid_file.unlink()
+            return None
+        return pid
 
     def status(self):
         if self.pid_file.exists():
             with open(self.pid_file, "r") as f:
                 pid = int(f.read().strip())
-            try:
-                os.kill(pid, 0)  # Check if process exists
-                self.console.print(f"[green]Stream is running (PID: {pid})[/green]")
-                return True
-            except OSError:
+            if not _alive(pid):
                 self.pid_file.unlink()
                 self.console.print("[yellow]Stream PID file exists but process not found[/yellow]")
                 return False
+            stats = self._remote("stats")
+            state = " (paused)" if stats and stats.get("paused") else " (draining)" if stats and stats.get("draining") else ""
+            self.console.print(f"[green]Stream is running (PID: {pid}){state}[/green]")
+            if stats and stats.get("ok"):
+                self._print_live_stats(stats)
+            else:
+                self._print_worker_stats()
+            self._print_memory_status()
+            return True
         else:
             self.console.print("[yellow]No active stream[/yellow]")
             return False
 
+    def _print_live_stats(self, st: Dict[str, Any]):
+        self.console.print(f"  Uptime {st.get('uptime_seconds')}s; received {st.get('received')}, analyzed {st.get('analyzed')}, "
+                           f"errors {st.get('errors')}; " + (f"{st['per_minute']} done in the last minute" if "per_minute" in st
+                                                             else f"{st.get('avg_per_minute')}/min on average"))
+        self.console.print(f"  Queue depth {st.get('queue_depth')}, held {st.get('held')}, re-checks pending {st.get('rechecks_pending')}, "
+                           f"watching {st.get('watching')}")
+        for entry in st.get("inflight") or []:
+            worker = f" (worker {entry['worker']})" if entry.get("worker") is not None else ""
+            self.console.print(f"  In flight: {entry.get('mint')} for {entry.get('seconds')}s{worker}")
+        if st.get("workers"):
+            self.console.print("  Workers: " + ", ".join(f"{k}={v}" for k, v in st["workers"].items()))
+        tiers = st.get("worker_tiers") or {"stream": st.get("tier")}
+        self.console.print("  Analysis tier: " + ", ".join(f"{k} {v}" for k, v in tiers.items()))
+        for endpoint in (st.get("providers") or {}).get("rpc") or []:
+            self.console.print("  RPC: " + ", ".join(f"{k}={v}" for k, v in endpoint.items()))
+        flight = (st.get("providers") or {}).get("single_flight") or {}
+        self.console.print(f"  HTTP calls {flight.get('calls')}, shared {flight.get('shared')}; "
+                           f"recent mints cached {(st.get('caches') or {}).get('recent_mints')}; log records dropped {st.get('log_dropped')}")
+
+    def _print_worker_stats(self):
+        state_path = Path(self.config.get("stream", {}).get("state_path", "state/stream.db"))
+        if not state_path.exists():
+            return
+        totals = SharedState(str(state_path)).aggregate_stats()
+        if totals.get("workers"):
+            self.console.print("Workers: " + ", ".join(f"{k}={v}" for k, v in totals.items()))
+
+    def _print_memory_status(self):
+        base = Path(self.config.get("memory", {}).get("status_path", "state/memory.json"))
+        for path in sorted(base.parent.glob(f"{base.stem}*{base.suffix}")):
+            st = read_status(path)
+            if not st:
+                continue
+            self.console.print(f"[blue]Memory ({path.name}, PID {st.get('pid')}):[/blue]")
+            self.console.print(f"  RSS {st.get('rss_mb')} MB (growth {st.get('rss_growth_mb')} MB, soft limit {st.get('soft_limit_mb')} MB)")
+            self.console.print(f"  GC tracked objects {st.get('gc_tracked_objects')}, collections {st.get('gc_collections')}, shed events {st.get('shed_events')}")
+            if st.get("traced_mb") is not None:
+                self.console.print(f"  tracemalloc {st.get('traced_mb')} MB (peak {st.get('traced_peak_mb')} MB)")
+                top = list((st.get("by_component_kb") or {}).items())[:5]
+                if top:
+                    self.console.print("  Top components: " + ", ".join(f"{k} {v} KB" for k, v in top))
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
 
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Stream Controller")
-    parser.add_argument("action", choices=["start", "stop", "status"], help="Action to perform")
+    parser.add_argument("action", choices=["start", "stop", "status", "pause", "resume"], help="Action to perform")
     parser.add_argument("--config", default="config.yaml", help="Config file path")
+    parser.add_argument("--force", action="store_true", help="stop: SIGTERM right away instead of draining")
     
     args = parser.parse_args()
     controller = StreamController(args.config)
@@ -124,9 +542,13 @@ def main():
     if args.action == "start":
         controller.start()
     elif args.action == "stop":
-        controller.stop()
+        controller.stop(force=args.force)
     elif args.action == "status":
         controller.status()
+    elif args.action == "pause":
+        controller.pause()
+    elif args.action == "resume":
+        controller.resume()
 
 
 if __name__ == "__main__":
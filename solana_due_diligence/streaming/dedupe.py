@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class RecentMints:
+    """Bounded TTL set used to drop repeat stream events before any analysis work."""
+
+    def __init__(self, window_seconds: float = 3600.0, max_size: int = 100_000) -> None:
+        self.window = window_seconds
+        self.max_size = max_size
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def seen_recently(self, mint: str, now: Optional[float] = None) -> bool:
+        """Return True if ``mint`` was seen within the window; otherwise remember it and return False."""
+        now = now if now is not None else time.time()
+        self._expire(now)
+        if mint in self._seen:
+            return True
+        self._seen[mint] = now
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._seen:
+            mint, ts = next(iter(self._seen.items()))
+            if ts >= cutoff:
+                break
+            self._seen.popitem(last=False)
+
+    def clear(self) -> None:
+        self._seen.clear()
+
+    def __len__(self) -> int:
+        return len(self._seen)
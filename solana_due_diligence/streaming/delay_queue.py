@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from solana_due_diligence.signals.engine import awaiting_data
+from solana_due_diligence.storage import open_sqlite
+
+
+DEFAULT_OFFSETS = (120.0, 600.0, 3600.0)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS deferred ("
+    "  mint TEXT PRIMARY KEY,"
+    "  attempt INTEGER NOT NULL,"
+    "  due_at REAL NOT NULL,"
+    "  first_seen REAL NOT NULL,"
+    "  reasons TEXT NOT NULL"
+    ")",
+    "CREATE INDEX IF NOT EXISTS deferred_due ON deferred (due_at)",
+)
+
+
+class DelayQueue:
+    """Persisted schedule of re-checks for tokens rejected only because their data was not indexed yet.
+
+    A token that fails on missing data is re-analyzed ``offsets`` seconds after
+    it was first seen (by default +2m, +10m, +1h), then dropped. Rows are keyed
+    by mint, so repeat rejections of the same token never stack. Due rows are
+    leased rather than deleted, so a re-check lost to a crash or restart runs
+    again once the lease expires.
+    """
+
+    def __init__(self, path: str, offsets: Sequence[float] = DEFAULT_OFFSETS, lease_seconds: float = 600.0) -> None:
+        self.path = path
+        self.offsets = sorted(float(o) for o in offsets)
+        self.lease_seconds = lease_seconds
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def defer(self, mint: str, attempt: int, reasons: List[str], now: Optional[float] = None) -> Optional[float]:
+        """Schedule re-check number ``attempt`` (1-based). Returns its due time, or None once offsets run out."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT attempt, first_seen FROM deferred WHERE mint = ?", (mint,)).fetchone()
+                first_seen = row["first_seen"] if row is not None else now
+                if attempt > len(self.offsets):
+                    self._conn.execute("DELETE FROM deferred WHERE mint = ?", (mint,))
+                    due = None
+                elif row is not None and row["attempt"] >= attempt:
+                    due = None  # already scheduled at this step or later
+                else:
+                    due = max(first_seen + self.offsets[attempt - 1], now)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO deferred (mint, attempt, due_at, first_seen, reasons) VALUES (?, ?, ?, ?, ?)",
+                        (mint, attempt, due, first_seen, ", ".join(reasons)),
+                    )
+                self._conn.execute("COMMIT")
+                return due
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def pop_due(self, now: Optional[float] = None, limit: int = 100) -> List[Tuple[str, int]]:
+        """Lease up to ``limit`` due re-checks as ``(mint, attempt)``; settle each with :meth:`settle`."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT mint, attempt FROM deferred WHERE due_at <= ? ORDER BY due_at LIMIT ?", (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE deferred SET due_at = ? WHERE mint = ?", [(now + self.lease_seconds, r["mint"]) for r in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(r["mint"], int(r["attempt"])) for r in rows]
+
+    def settle(self, mint: str, attempt: int, report_data: Dict[str, Any], now: Optional[float] = None) -> Optional[float]:
+        """Record the outcome of analysis ``attempt`` (0 = first look). Returns the next re-check time, if any."""
+        missing = awaiting_data(report_data)
+        if missing:
+            return self.defer(mint, attempt + 1, missing, now=now)
+        self.done(mint)
+        return None
+
+    def done(self, mint: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM deferred WHERE mint = ?", (mint,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) AS n FROM deferred").fetchone()["n"])
+
+
+def open_delay_queue(config: Dict[str, Any]) -> Optional[DelayQueue]:
+    """Delay queue from ``stream.recheck``, or None when re-checks are disabled."""
+    rcfg = (config.get("stream") or {}).get("recheck") or {}
+    if not rcfg.get("enabled", True):
+        return None
+    return DelayQueue(rcfg.get("path", "state/delay_queue.db"), offsets=rcfg.get("offsets_seconds") or DEFAULT_OFFSETS)
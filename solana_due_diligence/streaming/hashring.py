@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+from typing import Iterable, List, Tuple
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes; maps mints to worker ids."""
+
+    def __init__(self, nodes: Iterable[int], replicas: int = 64) -> None:
+        self.replicas = replicas
+        self._ring: List[Tuple[int, int]] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: int) -> None:
+        for i in range(self.replicas):
+            bisect.insort(self._ring, (_hash(f"{node}:{i}"), node))
+
+    def remove(self, node: int) -> None:
+        self._ring = [(h, n) for h, n in self._ring if n != node]
+
+    def node_for(self, key: str) -> int:
+        if not self._ring:
+            raise ValueError("hash ring is empty")
+        idx = bisect.bisect(self._ring, (_hash(key), -1)) % len(self._ring)
+        return self._ring[idx][1]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import gc
+import json
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+_shedders: Dict[str, Callable[[], Any]] = {}
+_shedders_lock = threading.Lock()
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+
+def register_shedder(name: str, fn: Callable[[], Any]) -> None:
+    """Register a callback that drops an in-memory cache when the soft memory ceiling is hit."""
+    with _shedders_lock:
+        _shedders[name] = fn
+
+
+def unregister_shedder(name: str) -> None:
+    with _shedders_lock:
+        _shedders.pop(name, None)
+
+
+def shed_caches() -> List[str]:
+    with _shedders_lock:
+        items = list(_shedders.items())
+    shed: List[str] = []
+    for name, fn in items:
+        try:
+            fn()
+            shed.append(name)
+        except Exception:
+            continue
+    return shed
+
+
+def current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, but better than nothing off Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _component(filename: str) -> Optional[str]:
+    try:
+        rel = Path(filename).resolve().relative_to(PACKAGE_DIR)
+    except ValueError:
+        return None
+    return rel.parts[0].removesuffix(".py") if rel.parts else None
+
+
+class MemoryMonitor:
+    """Opt-in memory sampler for the long-running stream.
+
+    Every ``interval_seconds`` it records RSS and GC stats, and when
+    ``tracemalloc`` is on, writes the top allocation growth since the previous
+    snapshot plus a per-component (analyzer/provider package) breakdown to
+    ``snapshot_dir``. Above ``soft_limit_mb`` registered caches are shed.
+    The latest figures go to ``status_path`` for ``stream status``.
+    """
+
+    def __init__(self, config: Dict[str, Any], status_path: Optional[str] = None) -> None:
+        mcfg = config.get("memory", {})
+        self.interval = float(mcfg.get("interval_seconds", 60))
+        self.tracemalloc = bool(mcfg.get("tracemalloc", True))
+        self.frames = int(mcfg.get("tracemalloc_frames", 1))
+        self.top_n = int(mcfg.get("top_n", 25))
+        self.soft_limit = int(float(mcfg.get("soft_limit_mb", 0)) * 1024 * 1024)
+        self.snapshot_dir = Path(mcfg.get("snapshot_dir", "state/memory"))
+        self.status_path = Path(status_path or mcfg.get("status_path", "state/memory.json"))
+        self.started_at = time.time()
+        self.baseline_rss: Optional[int] = None
+        self.shed_events = 0
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.status_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                continue
+
+    def sample(self) -> Dict[str, Any]:
+        now = time.time()
+        rss = current_rss_bytes()
+        if self.baseline_rss is None:
+            self.baseline_rss = rss
+        status: Dict[str, Any] = {
+            "pid": os.getpid(),
+            "updated_at": now,
+            "uptime_seconds": round(now - self.started_at, 1),
+            "rss_mb": round(rss / 1048576, 1),
+            "rss_growth_mb": round((rss - self.baseline_rss) / 1048576, 1),
+            "gc_counts": list(gc.get_count()),
+            "gc_collections": [g.get("collections", 0) for g in gc.get_stats()],
+            "gc_tracked_objects": len(gc.get_objects()),
+            "soft_limit_mb": round(self.soft_limit / 1048576, 1) if self.soft_limit else None,
+            "shed_events": self.shed_events,
+        }
+        if tracemalloc.is_tracing():
+            status.update(self._snapshot(now))
+        if self.soft_limit and rss > self.soft_limit:
+            shed = shed_caches()
+            gc.collect()
+            self.shed_events += 1
+            status["shed_events"] = self.shed_events
+            status["last_shed"] = {"at": now, "rss_mb": status["rss_mb"], "caches": shed}
+        tmp = self.status_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(status))
+        tmp.replace(self.status_path)
+        return status
+
+    def _snapshot(self, now: float) -> Dict[str, Any]:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>"))
+        )
+        by_component: Dict[str, int] = {}
+        for stat in snapshot.statistics("filename"):
+            comp = _component(stat.traceback[0].filename)
+            if comp:
+                by_component[comp] = by_component.get(comp, 0) + stat.size
+        traced, peak = tracemalloc.get_traced_memory()
+
+        lines = [f"# {time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))} pid={os.getpid()}"]
+        if self._previous is not None:
+            for diff in snapshot.compare_to(self._previous, "lineno")[: self.top_n]:
+                lines.append(str(diff))
+        else:
+            for stat in snapshot.statistics("lineno")[: self.top_n]:
+                lines.append(str(stat))
+        self._previous = snapshot
+        with open(self.snapshot_dir / f"tracemalloc-{os.getpid()}.log", "a") as f:
+            f.write("\n".join(lines) + "\n\n")
+
+        return {
+            "traced_mb": round(traced / 1048576, 1),
+            "traced_peak_mb": round(peak / 1048576, 1),
+            "by_component_kb": {k: round(v / 1024, 1) for k, v in sorted(by_component.items(), key=lambda kv: -kv[1])},
+        }
+
+
+def read_status(path: str | Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from solana_due_diligence.storage import open_sqlite
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS seen_mints (mint TEXT PRIMARY KEY, claimed_at REAL NOT NULL, worker INTEGER)",
+    "CREATE TABLE IF NOT EXISTS rate_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS worker_stats (worker INTEGER PRIMARY KEY, stats TEXT NOT NULL, updated_at REAL NOT NULL)",
+)
+
+
+class SharedState:
+    """Dedup, rate-limit and stats state shared by stream worker processes through SQLite.
+
+    Each process opens its own connection; SQLite's write lock serializes the
+    read-modify-write transactions across processes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = open_sqlite(path)
+        self._lock = threading.Lock()
+        with self._lock:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+
+    def _txn(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(self, mint: str, window_seconds: float, worker: Optional[int] = None) -> bool:
+        """Atomically claim ``mint`` for analysis. False if another claim is still inside the window."""
+        now = time.time()
+
+        def fn(conn):
+            row = conn.execute("SELECT claimed_at FROM seen_mints WHERE mint = ?", (mint,)).fetchone()
+            if row is not None and now - row["claimed_at"] < window_seconds:
+                return False
+            conn.execute("INSERT OR REPLACE INTO seen_mints (mint, claimed_at, worker) VALUES (?, ?, ?)", (mint, now, worker))
+            return True
+
+        return self._txn(fn)
+
+    def release(self, mint: str) -> None:
+        """Drop the claim on ``mint`` so it can be analyzed again (e.g. after its worker was killed mid-analysis)."""
+        self._txn(lambda conn: conn.execute("DELETE FROM seen_mints WHERE mint = ?", (mint,)))
+
+    def take_token(self, key: str, rate: float, burst: float) -> float:
+        """Token-bucket acquire. Returns 0 when a token was taken, otherwise the seconds to wait."""
+        now = time.time()
+
+        def fn(conn):
+            row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row["tokens"] + (now - row["updated_at"]) * rate)
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / rate
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?)", (key, tokens, now))
+            return wait
+
+        return self._txn(fn)
+
+    def prune(self, older_than_seconds: float) -> None:
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM seen_mints WHERE claimed_at < ?", (cutoff,))
+
+    def put_worker_stats(self, worker: int, stats: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO worker_stats (worker, stats, updated_at) VALUES (?, ?, ?)",
+                (worker, json.dumps(stats), time.time()),
+            )
+
+    def get_worker_stats(self, worker: int) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT stats FROM worker_stats WHERE worker = ?", (worker,)).fetchone()
+        return json.loads(row["stats"]) if row else {}
+
+    def all_worker_stats(self) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT worker, stats FROM worker_stats ORDER BY worker").fetchall()
+        return {row["worker"]: json.loads(row["stats"]) for row in rows}
+
+    def aggregate_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT worker, stats FROM worker_stats ORDER BY worker").fetchall()
+        totals: Dict[str, Any] = {"workers": len(rows)}
+        for row in rows:
+            for k, v in json.loads(row["stats"]).items():
+                if isinstance(v, (int, float)):
+                    totals[k] = totals.get(k, 0) + v
+        return totals
+
+    def reset_worker_stats(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM worker_stats")
+
+
+class SharedRateLimiter:
+    """Per-host token buckets kept in :class:`SharedState` so limits hold across all workers."""
+
+    def __init__(self, state: SharedState, limits: Dict[str, Dict[str, float]]) -> None:
+        self.state = state
+        self.limits = limits
+        # Seconds this process has slept waiting for tokens; read as provider pressure
+        self.waited = 0.0
+
+    def acquire(self, host: str) -> None:
+        limit = self.limits.get(host)
+        if not limit:
+            return
+        rate = float(limit.get("rate", 1.0))
+        burst = float(limit.get("burst", rate))
+        while True:
+            wait = self.state.take_token(host, rate, burst)
+            if wait <= 0:
+                return
+            self.waited += wait
+            time.sleep(wait)
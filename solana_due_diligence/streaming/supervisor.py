@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+import queue as queue_mod
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from solana_due_diligence.analysis import analyze_once
+from solana_due_diligence.config import load_config, validate_config
+from solana_due_diligence.log import setup_logging
+from solana_due_diligence.market.watch import WatchEngine, should_watch
+from solana_due_diligence.profiling import enable_profiling
+from solana_due_diligence.providers import http
+from solana_due_diligence.streaming.controller import StreamController
+from solana_due_diligence.streaming.delay_queue import open_delay_queue
+from solana_due_diligence.streaming.hashring import HashRing
+from solana_due_diligence.streaming.memory import MemoryMonitor, register_shedder
+from solana_due_diligence.streaming.shared_state import SharedRateLimiter, SharedState
+from solana_due_diligence.streaming.tiers import TierSelector
+
+
+log = logging.getLogger(__name__)
+
+
+def _worker_main(worker_id: int, config_path: str, queue: Any, state_path: str, memory_profile: bool = False,
+                 profile: Optional[float] = None, num_workers: int = 1) -> None:
+    # The supervisor owns shutdown; workers exit on the None sentinel
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    reload_requested = threading.Event()
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_requested.set())
+    config = load_config(config_path)
+    if profile is not None:
+        enable_profiling(config, threshold_ms=profile)
+    setup_logging(config)
+    state = SharedState(state_path)
+    limits = config.get("ratelimits") or {}
+    limiter = SharedRateLimiter(state, limits) if limits else None
+    if limiter is not None:
+        http.set_rate_limiter(limiter)
+    # Each worker steps its own analysis tier from its queue backlog and rate-limit waits
+    tiers = TierSelector(config, limiter=limiter)
+    window = float(config.get("pipeline", {}).get("dedupe_window_seconds", 3600))
+    if memory_profile:
+        base = Path(config.get("memory", {}).get("status_path", "state/memory.json"))
+        register_shedder("http_sessions", http.close_sessions)
+        MemoryMonitor(config, status_path=str(base.with_name(f"{base.stem}.worker{worker_id}{base.suffix}"))).start()
+
+    # Each worker watches the mints of its own shard with its share of the request budget
+    watch = None
+    if config.get("watch", {}).get("enabled"):
+        watch = WatchEngine(config, share=1.0 / max(1, num_workers))
+        watch.start()
+    delay = open_delay_queue(config)
+
+    stats: Dict[str, Any] = {"analyzed": 0, "passed": 0, "deferred": 0, "errors": 0, "duplicates": 0, "busy_seconds": 0.0}
+    stats.update(state.get_worker_stats(worker_id))
+    # [mint, started_at] while analyzing, for the control socket's stats
+    stats["inflight"] = None
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        # (mint, attempt, launched_at); launched_at is None for re-checks
+        mint, attempt, launched_at = (tuple(item) + (None,))[:3]
+        if reload_requested.is_set():
+            # The supervisor validated this file before signalling us
+            reload_requested.clear()
+            try:
+                new_config = load_config(config_path)
+                validate_config(new_config)
+                if profile is not None:
+                    enable_profiling(new_config, threshold_ms=profile)
+                if config.get("logging") != new_config.get("logging"):
+                    setup_logging(new_config)
+                config = new_config
+                window = float(config.get("pipeline", {}).get("dedupe_window_seconds", 3600))
+                tiers = TierSelector(config, limiter=limiter)
+            except Exception as e:
+                log.error("Config reload failed, keeping current config: %s", e, extra={"worker": worker_id})
+        # Re-checks were deduped by the delay queue and must not hit the claim window
+        if attempt == 0 and not state.claim(mint, window, worker_id):
+            stats["duplicates"] += 1
+            state.put_worker_stats(worker_id, stats)
+            continue
+        t0 = time.perf_counter()
+        stats["tier"] = tiers.observe(backlog=_backlog(queue), lag=time.time() - launched_at if launched_at else 0.0)
+        stats["inflight"] = [mint, time.time(), attempt]
+        state.put_worker_stats(worker_id, stats)
+        try:
+            report_data = analyze_once(config, mint, symbol_for_filename=mint, notify=True, tier=stats["tier"])
+            stats["analyzed"] += 1
+            if (report_data.get("signal") or {}).get("passed"):
+                stats["passed"] += 1
+            if watch is not None and should_watch(config, report_data):
+                watch.add(mint)
+            if delay is not None and delay.settle(mint, attempt, report_data) is not None:
+                stats["deferred"] += 1
+        except Exception as e:
+            stats["errors"] += 1
+            log.error("Error analyzing: %s", e, extra={"mint": mint, "worker": worker_id}, exc_info=True)
+            if delay is not None and attempt:
+                delay.defer(mint, attempt + 1, ["analysis error"])
+        stats["busy_seconds"] = round(stats["busy_seconds"] + time.perf_counter() - t0, 3)
+        stats["inflight"] = None
+        state.put_worker_stats(worker_id, stats)
+
+
+def _backlog(queue: Any) -> int:
+    try:
+        return queue.qsize()
+    except NotImplementedError:
+        return 0
+
+
+class StreamSupervisor(StreamController):
+    """Runs the Bitquery stream in this process and shards mints over N analysis worker processes.
+
+    Mints are assigned with a consistent hash ring so repeat events for a mint
+    land on the same worker. Dedup claims, provider rate limits and worker
+    stats live in a SQLite file shared by all processes.
+    """
+
+    def __init__(self, config_path: str = "config.yaml", workers: int = 2, memory_profile: bool = False,
+                 profile: Optional[float] = None):
+        super().__init__(config_path, memory_profile=memory_profile, profile=profile)
+        self.config_path = config_path
+        self.num_workers = max(1, workers)
+        scfg = self.config.get("stream", {})
+        self.state_path = scfg.get("state_path", "state/stream.db")
+        self.stats_interval = float(scfg.get("stats_interval_seconds", 60))
+        self.state = SharedState(self.state_path)
+        self.ring = HashRing(range(self.num_workers))
+        self.queues = [mp.Queue() for _ in range(self.num_workers)]
+        # Held by _dispatch's put and by _replace_queue's swap, so no mint lands on a retired queue
+        self._queues_lock = threading.Lock()
+        self.procs: Dict[int, mp.Process] = {}
+        self.restarts = 0
+        # Mints already re-queued after a worker crash; a second crash on one drops it
+        self._crash_requeued: set = set()
+        self._monitor_thread: threading.Thread | None = None
+
+    def _spawn(self, worker_id: int) -> None:
+        proc = mp.Process(
+            target=_worker_main,
+            args=(worker_id, self.config_path, self.queues[worker_id], self.state_path, self.memory_profile, self.profile,
+                  self.num_workers),
+            name=f"dd-worker-{worker_id}",
+            daemon=True,
+        )
+        proc.start()
+        self.procs[worker_id] = proc
+
+    def _replace_queue(self, worker_id: int) -> None:
+        # A worker killed inside queue.get() can leave the queue's read lock held;
+        # move whatever is still readable onto a fresh queue for the replacement.
+        with self._queues_lock:
+            old, fresh = self.queues[worker_id], mp.Queue()
+            while True:
+                try:
+                    fresh.put(old.get_nowait())
+                except Exception:
+                    break
+            self.queues[worker_id] = fresh
+
+    def _take_inflight(self, worker_id: int) -> Optional[Tuple[str, int]]:
+        """(mint, attempt) a dead worker was analyzing, with its dedupe claim released."""
+        current = self.state.get_worker_stats(worker_id).get("inflight")
+        if not current:
+            return None
+        self.state.release(current[0])
+        return current[0], int(current[2]) if len(current) > 2 else 0
+
+    def _restart(self, worker_id: int) -> None:
+        self.restarts += 1
+        self._replace_queue(worker_id)
+        item = self._take_inflight(worker_id)
+        if item is not None:
+            if item[0] in self._crash_requeued:
+                log.error("Dropping mint after a second worker crash", extra={"mint": item[0], "worker": worker_id})
+            else:
+                self._crash_requeued.add(item[0])
+                with self._queues_lock:
+                    self.queues[worker_id].put((item[0], item[1], None))
+        self._spawn(worker_id)
+
+    def _monitor(self) -> None:
+        last_stats = time.monotonic()
+        while self.running:
+            for worker_id, proc in list(self.procs.items()):
+                if not proc.is_alive() and self.running:
+                    log.error("Worker %d exited (%s); restarting", worker_id, proc.exitcode, extra={"worker": worker_id})
+                    self._restart(worker_id)
+            if time.monotonic() - last_stats >= self.stats_interval:
+                last_stats = time.monotonic()
+                self._print_stats()
+            time.sleep(1)
+
+    def _print_stats(self) -> None:
+        totals = self.state.aggregate_stats()
+        totals["restarts"] = self.restarts
+        log.info("Worker stats", extra=totals)
+        self._print_ingest_stats()
+
+    def _apply_config(self, new_config: Dict[str, Any]):
+        super()._apply_config(new_config)
+        for proc in self.procs.values():
+            if proc.is_alive() and proc.pid and hasattr(signal, "SIGHUP"):
+                os.kill(proc.pid, signal.SIGHUP)
+
+    def _on_start(self):
+        self.state.reset_worker_stats()
+        self.state.prune(float(self.config.get("pipeline", {}).get("dedupe_window_seconds", 3600)))
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+        self._monitor_thread = threading.Thread(target=self._monitor, name="dd-supervisor", daemon=True)
+        self._monitor_thread.start()
+        log.info("Started %d analysis workers", self.num_workers)
+
+    def _dispatch(self, mint: str, attempt: int = 0):
+        # Workers add their own queueing delay to the launch lag seen here
+        launched_at = None if attempt else time.time() - self._lag
+        with self._queues_lock:
+            self.queues[self.ring.node_for(mint)].put((mint, attempt, launched_at))
+
+    def _queue_depth(self) -> int:
+        # macOS has no sem_getvalue; a drain then waits on in-flight work only
+        return sum(_backlog(q) for q in self.queues)
+
+    def _inflight(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        out = []
+        for worker_id, stats in self.state.all_worker_stats().items():
+            current = stats.get("inflight")
+            if current:
+                out.append({"mint": current[0], "seconds": round(now - current[1], 1), "worker": worker_id})
+        return out
+
+    def _inflight_count(self) -> int:
+        return len(self._inflight())
+
+    def _control_stats(self) -> Dict[str, Any]:
+        out = super()._control_stats()
+        # Workers count their own analyses; the last-minute rate is only known in-process
+        out.pop("per_minute", None)
+        # Tiers are picked per worker
+        out.pop("tier", None)
+        out.pop("tier_switches", None)
+        totals = self.state.aggregate_stats()
+        totals["restarts"] = self.restarts
+        out["analyzed"], out["errors"] = totals.get("analyzed", 0), totals.get("errors", 0)
+        out["workers"] = totals
+        out["worker_tiers"] = {f"worker {w}": s.get("tier") for w, s in self.state.all_worker_stats().items()}
+        out["avg_per_minute"] = round(out["analyzed"] * 60 / max(out["uptime_seconds"], 1.0), 2)
+        return out
+
+    def _on_stop(self):
+        for q in self.queues:
+            q.put(None)
+        deadline = time.monotonic() + 30
+        killed = []
+        for worker_id, proc in self.procs.items():
+            proc.join(timeout=max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.terminate()
+                killed.append(worker_id)
+        # A terminated worker's in-flight mint and whatever it did not get to are kept for the next start
+        for worker_id in killed:
+            item = self._take_inflight(worker_id)
+            if item is not None:
+                self.held.append(item)
+        for q in self.queues:
+            while True:
+                try:
+                    item = q.get_nowait()
+                except (queue_mod.Empty, OSError, ValueError):
+                    break
+                if item is not None:
+                    self.held.append(tuple(item[:2]))
+        self._print_stats()
+
+
+def create_controller(config_path: str, action: str, workers: int | None = None,
+                      memory_profile: bool = False, profile: Optional[float] = None) -> StreamController:
+    """Supervisor for multi-worker ``start``, plain controller otherwise."""
+    workers = workers or int(load_config(config_path).get("stream", {}).get("workers", 1))
+    if action == "start" and workers > 1:
+        return StreamSupervisor(config_path, workers=workers, memory_profile=memory_profile, profile=profile)
+    return StreamController(config_path, memory_profile=memory_profile, profile=profile)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from solana_due_diligence.providers.rpc_pool import get_rpc_pool
+
+
+log = logging.getLogger(__name__)
+
+# Lightest first
+TIERS = ("minimal", "standard", "deep")
+
+
+def launch_lag(block_time: Optional[str], now: Optional[float] = None) -> float:
+    """Seconds since a launch's block time (Bitquery ISO timestamp); 0 when unknown."""
+    if not block_time:
+        return 0.0
+    try:
+        ts = datetime.fromisoformat(block_time.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+    return max(0.0, (now if now is not None else time.time()) - ts)
+
+
+class TierSelector:
+    """Steps the analysis tier down under load and back up once the stream has caught up.
+
+    Load is the analysis backlog (queued mints), the lag behind launch time
+    and provider pressure: the share of time spent waiting on rate limits, or
+    of RPC endpoints cooling down. Stream workers see their queue as backlog;
+    a single-process stream analyzes inline, so its backlog is only mints
+    held while paused and falling behind registers as launch lag instead.
+    Crossing a ``standard_*`` or ``minimal_*`` threshold switches at once;
+    going back up happens one tier at a time after ``recover_seconds`` below
+    every threshold of the heavier tier.
+    """
+
+    def __init__(self, config: Dict[str, Any], limiter: Optional[Any] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        tcfg = (config.get("stream") or {}).get("tiers") or {}
+        self.auto = bool(tcfg.get("auto", True))
+        self.ceiling = (config.get("pipeline") or {}).get("tier", "deep")
+        self.limits = {
+            "standard": (float(tcfg.get("standard_backlog", 10)), float(tcfg.get("standard_lag_seconds", 60)),
+                         float(tcfg.get("standard_pressure", 0.5))),
+            "minimal": (float(tcfg.get("minimal_backlog", 50)), float(tcfg.get("minimal_lag_seconds", 300)),
+                        float(tcfg.get("minimal_pressure", 0.9))),
+        }
+        self.recover_seconds = float(tcfg.get("recover_seconds", 30))
+        self.config = config
+        self.limiter = limiter
+        self.clock = clock
+        self.tier = self.ceiling
+        self.switches = 0
+        self._calm_since: Optional[float] = None
+        self._waited = (clock(), float(getattr(limiter, "waited", 0.0)))
+
+    def pressure(self) -> float:
+        """0..1: share of time since the last call spent waiting on rate limits, or share of RPC endpoints cooling down."""
+        now = self.clock()
+        share = 0.0
+        if self.limiter is not None:
+            waited = float(getattr(self.limiter, "waited", 0.0))
+            last_at, last_waited = self._waited
+            if now > last_at:
+                share = min(1.0, (waited - last_waited) / (now - last_at))
+            self._waited = (now, waited)
+        pool = get_rpc_pool(self.config)
+        if pool is not None:
+            endpoints = pool.snapshot()
+            if endpoints:
+                share = max(share, sum(1 for e in endpoints if e["cooling_down"]) / len(endpoints))
+        return share
+
+    def _target(self, backlog: float, lag: float, pressure: float) -> str:
+        for tier in ("minimal", "standard"):
+            max_backlog, max_lag, max_pressure = self.limits[tier]
+            if backlog >= max_backlog or lag >= max_lag or pressure >= max_pressure:
+                return tier
+        return "deep"
+
+    def observe(self, backlog: float = 0, lag: float = 0.0, pressure: Optional[float] = None) -> str:
+        """Tier for the next analysis given the current load."""
+        if not self.auto or self.ceiling not in TIERS:
+            return self.ceiling
+        pressure = self.pressure() if pressure is None else pressure
+        target = self._target(backlog, lag, pressure)
+        if TIERS.index(target) > TIERS.index(self.ceiling):
+            target = self.ceiling
+        current = TIERS.index(self.tier)
+        now = self.clock()
+        if TIERS.index(target) < current:
+            self._switch(target, backlog, lag, pressure)
+            self._calm_since = None
+        elif TIERS.index(target) > current:
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= self.recover_seconds:
+                self._switch(TIERS[current + 1], backlog, lag, pressure)
+                self._calm_since = now
+        else:
+            self._calm_since = None
+        return self.tier
+
+    def _switch(self, tier: str, backlog: float, lag: float, pressure: float) -> None:
+        level = logging.WARNING if TIERS.index(tier) < TIERS.index(self.tier) else logging.INFO
+        log.log(level, "Analysis tier %s -> %s", self.tier, tier,
+                extra={"backlog": backlog, "lag_seconds": round(lag, 1), "pressure": round(pressure, 2)})
+        self.tier = tier
+        self.switches += 1
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+from solana_due_diligence.providers.rpc_pool import get_rpc_pool
 from solana_due_diligence.providers.solana_rpc import SolanaRPC, SolanaRPCError
 from solana_due_diligence.providers.solscan import SolscanClient
 
@@ -14,6 +15,7 @@ class TokenomicsAnalyzer:
             rpc_url=s.get("rpc_url"),
             commitment=s.get("commitment", "confirmed"),
             timeout_seconds=s.get("timeout_seconds", 20),
+            pool=get_rpc_pool(config),
         )
         scfg = config.get("solscan", {})
         self.solscan_enabled: bool = bool(scfg.get("enabled", False))
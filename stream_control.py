@@ -3,7 +3,7 @@
 Stream Control Wrapper Script
 
 This script provides easy management of the live token streaming system.
-It wraps the StreamController with simple start/stop/status commands.
+It wraps the StreamController with simple start/stop/status/pause/resume commands.
 """
 
 import sys
@@ -12,25 +12,35 @@ from pathlib import Path
 # Add the current directory to Python path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent))
 
-from solana_due_diligence.streaming.controller import StreamController
+from solana_due_diligence.streaming.supervisor import create_controller
 
 
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Stream Control - Manage live token streaming")
-    parser.add_argument("action", choices=["start", "stop", "status"], help="Action to perform")
+    parser.add_argument("action", choices=["start", "stop", "status", "pause", "resume"], help="Action to perform")
     parser.add_argument("--config", default="config.yaml", help="Config file path")
+    parser.add_argument("--workers", type=int, default=None, help="Analysis worker processes (default: stream.workers)")
+    parser.add_argument("--force", action="store_true", help="stop: SIGTERM right away instead of draining in-flight work")
+    parser.add_argument("--profile", nargs="?", type=float, const=-1.0, default=None, metavar="THRESHOLD_MS",
+                        help="Profile each token; keep profiles of tokens slower than THRESHOLD_MS (default: profiling.threshold_ms)")
+    parser.add_argument("--memory-profile", action="store_true", help="Sample RSS/GC/tracemalloc and shed caches above memory.soft_limit_mb")
     
     args = parser.parse_args()
-    controller = StreamController(args.config)
+    controller = create_controller(args.config, args.action, workers=args.workers, memory_profile=args.memory_profile,
+                                   profile=args.profile)
     
     if args.action == "start":
         controller.start()
     elif args.action == "stop":
-        controller.stop()
+        controller.stop(force=args.force)
     elif args.action == "status":
         controller.status()
+    elif args.action == "pause":
+        controller.pause()
+    elif args.action == "resume":
+        controller.resume()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import json
+import timeit
+from pathlib import Path
+
+import pytest
+
+
+BASELINES = Path(__file__).with_name("baselines.json")
+# Each timing repeat runs the benchmark for at least this long
+MIN_REPEAT_SECONDS = 0.05
+REPEATS = 5
+
+
+def _reference_workload():
+    # Fixed mix of the work the hot paths do (sorting, dict building, string formatting)
+    values = [(i * 7919) % 10007 for i in range(1000)]
+    table = {f"k{v}": v for v in sorted(values)}
+    return sum(len(f"- {k}: {v}") for k, v in table.items())
+
+
+def _best_seconds(fn):
+    """Fastest per-call time over REPEATS runs of timeit (GC off, loops sized by autorange)."""
+    timer = timeit.Timer(fn)
+    loops, elapsed = timer.autorange()
+    if elapsed < MIN_REPEAT_SECONDS:
+        loops = max(loops, int(loops * MIN_REPEAT_SECONDS / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=REPEATS, number=loops)) / loops
+
+
+class Bench:
+    """Times hot paths in units of a reference workload and checks them against ``baselines.json``.
+
+    Baselines are stored relative to ``_reference_workload``, timed right
+    before and after each benchmark, so they carry over between machines of
+    different speed and absorb frequency scaling; ``--benchmark-update``
+    rewrites them.
+    """
+
+    def __init__(self, update: bool, tolerance: float) -> None:
+        self.update = update
+        self.tolerance = tolerance
+        self.baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+        self.unit = _best_seconds(_reference_workload)
+        self.results = {}
+
+    def __call__(self, name, fn, *args, **kwargs):
+        before = _best_seconds(_reference_workload)
+        seconds = _best_seconds(lambda: fn(*args, **kwargs))
+        self.unit = min(before, _best_seconds(_reference_workload))
+        relative = seconds / self.unit
+        baseline = self.baselines.get(name)
+        self.results[name] = (relative, baseline)
+        if self.update:
+            return
+        if baseline is None:
+            pytest.fail(f"no baseline for {name}; record one with --benchmark-update")
+        limit = baseline * (1 + self.tolerance)
+        assert relative <= limit, (
+            f"{name} regressed: {relative:.4g} units vs baseline {baseline:.4g} (limit {limit:.4g})"
+        )
+
+    def save(self) -> None:
+        merged = {**self.baselines, **{name: float(f"{rel:.4g}") for name, (rel, _) in self.results.items()}}
+        BASELINES.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def bench(pytestconfig):
+    runner = Bench(pytestconfig.getoption("--benchmark-update"), pytestconfig.getoption("--benchmark-tolerance"))
+    pytestconfig.stash[_runner_key] = runner
+    yield runner
+    if runner.update:
+        runner.save()
+
+
+_runner_key = pytest.StashKey[Bench]()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    runner = config.stash.get(_runner_key, None)
+    if runner is None or not runner.results:
+        return
+    terminalreporter.section("benchmarks (reference workload units)")
+    terminalreporter.write_line(f"reference workload: {runner.unit * 1e6:.1f} us")
+    for name, (relative, baseline) in sorted(runner.results.items()):
+        change = f"{(relative / baseline - 1) * 100:+.0f}%" if baseline else "new"
+        terminalreporter.write_line(f"{name:<32} {relative:>10.4g}  baseline {baseline or 0:>10.4g}  {change}")
@@ -0,0 +1,116 @@
+"""Deterministic provider-shaped payloads sized like busy tokens."""
+import random
+from pathlib import Path
+
+import yaml
+
+
+ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+DEXES = ("raydium", "pumpswap", "meteora", "orca", "pumpfun")
+
+
+def address(rng):
+    return "".join(rng.choice(ALPHABET) for _ in range(44))
+
+
+def dexscreener_pairs(rng, mint, count=300):
+    """Pairs as returned by the Dexscreener tokens endpoint, info blobs included."""
+    pairs = []
+    for _ in range(count):
+        liquidity = round(rng.lognormvariate(8, 2), 2)
+        pairs.append({
+            "chainId": "solana",
+            "dexId": rng.choice(DEXES),
+            "url": f"https://dexscreener.com/solana/{address(rng).lower()}",
+            "pairAddress": address(rng),
+            "labels": ["v4"] if rng.random() < 0.3 else [],
+            "baseToken": {"address": mint, "name": "Dog Wif Benchmark", "symbol": "DWB"},
+            "quoteToken": {"address": "So11111111111111111111111111111111111111112", "name": "Wrapped SOL", "symbol": "SOL"},
+            "priceNative": f"{rng.random() / 1e5:.10f}",
+            "priceUsd": f"{rng.random() / 1e3:.8f}",
+            "txns": {w: {"buys": rng.randint(0, 5000), "sells": rng.randint(0, 5000)} for w in ("m5", "h1", "h6", "h24")},
+            "volume": {w: round(rng.random() * 1e6, 2) for w in ("m5", "h1", "h6", "h24")},
+            "priceChange": {w: round(rng.uniform(-90, 400), 2) for w in ("m5", "h1", "h6", "h24")},
+            "liquidity": {"usd": liquidity, "base": round(liquidity * 1e3, 2), "quote": round(liquidity / 150, 4)},
+            "fdv": round(rng.random() * 1e7, 2),
+            "marketCap": round(rng.random() * 1e7, 2),
+            "pairCreatedAt": 1700000000000 + rng.randint(0, 10**9),
+            "info": {
+                "imageUrl": f"https://dd.dexscreener.com/ds-data/tokens/solana/{mint}.png",
+                "websites": [{"label": "Website", "url": "https://example.com"}],
+                "socials": [{"type": "twitter", "url": "https://x.com/example"}, {"type": "telegram", "url": "https://t.me/example"}],
+            },
+        })
+    return pairs
+
+
+def holders(rng, count=10_000):
+    """Holder entries with string amounts, Moralis/Solscan style, heavy-tailed like a real distribution."""
+    return [{"owner": address(rng), "amount": str(int(rng.paretovariate(1.2) * 1e6)), "decimals": 6, "rank": i + 1}
+            for i in range(count)]
+
+
+def github_items(rng, queries=4, per_query=30):
+    """Search results per query; queries overlap, so the same repos come back more than once."""
+    pool = [{
+        "full_name": f"{address(rng)[:8]}/{address(rng)[:12]}",
+        "html_url": "https://github.com/example/repo",
+        "stargazers_count": rng.randint(0, 5000),
+        "size": rng.randint(0, 200_000),
+        "updated_at": "2024-05-01T12:00:00Z" if rng.random() < 0.8 else None,
+        "language": rng.choice(("Rust", "TypeScript", "JavaScript", "Python", None)),
+    } for _ in range(queries * per_query // 2)]
+    return {f"q{i}": rng.sample(pool, per_query) for i in range(queries)}
+
+
+def raw_report(rng, mint="BenchMint1111111111111111111111111111111111"):
+    """Stage outputs as ``analyze_once`` assembles them before the report model trims them."""
+    pairs = dexscreener_pairs(rng, mint)
+    best = max(pairs, key=lambda p: p["liquidity"]["usd"])
+    holder_list = holders(rng)
+    creator = address(rng)
+    return {
+        "input": {"token": mint},
+        "gates": {"passed": True, "reasons": []},
+        "tier": "deep",
+        "tokenomics": {
+            "mint": mint,
+            "supply": {"amount": "1000000000000000", "decimals": 6, "ui_amount": "1000000000"},
+            "top_holders_sample": [{"address": h["owner"], "amount": h["amount"], "uiAmount": int(h["amount"]) / 1e6}
+                                   for h in holder_list[:20]],
+            "solscan": {
+                "meta": {"tokenSymbol": "DWB", "tokenName": "Dog Wif Benchmark", "creator": creator, "icon": "x" * 2000},
+                "holder_count": len(holder_list),
+                "holders_sample": holder_list[:100],
+            },
+        },
+        "market": {"pairs_found": len(pairs), "best_pair": best, "pairs": pairs},
+        "security": {
+            "authorities": {"mint_authority": None, "freeze_authority": None, "mint_revoked": True, "freeze_revoked": True},
+            "lp": {"dex": best["dexId"], "liquidity_usd": best["liquidity"]["usd"], "pair_created_at": best["pairCreatedAt"]},
+            "notes": ["Mint authority appears revoked (null)", "Freeze authority appears revoked (null)"],
+        },
+        "community": {"x": {"query": "$DWB", "posts": 100, "engagement": {"likes": 5400, "retweets": 800, "quotes": 70, "replies": 900}}},
+        "developer": {"creator": creator, "creator_stats": {"launch_count": 12, "rug_count": 3}, "history_source": "solscan",
+                      "history_sample": [{"mint": address(rng), "amount": rng.randint(1, 10**9)} for _ in range(50)],
+                      "risk_flags": ["serial_deployer"]},
+        "github": {"repos": [{"full_name": f"org/repo{i}", "html_url": "https://github.com/org/repo", "stargazers": i * 10,
+                              "language": "Rust", "updated_at": "2024-05-01T12:00:00Z", "score": 300 - i} for i in range(5)]},
+        "metrics": {
+            "moralis": {"concentration": {"top10": 0.42, "top20": 0.55}},
+            "clusters": {
+                "holders_analyzed": 100, "funders_resolved": 87, "complete": True, "raw_top10": 0.42,
+                "adjusted_top10": 0.51, "largest_cluster_share": 0.12, "creator_cluster_share": 0.03,
+                "clusters": [{"funder": address(rng), "size": rng.randint(2, 20), "share": round(rng.random() / 10, 4),
+                              "creator_linked": i == 0} for i in range(10)],
+            },
+        },
+        "summary": {"headline": "Initial Solana token scan", "notes": [f"Pairs found: {len(pairs)}"]},
+        "signal": {"passed": True, "reasons": []},
+        "profiles": ["desk-a", "desk-b"],
+    }
+
+
+def raw_config():
+    """The shipped config.yaml, unexpanded."""
+    return yaml.safe_load((Path(__file__).resolve().parents[2] / "config.yaml").read_text())
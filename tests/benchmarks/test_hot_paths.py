@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from solana_due_diligence import config as config_module
+from solana_due_diligence.github.analyzer import GitHubAnalyzer
+from solana_due_diligence.market import analyzer as market_module
+from solana_due_diligence.metrics.analyzer import MetricsAnalyzer
+from solana_due_diligence.reporting.models import TokenReport, encode_report
+from solana_due_diligence.reporting.report import ReportBuilder
+from solana_due_diligence.signals.engine import evaluate_buy_signal
+
+from . import payloads
+
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return payloads.raw_report(random.Random(50))
+
+
+@pytest.fixture(scope="module")
+def report_data(raw):
+    # What _write_report hands to_markdown
+    return TokenReport.from_dict(raw).to_dict()
+
+
+def test_report_to_markdown(bench, report_data):
+    """Benchmark markdown rendering of a full deep-tier report"""
+    builder = ReportBuilder({})
+    assert "## Holder Clusters" in builder.to_markdown(report_data)
+    bench("report.to_markdown", builder.to_markdown, report_data)
+
+
+def test_report_summarize(bench, raw):
+    """Benchmark the summary built from raw tokenomics and a 300-pair market result"""
+    builder = ReportBuilder({})
+    bench("report.summarize", builder.summarize, raw["tokenomics"], raw["market"])
+
+
+def test_report_json(bench, raw):
+    """Benchmark trimming raw stage output into the report model and encoding it"""
+    assert b'"pairs":' not in encode_report(TokenReport.from_dict(raw))
+    bench("report.from_dict", TokenReport.from_dict, raw)
+    bench("report.encode_json", encode_report, TokenReport.from_dict(raw))
+
+
+def test_holder_concentration(bench):
+    """Benchmark top-10/top-20 concentration over 10k holders"""
+    holders = payloads.holders(random.Random(10))
+    assert 0 < MetricsAnalyzer._compute_concentration(holders, 6)["top10"] < 1
+    bench("metrics.concentration_10k", MetricsAnalyzer._compute_concentration, holders, 6)
+
+
+def test_buy_signal(bench, report_data):
+    """Benchmark gate and buy-signal evaluation on a full report"""
+    assert evaluate_buy_signal(report_data)["passed"] is True
+    bench("signals.evaluate_buy_signal", evaluate_buy_signal, report_data)
+
+
+def test_expand_env(bench, monkeypatch):
+    """Benchmark ${ENV:-default} expansion of the shipped config"""
+    monkeypatch.setenv("SOLANA_RPC_URL", "https://rpc.example.com")
+    raw_config = payloads.raw_config()
+    assert config_module._expand_env(raw_config)["solana"]["rpc_url"] == "https://rpc.example.com"
+    bench("config.expand_env", config_module._expand_env, raw_config)
+
+
+def test_github_scoring_and_dedup(bench):
+    """Benchmark repo scoring and dedup over four overlapping searches"""
+    results = payloads.github_items(random.Random(4))
+
+    class Client:
+        def search_repos(self, query):
+            return results[query.split()[0]]
+
+    github = GitHubAnalyzer({"github": {"enabled": True}})
+    github.client = Client()
+    tokenomics = {"solscan": {"meta": {k: f"q{i}" for i, k in enumerate(("symbol", "tokenSymbol", "name", "tokenName"))}}}
+    repos = github.analyze(tokenomics)["repos"]
+    assert len(repos) == 5 and len({r["full_name"] for r in repos}) == 5
+    bench("github.score_and_dedup", github.analyze, tokenomics)
+
+
+def test_best_pair_selection(bench, raw, monkeypatch):
+    """Benchmark best-pair selection over a 300-pair Dexscreener response"""
+    monkeypatch.setattr(market_module.dexscreener, "fetch_pairs_for_token", lambda config, mint: raw["market"]["pairs"])
+    market = market_module.MarketAnalyzer({"liquidity": {"enabled": False}})
+    assert market.analyze("BenchMint")["best_pair"] is raw["market"]["best_pair"]
+    bench("market.best_pair_300", market.analyze, "BenchMint")
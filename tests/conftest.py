@@ -48,3 +48,24 @@ def temp_output_dir():
     """Create a temporary output directory for testing"""
     with tempfile.TemporaryDirectory() as temp_dir:
         yield temp_dir
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks", "CPU micro-benchmarks (tests/benchmarks)")
+    group.addoption("--benchmark", action="store_true", help="Run the micro-benchmarks and compare them with the stored baselines")
+    group.addoption("--benchmark-update", action="store_true", help="Run the micro-benchmarks and rewrite their baselines")
+    group.addoption("--benchmark-tolerance", type=float, default=0.5,
+                    help="Allowed slowdown over a baseline before a benchmark fails (0.5 = 50%%)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: CPU micro-benchmark, run with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark") or config.getoption("--benchmark-update"):
+        return
+    skip = pytest.mark.skip(reason="micro-benchmark; run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+from solana_due_diligence import analysis
+
+
+class _Stub:
+    def __init__(self, config):
+        pass
+
+
+@pytest.fixture
+def stub_analyzers(monkeypatch):
+    """Replace provider-backed analyzers with canned results and record which ran"""
+    calls = []
+
+    class Tokenomics(_Stub):
+        def analyze(self, mint):
+            calls.append("tokenomics")
+            return {"mint": mint, "supply": {"decimals": 6}, "solscan": {"meta": {}}}
+
+    class Market(_Stub):
+        def analyze(self, mint):
+            calls.append("market")
+            return {"pairs_found": 1, "best_pair": {"liquidity": {"usd": 200}}}
+
+    def expensive(name):
+        class Expensive(_Stub):
+            def analyze(self, *args, **kwargs):
+                calls.append(name)
+                return {}
+        return Expensive
+
+    monkeypatch.setattr(analysis, "TokenomicsAnalyzer", Tokenomics)
+    monkeypatch.setattr(analysis, "MarketAnalyzer", Market)
+    monkeypatch.setattr(analysis, "CommunityAnalyzer", expensive("community"))
+    monkeypatch.setattr(analysis, "DeveloperAnalyzer", expensive("developer"))
+    monkeypatch.setattr(analysis, "GitHubAnalyzer", expensive("github"))
+    monkeypatch.setattr(analysis, "MetricsAnalyzer", expensive("metrics"))
+    return calls
+
+
+def test_gate_failure_skips_expensive_stages(sample_config, temp_output_dir, stub_analyzers):
+    """Test low liquidity stops the pipeline before community/developer/GitHub/Moralis"""
+    sample_config["report"]["output_dir"] = temp_output_dir
+    report = analysis.analyze_once(sample_config, "MintA", notify=False)
+
+    assert stub_analyzers == ["tokenomics", "market"]
+    assert report["gates"]["passed"] is False
+    assert report["community"] == {"skipped": "gate failed"}
+    with open(os.path.join(temp_output_dir, "MintA.md")) as f:
+        assert "skipped: gate failed" in f.read()
+
+
+def test_blocklisted_mint_makes_no_calls(sample_config, temp_output_dir, stub_analyzers):
+    """Test blocklisted mints are short-circuited before any provider call"""
+    sample_config["report"]["output_dir"] = temp_output_dir
+    sample_config["pipeline"] = {"blocklist": ["MintB"]}
+    report = analysis.analyze_once(sample_config, "MintB", notify=False)
+
+    assert stub_analyzers == []
+    assert report["gates"]["reasons"] == ["Token is blocklisted"]
+    with open(os.path.join(temp_output_dir, "MintB.json")) as f:
+        assert json.load(f)["tokenomics"] == {"skipped": "blocklisted"}
+
+
+def test_matched_profiles_route_to_their_chats(sample_config, temp_output_dir, stub_analyzers, monkeypatch):
+    """Test matching signal profiles are recorded in the report and notify their own chat"""
+    sample_config["report"]["output_dir"] = temp_output_dir
+    sample_config["pipeline"] = {"fail_fast": False}
+    sample_config["telegram"] = {"enabled": True, "bot_token": "t", "chat_id": "default"}
+    sample_config["signals"] = {"profiles": [
+        {"name": "any_pair", "chat_id": "desk-a", "all": ["market.pairs_found >= 1"]},
+        {"name": "deep", "chat_id": "desk-b", "all": ["security.lp.liquidity_usd >= 100000"]},
+        {"name": "also_any", "all": ["market.pairs_found exists"]},
+    ]}
+    sent = []
+    monkeypatch.setattr(analysis, "send_message", lambda token, chat_id, text: sent.append((chat_id, text)) or True)
+    report = analysis.analyze_once(sample_config, "MintA", notify=True)
+
+    assert report["profiles"] == ["any_pair", "also_any"]
+    assert sent == [("desk-a", "Signal profile match for MintA: any_pair"),
+                    ("default", "Signal profile match for MintA: also_any")]
+
+
+def test_tier_limits_expensive_stages(sample_config, temp_output_dir, stub_analyzers):
+    """Test a lighter tier runs only its stages and the report records the tier"""
+    sample_config["report"]["output_dir"] = temp_output_dir
+    sample_config["pipeline"] = {"fail_fast": False}
+    report = analysis.analyze_once(sample_config, "MintD", notify=False, tier="standard")
+
+    assert stub_analyzers == ["tokenomics", "market", "developer", "metrics"]
+    assert report["tier"] == "standard"
+    assert report["community"] == {"skipped": "standard tier"}
+
+    stub_analyzers.clear()
+    report = analysis.analyze_once(sample_config, "MintD", notify=False, tier="minimal")
+    assert stub_analyzers == ["tokenomics", "market"]
+    with open(os.path.join(temp_output_dir, "MintD.json")) as f:
+        assert json.load(f)["tier"] == "minimal"
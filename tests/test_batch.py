@@ -0,0 +1,69 @@
+import json
+import os
+import time
+
+import pytest
+
+from solana_due_diligence.batch import runner as batch_runner
+from solana_due_diligence.batch.runner import BatchRunner, read_mints
+
+
+def test_read_mints_dedupes_and_skips_comments(temp_output_dir):
+    """Test mint files keep order, drop duplicates, blanks and comments"""
+    path = os.path.join(temp_output_dir, "mints.txt")
+    with open(path, "w") as f:
+        f.write("MintA\n\n# header\nMintB  # note\nMintA\n")
+    assert read_mints(path) == ["MintA", "MintB"]
+
+
+def test_batch_resumes_from_checkpoint(sample_config, temp_output_dir, monkeypatch):
+    """Test completed mints are skipped on resume and errored ones are retried"""
+    analyzed = []
+
+    def fake_analyze_once(config, mint, symbol_for_filename=None, notify=True):
+        analyzed.append(mint)
+        if mint == "MintBad" and analyzed.count("MintBad") == 1:
+            raise RuntimeError("provider down")
+        return {"signal": {"passed": mint == "MintA", "reasons": []}, "community": {"skipped": "gate failed"}}
+
+    monkeypatch.setattr(batch_runner, "analyze_once", fake_analyze_once)
+    checkpoint = os.path.join(temp_output_dir, "run.checkpoint.jsonl")
+
+    first = BatchRunner(sample_config, checkpoint, concurrency=2, notify=False).run(["MintA", "MintBad"])
+    assert first["errors"] == 1
+
+    second = BatchRunner(sample_config, checkpoint, concurrency=2, notify=False).run(["MintA", "MintBad", "MintC"])
+    assert second["completed"] == 2
+    assert sorted(analyzed) == ["MintA", "MintBad", "MintBad", "MintC"]
+
+    with open(checkpoint) as f:
+        entries = [json.loads(line) for line in f]
+    done = {e["mint"]: e for e in entries if not e.get("error")}
+    assert set(done) == {"MintA", "MintBad", "MintC"}
+    assert done["MintA"]["stages"]["community"] == "skipped: gate failed"
+
+
+def test_interrupt_leaves_remaining_mints_for_resume(sample_config, temp_output_dir, monkeypatch):
+    """Test Ctrl-C cancels queued mints and the next run picks them up"""
+    analyzed = []
+
+    def fake_analyze_once(config, mint, symbol_for_filename=None, notify=True):
+        analyzed.append(mint)
+        if mint == "MintB" and analyzed.count("MintB") == 1:
+            raise KeyboardInterrupt
+        time.sleep(0.05)  # long enough for the main thread to cancel what is still queued
+        return {"signal": {"passed": False, "reasons": []}}
+
+    monkeypatch.setattr(batch_runner, "analyze_once", fake_analyze_once)
+    checkpoint = os.path.join(temp_output_dir, "run.checkpoint.jsonl")
+    mints = ["MintA", "MintB", "MintC", "MintD", "MintE", "MintF"]
+
+    with pytest.raises(KeyboardInterrupt):
+        BatchRunner(sample_config, checkpoint, concurrency=1, notify=False).run(mints)
+    # Only the mint the worker may already have picked up runs after the interrupt
+    assert analyzed[:2] == ["MintA", "MintB"] and len(analyzed) <= 3
+
+    interrupted = len(analyzed)
+    second = BatchRunner(sample_config, checkpoint, concurrency=1, notify=False).run(mints)
+    assert second["completed"] == len(mints) - interrupted + 1
+    assert sorted(set(analyzed)) == mints
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+import requests
+
+from solana_due_diligence import analysis
+from solana_due_diligence.providers import http
+from solana_due_diligence.providers.cassette import CassetteMiss, CassetteStore, request_key
+
+
+def _response(url, payload, status=200):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = json.dumps(payload).encode()
+    resp.headers["content-type"] = "application/json"
+    resp.url = url
+    return resp
+
+
+def _upstream(calls):
+    def request(self, method, url, **kwargs):
+        calls.append(url)
+        if "dexscreener" in url:
+            return _response(url, {"pairs": [{"dexId": "raydium", "priceUsd": "0.01", "liquidity": {"usd": 25000}}]})
+        if "solana.com" in url:
+            if isinstance(kwargs["json"], list):
+                return _response(url, [{"jsonrpc": "2.0", "id": c["id"], "result": {"value": []}} for c in kwargs["json"]])
+            rpc_method = kwargs["json"]["method"]
+            if rpc_method == "getTokenSupply":
+                return _response(url, {"jsonrpc": "2.0", "result": {"value": {"amount": "1000000000", "decimals": 6, "uiAmount": 1000.0}}})
+            return _response(url, {"jsonrpc": "2.0", "result": {"value": []}})
+        return _response(url, {"message": "not found"}, status=404)
+    return request
+
+
+@pytest.fixture
+def offline_config(sample_config, temp_output_dir):
+    sample_config["report"]["output_dir"] = temp_output_dir
+    sample_config["solscan"]["enabled"] = False
+    sample_config["scrape"] = {"enable_x": False}
+    sample_config["telegram"]["enabled"] = False
+    yield sample_config
+    http.set_cassette(None)
+
+
+def test_replayed_analysis_matches_recording_without_network(offline_config, tmp_path, monkeypatch):
+    """Test analyze_once replays from a cassette with identical results and no upstream calls"""
+    calls = []
+    monkeypatch.setattr(requests.Session, "request", _upstream(calls))
+    store = CassetteStore(str(tmp_path / "run.db"), "record")
+    http.set_cassette(store)
+    recorded = analysis.analyze_once(offline_config, "MintA", notify=False)
+    assert calls and len(store) == len(calls)
+
+    calls.clear()
+    http.set_cassette(CassetteStore(str(tmp_path / "run.db"), "replay"))
+    replayed = analysis.analyze_once(offline_config, "MintA", notify=False)
+    assert calls == []
+    assert replayed == recorded
+    assert replayed["market"]["best_pair"]["liquidity"]["usd"] == 25000
+
+
+def test_replay_miss_raises_and_repeats_last_response(tmp_path):
+    """Test unknown requests fail fast and repeated requests replay in recorded order"""
+    url = "https://api.example/v1/token"
+    store = CassetteStore(str(tmp_path / "run.db"), "record")
+    for n in (1, 2):
+        store.request(lambda n=n: _response(url, {"n": n}), "GET", url, params={"a": "1"})
+
+    replay = CassetteStore(str(tmp_path / "run.db"), "replay")
+    served = [replay.request(None, "GET", url, params={"a": 1}).json()["n"] for _ in range(3)]
+    assert served == [1, 2, 2]
+    with pytest.raises(CassetteMiss):
+        replay.request(None, "GET", url, params={"a": "2"})
+
+
+def test_request_key_ignores_jsonrpc_id():
+    """Test JSON-RPC calls differing only in id share a key"""
+    a = request_key("POST", "https://rpc.example/?api-key=x", json_body={"jsonrpc": "2.0", "id": 1, "method": "getSlot"})
+    b = request_key("post", "https://rpc.example/?api-key=x", json_body={"jsonrpc": "2.0", "id": 2, "method": "getSlot"})
+    assert a == b
+    assert "api-key" not in a
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from solana_due_diligence.metrics.clusters import FundingCache, HolderClusterAnalyzer, UnionFind, funder_from_transaction
+
+
+def _tx(wallet, funder, slot=100):
+    return {
+        "slot": slot,
+        "transaction": {"message": {
+            "accountKeys": [{"pubkey": "FeePayer"}],
+            "instructions": [{"program": "system", "parsed": {"type": "transfer", "info": {"source": funder, "destination": wallet}}}],
+        }},
+        "meta": {"innerInstructions": []},
+    }
+
+
+class FakeRPC:
+    """Answers batched getSignaturesForAddress/getTransaction from a wallet -> funder map"""
+
+    def __init__(self, funders, delay=0.0):
+        self.funders = funders
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def batch(self, calls):
+        with self.lock:
+            self.batches.append([m for m, _ in calls])
+        time.sleep(self.delay)
+        out = []
+        for method, params in calls:
+            if method == "getSignaturesForAddress":
+                out.append([{"signature": f"newer-{params[0]}"}, {"signature": f"first-{params[0]}"}])
+            else:
+                wallet = params[0].removeprefix("first-")
+                out.append(_tx(wallet, self.funders[wallet]))
+        return out
+
+
+def _holders():
+    holders = [{"owner": f"Bundled{i}", "amount": 30} for i in range(20)]
+    holders += [{"owner": f"Relay{i}", "amount": 20} for i in range(10)]
+    holders += [{"owner": f"Retail{i}", "amount": 1} for i in range(90)]
+    funders = {f"Bundled{i}": "Creator" for i in range(20)}
+    funders.update({f"Relay{i}": "Relayer" for i in range(10)})
+    funders.update({f"Retail{i}": f"Exchange{i % 45}" for i in range(90)})
+    return holders, funders
+
+
+def test_union_find_merges_transitively():
+    """Test unions are transitive and sets stay separate otherwise"""
+    uf = UnionFind()
+    uf.union("a", "b")
+    uf.union("c", "b")
+    uf.add("d")
+    assert uf.find("a") == uf.find("c") != uf.find("d")
+
+
+def test_funder_prefers_system_transfer_over_fee_payer():
+    """Test the SOL transfer source is the funder, with the fee payer as fallback"""
+    assert funder_from_transaction(_tx("W", "Source"), "W") == "Source"
+    no_transfer = {"transaction": {"message": {"accountKeys": ["Payer", "W"], "instructions": []}}}
+    assert funder_from_transaction(no_transfer, "W") == "Payer"
+    assert funder_from_transaction(None, "W") is None
+
+
+def test_clusters_adjust_concentration_and_reuse_cached_edges(tmp_path):
+    """Test 120 holders are clustered by funder, creator links follow cached hops, and a rerun is cache-only"""
+    holders, funders = _holders()
+    cache = FundingCache(str(tmp_path / "funding.db"))
+    # Seen on an earlier token: the relayer was itself funded by the creator
+    cache.put_many([("Relayer", "Creator", 90, "sig")])
+    config = {"clusters": {"max_holders": 150, "batch_size": 25}}
+    rpc = FakeRPC(funders)
+    result = HolderClusterAnalyzer(config, rpc=rpc, cache=cache).analyze(holders, creator="Creator")
+
+    assert result["holders_analyzed"] == 120 and result["complete"] is True
+    assert len(rpc.batches) == 10  # 5 signature batches + 5 transaction batches
+    top = result["clusters"][0]
+    assert top["size"] == 30 and top["creator_linked"] is True
+    assert top["share"] == result["creator_cluster_share"] == round(800 / 890, 4)
+    assert result["adjusted_top10"] > result["raw_top10"]
+
+    rerun = FakeRPC(funders)
+    again = HolderClusterAnalyzer(config, rpc=rerun, cache=cache).analyze(holders, creator="Creator")
+    assert rerun.batches == []
+    assert again["clusters"] == result["clusters"]
+
+
+def test_time_budget_returns_partial_result(tmp_path):
+    """Test a slow RPC is cut off at the time budget and the result is marked incomplete"""
+    holders, funders = _holders()
+    config = {"clusters": {"time_budget_seconds": 0.05, "batch_size": 25, "concurrency": 1}}
+    analyzer = HolderClusterAnalyzer(config, rpc=FakeRPC(funders, delay=0.1), cache=FundingCache(str(tmp_path / "f.db")))
+    t0 = time.monotonic()
+    result = analyzer.analyze(holders, creator="Creator")
+    assert time.monotonic() - t0 < 0.5
+    assert result["complete"] is False
+    assert result["holders_analyzed"] == 100  # capped at clusters.max_holders
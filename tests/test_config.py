@@ -4,7 +4,7 @@ import tempfile
 import yaml
 import os
 
-from solana_due_diligence.config import load_config
+from solana_due_diligence.config import ConfigError, ConfigWatcher, load_config, validate_config
 
 
 def test_load_config_basic(temp_config_file):
@@ -42,3 +42,34 @@ def test_load_config_with_env_vars():
         # Clean up environment variables
         os.environ.pop("TEST_API_KEY", None)
         os.environ.pop("TEST_BOT_TOKEN", None)
+
+
+def test_validate_config_rejects_bad_thresholds(sample_config):
+    """Test invalid thresholds are reported instead of being swapped in"""
+    validate_config(sample_config)
+    sample_config["signals"] = {"thresholds": {"max_top10_concentration": 1.5, "min_liquidity_usd": "lots"}}
+    with pytest.raises(ConfigError) as exc:
+        validate_config(sample_config)
+    assert "max_top10_concentration" in str(exc.value)
+    assert "min_liquidity_usd" in str(exc.value)
+
+
+def test_config_watcher_reloads_valid_changes_only(temp_config_file, sample_config):
+    """Test the watcher hands over validated configs and keeps the old one on errors"""
+    reloaded, errors = [], []
+    watcher = ConfigWatcher(temp_config_file, reloaded.append, on_error=errors.append)
+    assert watcher.check() is False
+
+    sample_config["signals"] = {"thresholds": {"min_liquidity_usd": 2500}}
+    with open(temp_config_file, "w") as f:
+        yaml.dump(sample_config, f)
+    watcher.request_reload()
+    assert watcher.check() is True
+    assert reloaded[-1]["signals"]["thresholds"]["min_liquidity_usd"] == 2500
+
+    sample_config["signals"] = {"thresholds": {"min_liquidity_usd": -1}}
+    with open(temp_config_file, "w") as f:
+        yaml.dump(sample_config, f)
+    watcher.request_reload()
+    assert watcher.check() is False
+    assert len(reloaded) == 1 and errors
@@ -0,0 +1,149 @@
+import signal
+import threading
+import time
+
+import pytest
+import yaml
+
+from solana_due_diligence.streaming import controller as controller_module
+from solana_due_diligence.streaming.control import ControlServer, control_supported, send_command
+from solana_due_diligence.streaming.controller import StreamController
+from solana_due_diligence.streaming.supervisor import StreamSupervisor
+
+
+pytestmark = pytest.mark.skipif(not control_supported(), reason="needs Unix domain sockets")
+
+
+def test_control_socket_round_trip(tmp_path):
+    """Test commands reach the handler and unknown commands are refused"""
+    calls = []
+
+    def handler(cmd, request):
+        calls.append(cmd)
+        return {"cmd": cmd, "queue_depth": 3}
+
+    path = str(tmp_path / "ctl.sock")
+    server = ControlServer(path, handler)
+    server.start()
+    try:
+        assert send_command(path, "stats") == {"ok": True, "cmd": "stats", "queue_depth": 3}
+        reply = send_command(path, "reboot")
+        assert reply["ok"] is False and "unknown command" in reply["error"]
+        assert calls == ["stats"]
+    finally:
+        server.stop()
+    assert not (tmp_path / "ctl.sock").exists()
+    with pytest.raises(OSError):
+        send_command(path, "stats", timeout=1)
+
+
+def _controller(tmp_path, monkeypatch, cls=StreamController, **kwargs):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.yaml").write_text(yaml.safe_dump({"report": {"output_dir": "reports"}, "stream": {"watch_config": False}}))
+    handlers = {s: signal.getsignal(s) for s in (signal.SIGINT, signal.SIGTERM, getattr(signal, "SIGHUP", signal.SIGTERM))}
+    try:
+        return cls("config.yaml", **kwargs)
+    finally:
+        for s, h in handlers.items():
+            signal.signal(s, h)
+
+
+def test_pause_holds_mints_and_stop_keeps_them(tmp_path, monkeypatch):
+    """Test paused mints wait for resume and unfinished ones are reloaded on the next start"""
+    controller = _controller(tmp_path, monkeypatch)
+    dispatched = []
+    monkeypatch.setattr(controller, "_dispatch", lambda mint, attempt=0: dispatched.append((mint, attempt)))
+    monkeypatch.setattr(controller, "_release_held", lambda: [dispatched.append(controller.held.popleft())
+                                                              for _ in range(len(controller.held))])
+
+    assert controller._control("pause", {}) == {"paused": True}
+    controller._handle_mint("MintA")
+    controller._handle_mint("MintB", attempt=2)
+    assert dispatched == [] and len(controller.held) == 2
+    assert controller._control("stats", {})["held"] == 2
+
+    assert controller._control("resume", {}) == {"paused": False, "released": 2}
+    assert dispatched == [("MintA", 0), ("MintB", 2)]
+
+    controller._control("pause", {})
+    controller._handle_mint("MintC")
+    controller.running = True
+    controller._shutdown()
+    assert (tmp_path / "state" / "pending_mints.jsonl").exists()
+
+    dispatched.clear()
+    controller._load_pending()
+    assert dispatched == [("MintC", 0)]
+    assert not (tmp_path / "state" / "pending_mints.jsonl").exists()
+
+
+def test_resumed_mints_do_not_analyze_alongside_the_stream(tmp_path, monkeypatch):
+    """Test mints released on resume wait for the stream's own dispatch instead of running beside it"""
+    controller = _controller(tmp_path, monkeypatch)
+    active, overlap, done = [], [], []
+
+    def fake_analyze_once(config, mint, **kwargs):
+        active.append(mint)
+        overlap.append(len(active))
+        time.sleep(0.02)
+        active.remove(mint)
+        done.append(mint)
+        return {}
+
+    monkeypatch.setattr(controller_module, "analyze_once", fake_analyze_once)
+    controller._control("pause", {})
+    for mint in ("MintA", "MintB", "MintC"):
+        controller._handle_mint(mint)
+    controller._control("resume", {})
+    stream = threading.Thread(target=lambda: [controller._dispatch(m) for m in ("MintD", "MintE")])
+    stream.start()
+    stream.join()
+    deadline = time.monotonic() + 5
+    while len(done) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert sorted(done) == ["MintA", "MintB", "MintC", "MintD", "MintE"]
+    assert max(overlap) == 1 and controller.counters["analyzed"] == 5
+
+
+def test_killed_worker_keeps_its_inflight_mint(tmp_path, monkeypatch):
+    """Test a worker terminated mid-analysis leaves its mint pending and unclaimed"""
+    supervisor = _controller(tmp_path, monkeypatch, cls=StreamSupervisor, workers=2)
+
+    class Stuck:
+        terminated = False
+
+        def join(self, timeout=None):
+            pass
+
+        def is_alive(self):
+            return not self.terminated
+
+        def terminate(self):
+            self.terminated = True
+
+    supervisor.procs = {0: Stuck(), 1: Stuck()}
+    supervisor.state.claim("MintA", 3600, 0)
+    supervisor.state.put_worker_stats(0, {"inflight": ["MintA", 0.0, 2]})
+    supervisor.state.put_worker_stats(1, {"inflight": None})
+    supervisor._on_stop()
+
+    assert list(supervisor.held) == [("MintA", 2)]
+    assert supervisor.state.claim("MintA", 3600, 1)
+
+
+def test_crashed_worker_mint_is_requeued_once(tmp_path, monkeypatch):
+    """Test a restarted worker gets its predecessor's in-flight mint back, but only after the first crash"""
+    supervisor = _controller(tmp_path, monkeypatch, cls=StreamSupervisor, workers=2)
+    spawned = []
+    monkeypatch.setattr(supervisor, "_spawn", spawned.append)
+    supervisor.state.claim("MintA", 3600, 0)
+    supervisor.state.put_worker_stats(0, {"inflight": ["MintA", 0.0, 1]})
+    supervisor._restart(0)
+
+    assert spawned == [0] and supervisor.restarts == 1
+    assert supervisor.queues[0].get(timeout=5) == ("MintA", 1, None)
+    assert supervisor.state.claim("MintA", 3600, 1)
+
+    supervisor._restart(0)
+    assert supervisor.queues[0].empty()
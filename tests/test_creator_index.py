@@ -0,0 +1,78 @@
+import os
+
+from solana_due_diligence.developer.analyzer import DeveloperAnalyzer
+from solana_due_diligence.developer.creator_index import CreatorIndex, classify_creator
+
+
+CREATOR = "Creator1111111111111111111111111111111111111"
+
+
+def test_creator_index_counts_and_outcomes(temp_output_dir):
+    """Test launches are deduplicated and rug outcomes are counted"""
+    index = CreatorIndex(os.path.join(temp_output_dir, "creators.db"))
+    assert index.lookup(CREATOR) is None
+
+    assert index.record_launch(CREATOR, "mintA", seen_at=100.0) is True
+    assert index.record_launch(CREATOR, "mintA", seen_at=200.0) is False
+    index.record_launch(CREATOR, "mintB", seen_at=50.0)
+    index.record_outcome("mintB", "rugged")
+    index.record_outcome("mintB", "rugged")
+
+    stats = index.lookup(CREATOR)
+    assert stats["launch_count"] == 2
+    assert stats["rug_count"] == 1
+    assert stats["first_seen"] == 50.0
+    assert stats["last_seen"] == 200.0
+    assert classify_creator(stats, serial_threshold=2) == ["creator_serial_deployer", "creator_known_rugger"]
+
+
+def test_rugged_outcome_survives_reanalysis(temp_output_dir):
+    """Test a re-analysis verdict does not clear a rug recorded by watch"""
+    index = CreatorIndex(os.path.join(temp_output_dir, "creators.db"))
+    index.record_launch(CREATOR, "mintA")
+    index.record_outcome("mintA", "signal_passed")
+    index.record_outcome("mintA", "rugged")
+    index.record_outcome("mintA", "signal_failed")
+
+    assert index.mints_for(CREATOR)[0]["outcome"] == "rugged"
+    assert index.lookup(CREATOR)["rug_count"] == 1
+
+
+def test_developer_analyzer_skips_solscan_for_known_creator(sample_config, temp_output_dir, monkeypatch):
+    """Test a repeat creator costs no Solscan calls"""
+    sample_config["developer"] = {"creator_index_path": os.path.join(temp_output_dir, "creators.db")}
+    calls = []
+
+    def fake_account_tokens(self, account, limit=50, offset=0):
+        calls.append(account)
+        return {"data": [{"tokenAddress": "oldMint1", "mintAuthority": CREATOR}, {"tokenAddress": "boughtMint"}]}
+
+    monkeypatch.setattr("solana_due_diligence.providers.solscan.SolscanClient.get_account_tokens", fake_account_tokens)
+
+    first = DeveloperAnalyzer(sample_config).analyze({"mint": "newMint1", "solscan": {"meta": {"creator": CREATOR}}})
+    second = DeveloperAnalyzer(sample_config).analyze({"mint": "newMint2", "solscan": {"meta": {"creator": CREATOR}}})
+
+    assert len(calls) == 1
+    assert first["history_source"] == "solscan"
+    assert [h["mint"] for h in first["history_sample"]] == ["oldMint1", "boughtMint"]
+    assert second["history_source"] == "index"
+    # Held-only tokens are not counted as launches
+    assert second["creator_stats"]["launch_count"] == 3
+
+
+def test_many_tokens_flag_counts_launches_on_both_paths(sample_config, temp_output_dir, monkeypatch):
+    """Test a creator holding many bought tokens is not flagged, on the Solscan path or from the index"""
+    sample_config["developer"] = {"creator_index_path": os.path.join(temp_output_dir, "creators.db")}
+    held = [{"tokenAddress": f"bought{i}"} for i in range(10)] + [{"tokenAddress": "oldMint1", "mintAuthority": CREATOR}]
+    monkeypatch.setattr("solana_due_diligence.providers.solscan.SolscanClient.get_account_tokens",
+                        lambda self, account, limit=50, offset=0: {"data": held})
+    analyzer = DeveloperAnalyzer(sample_config)
+    tokenomics = {"solscan": {"meta": {"creator": CREATOR}}}
+
+    first = analyzer.analyze({**tokenomics, "mint": "newMint0"})
+    assert first["history_source"] == "solscan" and "creator_has_many_tokens" not in first["risk_flags"]
+    for i in range(1, 4):
+        result = analyzer.analyze({**tokenomics, "mint": f"newMint{i}"})
+        assert result["history_source"] == "index"
+    assert result["creator_stats"]["launch_count"] == 5
+    assert "creator_has_many_tokens" in result["risk_flags"]
@@ -0,0 +1,52 @@
+from solana_due_diligence.streaming.delay_queue import DelayQueue
+
+
+FRESH = {
+    "signal": {"passed": False, "reasons": ["Liquidity below $5000.0"]},
+    "market": {"pairs_found": 0},
+    "security": {"lp": {}},
+    "tokenomics": {},
+}
+LISTED = {
+    "signal": {"passed": True, "reasons": []},
+    "market": {"pairs_found": 1},
+    "security": {"lp": {"liquidity_usd": 20000}},
+    "tokenomics": {},
+}
+
+
+def test_delay_queue_rechecks_at_offsets_from_first_seen(tmp_path):
+    """Test re-checks are due at each offset after the first look, then dropped"""
+    q = DelayQueue(str(tmp_path / "delay.db"), offsets=[120, 600, 3600])
+
+    assert q.settle("MintA", 0, FRESH, now=1000.0) == 1120.0
+    assert q.pop_due(now=1100.0) == []
+    assert q.pop_due(now=1120.0) == [("MintA", 1)]
+    assert q.settle("MintA", 1, FRESH, now=1125.0) == 1600.0
+    assert q.settle("MintA", 2, FRESH, now=1601.0) == 4600.0
+    assert q.settle("MintA", 3, FRESH, now=4601.0) is None
+    assert len(q) == 0
+
+
+def test_delay_queue_dedupes_and_clears_on_success(tmp_path):
+    """Test repeat rejections do not stack and a passing re-check clears the token"""
+    q = DelayQueue(str(tmp_path / "delay.db"), offsets=[120, 600])
+
+    q.settle("MintA", 0, FRESH, now=1000.0)
+    q.settle("MintA", 0, FRESH, now=1050.0)
+    assert len(q) == 1
+    assert q.pop_due(now=1200.0) == [("MintA", 1)]
+    assert q.settle("MintA", 1, LISTED, now=1200.0) is None
+    assert len(q) == 0
+
+
+def test_delay_queue_survives_restart_and_expired_leases(tmp_path):
+    """Test scheduled and leased-but-unsettled re-checks come back after reopening"""
+    path = str(tmp_path / "delay.db")
+    q = DelayQueue(path, offsets=[120], lease_seconds=60)
+    q.settle("MintA", 0, FRESH, now=1000.0)
+    assert q.pop_due(now=1120.0) == [("MintA", 1)]
+
+    reopened = DelayQueue(path, offsets=[120], lease_seconds=60)
+    assert reopened.pop_due(now=1150.0) == []
+    assert reopened.pop_due(now=1180.0) == [("MintA", 1)]
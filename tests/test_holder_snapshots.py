@@ -0,0 +1,103 @@
+import os
+
+from solana_due_diligence.market.watch import WatchEngine
+from solana_due_diligence.market.liquidity import associated_token_address, bonding_curve_address
+from solana_due_diligence.metrics.holder_snapshots import HolderSnapshotStore, exclude_pools
+
+
+def _holders(balances):
+    return [{"address": a, "amount": str(v)} for a, v in balances.items()]
+
+
+def test_series_round_trips_through_keyframes_and_deltas(tmp_path):
+    """Test snapshots stored as keyframes plus deltas reconstruct every balance"""
+    store = HolderSnapshotStore(str(tmp_path / "holders.db"), keyframe_every=3)
+    history = [
+        {"A": 500_000_000_000_000, "B": 200, "C": 100},
+        {"A": 400_000_000_000_000, "B": 200, "C": 150},
+        {"A": 400_000_000_000_000, "C": 150, "D": 75},
+        {"A": 10, "C": 150, "D": 80},
+        {"A": 10, "C": 150, "D": 80},
+    ]
+    for t, balances in enumerate(history):
+        assert store.record("MintA", _holders(balances), taken_at=float(t)) == t
+
+    assert store.series("MintA") == [(float(t), b) for t, b in enumerate(history)]
+    assert len(store) == 1
+
+
+def test_sellers_and_flow_since_launch(tmp_path):
+    """Test launch top holders that sold more than half are found"""
+    store = HolderSnapshotStore(str(tmp_path / "holders.db"))
+    store.record("MintA", _holders({"Whale": 1000, "Dolphin": 400, "Fish": 100}), taken_at=0.0)
+    store.record("MintA", _holders({"Whale": 900, "Dolphin": 100, "Fish": 300, "New": 50}), taken_at=60.0)
+    store.record("MintA", _holders({"Whale": 300, "Dolphin": 100, "Fish": 300, "New": 50}), taken_at=120.0)
+
+    sellers = store.sellers("MintA", min_sold=0.5, top=10)
+    assert [(s["address"], s["sold_pct"]) for s in sellers] == [("Whale", 70.0), ("Dolphin", 75.0)]
+    flow = store.flow("MintA")
+    assert flow["snapshots"] == 3 and flow["span_seconds"] == 120.0
+    assert flow["sellers"] == 2 and flow["new_holders"] == 1
+    assert flow["top_sold_share"] == round(1 - 500 / 1500, 4)
+    assert store.sellers("Unknown") == [] and store.flow("Unknown") is None
+
+
+def test_quiet_deltas_stay_small(tmp_path):
+    """Test unchanged snapshots cost only a few bytes each"""
+    path = tmp_path / "holders.db"
+    store = HolderSnapshotStore(str(path), keyframe_every=1000)
+    balances = {f"Holder{i:040d}": 10 ** 12 + i for i in range(20)}
+    store.record("MintA", _holders(balances), taken_at=0.0)
+    for t in range(1, 50):
+        store.record("MintA", _holders(balances), taken_at=float(t))
+    sizes = [len(r["data"]) for r in store._conn.execute("SELECT data FROM holder_snapshots ORDER BY seq")]
+    assert sizes[0] < 20 * 16
+    assert max(sizes[1:]) <= 16
+
+
+def test_expired_series_are_pruned_with_their_wallets(tmp_path):
+    """Test records past the retention drop stale series and wallets only they referenced"""
+    store = HolderSnapshotStore(str(tmp_path / "holders.db"), retention_hours=1)
+    store.record("OldMint", _holders({"Gone": 100, "Shared": 50}), taken_at=1000.0)
+    store.record("NewMint", _holders({"Shared": 70}), taken_at=1000.0)
+    store.record("NewMint", _holders({"Shared": 80, "Fresh": 5}), taken_at=1000.0 + 7200)
+
+    assert store.series("OldMint") == [] and len(store) == 1
+    wallets = {r["address"] for r in store._conn.execute("SELECT address FROM wallets")}
+    assert wallets == {"Shared", "Fresh"}
+    assert store.series("NewMint")[-1][1] == {"Shared": 80, "Fresh": 5}
+    store.record("NewMint", _holders({"Gone": 1}), taken_at=1000.0 + 7300)
+    assert store.series("NewMint")[-1][1] == {"Gone": 1}
+
+
+def test_watch_takes_snapshots_and_alerts_on_dump(tmp_path):
+    """Test watch polls add holder snapshots and alert when launch holders dump"""
+    store = HolderSnapshotStore(str(tmp_path / "holders.db"))
+    balances = {"MintA": {"Whale": 1000, "Other": 1000}}
+    alerts = []
+    engine = WatchEngine(
+        {"holder_snapshots": {"interval_seconds": 0, "dump_alert_pct": 50}},
+        fetcher=lambda mints: {m: [{"priceUsd": "1", "liquidity": {"usd": 1000}}] for m in mints},
+        on_alert=alerts.append,
+        holders=store,
+        holder_fetcher=lambda mints: {m: _holders(balances[m]) for m in mints},
+    )
+    engine.add("MintA", now=0.0)
+    engine.poll_once(now=1.0)
+    balances["MintA"] = {"Whale": 100, "Other": 500}
+    engine.poll_once(now=engine.tokens["MintA"].next_due)
+
+    assert engine.stats["holder_snapshots"] == 2
+    assert [a["kind"] for a in alerts] == ["holders_dump"]
+    assert alerts[0]["top_sold_share"] == 0.7
+
+
+def test_pool_accounts_are_not_holders():
+    """Test the bonding curve's token account and pool PDAs are dropped from holder samples"""
+    mint = "So11111111111111111111111111111111111111112"
+    curve = bonding_curve_address(mint)
+    holders = [{"address": associated_token_address(curve, mint), "amount": "900"},
+               {"address": "Wallet1111111111111111111111111111111111111", "amount": "50"},
+               {"owner": curve, "amount": "900"}]
+    assert exclude_pools(mint, holders) == [holders[1]]
+    assert exclude_pools("DOG", holders) == holders
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from solana_due_diligence.ingestion.jsonstream import ArrayItemParser, iter_array_items
+
+
+PATH = ("data", "Solana", "Instructions")
+
+DOC = {
+    "extensions": {"Instructions": [{"decoy": True}]},
+    "data": {
+        "Solana": {
+            "Other": [[1, 2], {"Instructions": ["nested decoy"]}],
+            "Instructions": [
+                {"Accounts": [{"Address": "Mint1"}], "Transaction": {"Signature": "s]i{g\"1"}},
+                {"Accounts": [{"Address": "Mint2 ✓"}], "Transaction": {"Signature": "sig\\2"}},
+                "plain",
+                42,
+            ],
+        }
+    },
+}
+
+
+def test_yields_only_target_array_items_for_any_chunking():
+    """Test items match a full parse whatever the chunk boundaries, multi-byte characters included"""
+    raw = json.dumps(DOC, ensure_ascii=False, indent=1).encode("utf-8")
+    expected = DOC["data"]["Solana"]["Instructions"]
+    for size in (1, 2, 3, 7, 64, len(raw)):
+        chunks = [raw[i:i + size] for i in range(0, len(raw), size)]
+        assert list(iter_array_items(chunks, PATH)) == expected
+
+
+def test_first_item_is_available_before_the_page_is_complete():
+    """Test an instruction is emitted as soon as it is complete, before the rest of the page arrives"""
+    parser = ArrayItemParser(PATH)
+    assert parser.feed('{"data": {"Solana": {"Instructions": [{"Accounts": [{"Address": "Mi') == []
+    assert parser.feed('nt1"}]}, {"Accounts": [') == [{"Accounts": [{"Address": "Mint1"}]}]
+    assert len(parser._buf) < 20
+
+
+def test_truncated_stream_raises():
+    """Test a response cut off inside an element is reported"""
+    raw = b'{"data": {"Solana": {"Instructions": [{"Accounts": [1]}, {"Acc'
+    items = iter_array_items([raw], PATH)
+    assert next(items) == {"Accounts": [1]}
+    with pytest.raises(ValueError):
+        next(items)
@@ -0,0 +1,94 @@
+import base64
+import struct
+import threading
+
+from solana_due_diligence.market.liquidity import (
+    BONDING_CURVE_DISCRIMINATOR,
+    INITIAL_REAL_TOKEN_RESERVES,
+    SOL_USD_VAULTS,
+    LiquidityReader,
+    bonding_curve_address,
+    price_impact,
+)
+from solana_due_diligence.security.analyzer import SecurityAnalyzer
+
+
+MINT = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDSYWBnHpW8pK4t2C"
+
+
+def _curve(real_tokens, real_sol, complete=False):
+    virtual_tokens, virtual_sol = real_tokens + 279_900_000_000_000, real_sol + 30_000_000_000
+    return BONDING_CURVE_DISCRIMINATOR + struct.pack("<5Q", virtual_tokens, virtual_sol, real_tokens, real_sol,
+                                                     1_000_000_000_000_000) + bytes([complete])
+
+
+def _token_account(amount):
+    return bytes(64) + struct.pack("<Q", amount) + bytes(93)
+
+
+def _mint(decimals):
+    return bytes(44) + bytes([decimals]) + bytes(37)
+
+
+class _FakeRPC:
+    commitment = "confirmed"
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.batches = []
+
+    def batch(self, calls):
+        self.batches.append(calls)
+        return [{"value": [
+            {"data": [base64.b64encode(self.accounts[a]).decode(), "base64"]} if a in self.accounts else None
+            for a in params[0]
+        ]} for _, params in calls]
+
+
+def test_bonding_curve_reserves_progress_and_impact():
+    """Test a live curve is decoded into reserves, progress, USD liquidity and price impact in one batch"""
+    real_tokens = INITIAL_REAL_TOKEN_RESERVES // 2
+    rpc = _FakeRPC({
+        bonding_curve_address(MINT): _curve(real_tokens, 20 * 10 ** 9),
+        MINT: _mint(6),
+        SOL_USD_VAULTS[0]: _token_account(1_000 * 10 ** 9),
+        SOL_USD_VAULTS[1]: _token_account(150_000 * 10 ** 6),
+    })
+    reader = LiquidityReader({"liquidity": {"trade_sizes_sol": [1, 50]}}, rpc=rpc)
+    out = reader.read([(MINT, None, None)])[MINT]
+
+    assert len(rpc.batches) == 1 and len(rpc.batches[0]) == 1
+    assert out["source"] == "pumpfun_curve"
+    assert out["curve_progress"] == 0.5
+    assert out["sol_usd"] == 150.0
+    assert out["liquidity_sol"] == 40.0 and out["liquidity_usd"] == 6000.0
+    assert out["price_impact"]["buy"]["1"] == 2.0
+    # The curve holds only 20 real SOL; selling 50 SOL worth would need 25
+    assert out["price_impact"]["sell"]["50"] is None
+
+
+def test_concurrent_callers_share_one_batch_and_feed_security():
+    """Test analyses arriving together are read in one RPC batch and on-chain liquidity reaches the LP gate"""
+    other = "4wTV1YmiEkRvAtNtsSGPtUrqRYQMe5SKy2uB4Jjaxnjf"
+    rpc = _FakeRPC({
+        bonding_curve_address(MINT): _curve(INITIAL_REAL_TOKEN_RESERVES, 10 ** 9),
+        bonding_curve_address(other): _curve(0, 85 * 10 ** 9, complete=True),
+    })
+    reader = LiquidityReader({"liquidity": {"sol_usd": 100, "batch_window_ms": 50}}, rpc=rpc)
+    results = {}
+    threads = [threading.Thread(target=lambda m=m: results.update({m: reader.analyze(m)})) for m in (MINT, other)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(rpc.batches) == 1
+    assert results[MINT]["liquidity_usd"] == 200.0 and results[MINT]["curve_progress"] == 0.0
+    # Graduated, and the PumpSwap vaults are not in the fake chain state
+    assert results[other]["curve_complete"] is True and results[other]["source"] is None
+
+    market = {"best_pair": None, "onchain": results[MINT]}
+    security = SecurityAnalyzer({}).analyze({}, market)
+    assert security["lp"]["liquidity_usd"] == 200.0
+    assert security["lp"]["source"] == "pumpfun_curve"
+    assert price_impact(0, 0, [1]) == {"buy": {}, "sell": {}}
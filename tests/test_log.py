@@ -0,0 +1,67 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from solana_due_diligence import log as sdd_log
+from solana_due_diligence.log import NonBlockingQueueHandler, setup_logging, shutdown_logging, timed
+
+
+@pytest.fixture
+def package_logger():
+    logger = logging.getLogger(sdd_log.ROOT)
+    yield logger
+    shutdown_logging()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.propagate = True
+    logger.setLevel(logging.NOTSET)
+    logging.getLogger("solana_due_diligence.analysis").setLevel(logging.NOTSET)
+
+
+def test_json_lines_carry_mint_stage_and_latency(package_logger):
+    """Test non-interactive output is one JSON object per record with extra fields"""
+    out = io.StringIO()
+    setup_logging({"logging": {"level": "INFO", "levels": {"solana_due_diligence.analysis": "DEBUG"}}}, stream=out)
+    logger = logging.getLogger("solana_due_diligence.analysis")
+    with timed(logger, "market", "MintA") as fields:
+        fields["pairs"] = 2
+    logging.getLogger("solana_due_diligence.streaming.controller").debug("filtered by level")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.error("Error analyzing: %s", "boom", extra={"mint": "MintB"}, exc_info=True)
+    shutdown_logging()
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["msg"] for r in records] == ["stage done", "Error analyzing: boom"]
+    assert records[0]["mint"] == "MintA" and records[0]["stage"] == "market" and records[0]["pairs"] == 2
+    assert isinstance(records[0]["latency_ms"], float)
+    assert records[1]["level"] == "error" and "ValueError: boom" in records[1]["exc"]
+
+
+def test_interactive_output_is_plain_text(package_logger):
+    """Test a terminal gets rendered text, with message markup left alone"""
+    out = io.StringIO()
+    setup_logging({}, interactive=True, stream=out)
+    logging.getLogger("solana_due_diligence.streaming.controller").info("New token [detected]", extra={"mint": "MintA"})
+    shutdown_logging()
+    assert out.getvalue().strip() == "MintA: New token [detected]"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test the queue handler never blocks the logging thread"""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("test_full_queue")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "record 0"
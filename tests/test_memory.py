@@ -0,0 +1,43 @@
+import json
+import os
+import tracemalloc
+
+from solana_due_diligence.providers import http
+from solana_due_diligence.streaming.memory import MemoryMonitor, register_shedder, unregister_shedder
+
+
+def test_memory_monitor_writes_status_and_sheds(temp_output_dir):
+    """Test a sample over the soft ceiling sheds registered caches and records status"""
+    shed = []
+    register_shedder("test_cache", lambda: shed.append(True))
+    config = {"memory": {
+        "soft_limit_mb": 1,
+        "snapshot_dir": os.path.join(temp_output_dir, "memory"),
+        "status_path": os.path.join(temp_output_dir, "memory.json"),
+    }}
+    monitor = MemoryMonitor(config)
+    os.makedirs(monitor.snapshot_dir, exist_ok=True)
+    tracemalloc.start()
+    try:
+        monitor.sample()
+        status = monitor.sample()
+    finally:
+        tracemalloc.stop()
+        unregister_shedder("test_cache")
+
+    assert shed == [True, True]
+    assert status["shed_events"] == 2
+    assert "test_cache" in status["last_shed"]["caches"]
+    with open(config["memory"]["status_path"]) as f:
+        assert json.load(f)["rss_mb"] > 0
+    assert os.listdir(monitor.snapshot_dir)
+
+
+def test_close_sessions_replaces_sessions_lazily():
+    """Test shedding HTTP sessions leaves in-use sessions open until their thread asks again"""
+    s = http.session()
+    closed = []
+    s.close = lambda: closed.append(True)
+    http.close_sessions()
+    assert closed == []
+    assert http.session() is not s and closed == [True]
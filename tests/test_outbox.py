@@ -0,0 +1,58 @@
+import os
+
+from solana_due_diligence.notify.outbox import TelegramOutbox
+
+
+class FakeSender:
+    def __init__(self, responses=None):
+        self.responses = list(responses or [])
+        self.sent = []
+
+    def __call__(self, chat_id, text):
+        self.sent.append((chat_id, text))
+        return self.responses.pop(0) if self.responses else (True, None)
+
+
+def _outbox(temp_output_dir, sender, **kwargs):
+    return TelegramOutbox("token", os.path.join(temp_output_dir, "outbox.db"), sender=sender, **kwargs)
+
+
+def test_outbox_respects_per_chat_interval(temp_output_dir):
+    """Test a second message to the same chat waits for the per-chat slot"""
+    sender = FakeSender()
+    outbox = _outbox(temp_output_dir, sender, per_chat_interval=60.0, global_rate=1e6)
+    outbox.enqueue("chat1", "first")
+    outbox.enqueue("chat1", "second")
+    outbox.enqueue("chat2", "other")
+
+    assert outbox.send_next() == 0.0
+    assert outbox.send_next() == 0.0
+    assert outbox.send_next() > 0
+    assert sender.sent == [("chat1", "first"), ("chat2", "other")]
+    assert outbox.pending_count() == 1
+
+
+def test_outbox_coalesces_backlog_into_digest(temp_output_dir):
+    """Test a backed-up chat gets one digest instead of many messages"""
+    sender = FakeSender()
+    outbox = _outbox(temp_output_dir, sender, digest_after=3)
+    for i in range(4):
+        outbox.enqueue("chat1", f"signal {i}")
+
+    outbox.send_next()
+    assert len(sender.sent) == 1
+    assert sender.sent[0][1].startswith("4 signals:")
+    assert outbox.pending_count() == 0
+
+
+def test_outbox_retries_rate_limited_and_failed_sends(temp_output_dir):
+    """Test 429s keep the message queued and failures back off until max attempts"""
+    sender = FakeSender([(False, 0.0), (False, None)])
+    outbox = _outbox(temp_output_dir, sender, per_chat_interval=0.0, global_rate=1e6, max_attempts=1)
+    outbox.enqueue("chat1", "hello")
+
+    outbox.send_next()
+    assert outbox.pending_count() == 1
+    outbox.send_next()
+    assert len(sender.sent) == 2
+    assert outbox.pending_count() == 0
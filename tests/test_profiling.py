@@ -0,0 +1,45 @@
+import json
+import logging
+
+from solana_due_diligence import analysis, profiling
+from solana_due_diligence.log import timed
+
+
+def test_slow_token_profile_is_kept(tmp_path):
+    """Test a token over the threshold keeps its stages, provider calls and cProfile"""
+    profiler = profiling.Profiler({"profiling": {"dir": str(tmp_path), "threshold_ms": 0, "keep": 5}})
+    with profiler.profile("MintA"):
+        with timed(logging.getLogger("test"), "market", "MintA"):
+            with profiling.call("POST api.mainnet-beta.solana.com getMultipleAccounts"):
+                sum(range(1000))
+            with profiling.call("wait api.dexscreener.com"):
+                pass
+
+    kept = list(tmp_path.glob("*.json"))
+    assert len(kept) == 1 and kept[0].name.endswith("-MintA.json")
+    summary = json.loads(kept[0].read_text())
+    assert list(summary["stages"]) == ["market"]
+    assert summary["calls"]["POST api.mainnet-beta.solana.com getMultipleAccounts"]["count"] == 1
+    assert "wait api.dexscreener.com" in summary["calls"]
+    assert summary["top_functions"] and kept[0].with_suffix(".prof").exists()
+    entry = json.loads((tmp_path / "index.jsonl").read_text())
+    assert entry["mint"] == "MintA" and entry["slowest_stage"] == "market"
+
+    # Outside a profiled analysis nothing is recorded
+    with profiling.call("GET example.com"):
+        pass
+    profiling.add_stage("market", 1.0)
+
+
+def test_fast_token_is_dropped(tmp_path, monkeypatch):
+    """Test --profile wires analyze_once to the profiler and fast tokens leave no files"""
+    config = profiling.enable_profiling({"profiling": {"dir": str(tmp_path), "threshold_ms": 60000}})
+    assert config["profiling"]["enabled"] is True
+    assert profiling.enable_profiling({}, threshold_ms=0)["profiling"]["threshold_ms"] == 0
+    assert profiling.get_profiler({"profiling": {"enabled": False}}) is None
+
+    seen = []
+    monkeypatch.setattr(analysis, "_analyze", lambda *args: seen.append(profiling._current.get()) or {})
+    analysis.analyze_once(config, "MintB", notify=False)
+    assert seen[0] is not None and seen[0].mint == "MintB"
+    assert list(tmp_path.iterdir()) == []
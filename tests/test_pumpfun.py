@@ -0,0 +1,68 @@
+import base64
+import hashlib
+
+from solana_due_diligence.ingestion.pumpfun import (
+    CREATE_DISCRIMINATOR,
+    PUMPFUN_PROGRAM_ID,
+    CreateFilter,
+    b58decode,
+    b58encode,
+    find_program_address,
+    is_pubkey,
+)
+
+
+MINT = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+CURVE = "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL"
+CREATOR = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDSYWBnHpW8pK4t2C"
+FILLER = "11111111111111111111111111111111"
+BUY_DISCRIMINATOR = hashlib.sha256(b"global:buy").digest()[:8]
+
+
+def _item(data: bytes, accounts, program=PUMPFUN_PROGRAM_ID, encode=bytes.hex):
+    return {
+        "Instruction": {
+            "Program": {"Address": program},
+            "Accounts": [{"Address": a} for a in accounts],
+            "Data": encode(data),
+        },
+        "Transaction": {"Signature": "sig"},
+    }
+
+
+def test_base58_pubkey_validation():
+    """Test only base58 strings decoding to 32 bytes count as pubkeys"""
+    assert b58decode(FILLER) == bytes(32)
+    assert is_pubkey(PUMPFUN_PROGRAM_ID) and is_pubkey(MINT)
+    assert not is_pubkey(MINT[:-4])
+    assert not is_pubkey("0" + MINT[1:])
+    assert not is_pubkey(None)
+
+
+def test_create_instruction_yields_mint_and_creator():
+    """Test the create discriminator is recognized in hex or base64 data, with mint, curve and creator accounts"""
+    accounts = [MINT, FILLER, CURVE, FILLER, FILLER, FILLER, FILLER, CREATOR]
+    f = CreateFilter()
+    for encode in (bytes.hex, lambda b: base64.b64encode(b).decode()):
+        launch = f.parse(_item(CREATE_DISCRIMINATOR + b"\x05\x00\x00\x00name", accounts, encode=encode))
+        assert (launch.mint, launch.bonding_curve, launch.creator) == (MINT, CURVE, CREATOR)
+    assert f.stats["accepted"] == 2
+
+
+def test_noise_is_dropped_and_counted():
+    """Test buys, other programs and malformed mints are dropped with per-reason counters"""
+    accounts = [MINT, FILLER, CURVE, FILLER, FILLER, FILLER, FILLER, CREATOR]
+    f = CreateFilter()
+    assert f.parse(_item(BUY_DISCRIMINATOR + bytes(16), [CURVE, FILLER, MINT, FILLER, FILLER, FILLER, CREATOR, FILLER])) is None
+    assert f.parse(_item(CREATE_DISCRIMINATOR, accounts, program=MINT)) is None
+    assert f.parse(_item(CREATE_DISCRIMINATOR, ["pumpfunShortMint123456"] + accounts[1:])) is None
+    assert f.parse(_item(CREATE_DISCRIMINATOR, accounts[:3])) is None
+    assert f.stats == {"seen": 4, "accepted": 0, "other_program": 1, "not_create": 2, "invalid_mint": 1}
+    assert f.noise_ratio() == 1.0
+
+
+def test_program_addresses_match_known_pumpfun_accounts():
+    """Test PDA derivation reproduces pump.fun's global and mint-authority accounts"""
+    assert find_program_address([b"global"], PUMPFUN_PROGRAM_ID) == "4wTV1YmiEkRvAtNtsSGPtUrqRYQMe5SKy2uB4Jjaxnjf"
+    assert find_program_address([b"mint-authority"], PUMPFUN_PROGRAM_ID) == "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM"
+    assert b58encode(b58decode(FILLER)) == FILLER
@@ -0,0 +1,64 @@
+from solana_due_diligence.reporting.models import TokenReport, decode_report, encode_report
+
+
+def _raw_report():
+    return {
+        "input": {"token": "MintA"},
+        "gates": {"passed": True, "reasons": []},
+        "tokenomics": {
+            "mint": "MintA",
+            "supply": {"amount": "1000000000", "decimals": 6, "ui_amount": "1000"},
+            "top_holders_sample": [{"address": "HolderA", "amount": "10", "uiAmount": 0.00001}],
+            "solscan": {
+                "meta": {"tokenSymbol": "DOG", "tokenName": "Dog", "creator": "C" * 44, "website": "x", "icon": "y" * 500},
+                "holder_count": 12,
+                "holders_sample": [{"owner": "OwnerA", "amount": 5, "decimals": 6, "ownerProgram": "Tokenkeg", "rank": 1}],
+            },
+        },
+        "market": {
+            "pairs_found": 2,
+            "best_pair": {
+                "dexId": "raydium",
+                "pairAddress": "PairA",
+                "priceUsd": "0.0012",
+                "liquidity": {"usd": 15000.5, "base": 1, "quote": 2},
+                "txns": {"h24": {"buys": 10, "sells": 4}, "h1": {"buys": 1, "sells": 0}},
+                "info": {"imageUrl": "z" * 500, "socials": []},
+            },
+        },
+        "security": {
+            "authorities": {"mint_authority": None, "freeze_authority": None, "mint_revoked": True, "freeze_revoked": True},
+            "lp": {"dex": "raydium", "liquidity_usd": 15000.5, "pair_created_at": 1700000000000},
+            "notes": ["Mint authority appears revoked (null)"],
+        },
+        "community": {"skipped": "gate failed"},
+        "developer": {"creator": "C" * 44, "creator_stats": None, "history_source": "solscan",
+                      "history_sample": [{"mint": "Old", "amount": 3}], "risk_flags": []},
+        "github": {"repos": [{"full_name": "a/b", "html_url": "u", "stargazers": 3, "language": "Rust",
+                              "updated_at": "2024", "score": 103}]},
+        "metrics": {"moralis": None},
+        "summary": {"headline": "Initial Solana token scan", "notes": ["Pairs found: 2"]},
+        "signal": {"passed": True, "reasons": []},
+    }
+
+
+def test_report_model_trims_raw_payloads():
+    """Test raw provider payloads are reduced to the fields consumers read"""
+    data = TokenReport.from_dict(_raw_report()).to_dict()
+    meta = data["tokenomics"]["solscan"]["meta"]
+    assert meta["symbol"] == "DOG" and "icon" not in meta
+    best = data["market"]["best_pair"]
+    assert best["liquidity"]["usd"] == 15000.5
+    assert best["txns"]["h24"] == {"buys": 10, "sells": 4}
+    assert "info" not in best
+    assert data["community"] == {"skipped": "gate failed"}
+    assert data["input"] == {"token": "MintA"}
+
+
+def test_report_model_round_trips():
+    """Test encode/decode and dict conversion are lossless for the model"""
+    model = TokenReport.from_dict(_raw_report())
+    assert decode_report(encode_report(model)) == model
+    assert decode_report(encode_report(model, indent=2)) == model
+    assert TokenReport.from_dict(model.to_dict()) == model
+    assert b"\n" not in encode_report(model)
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from solana_due_diligence.providers.rpc_pool import RPCEndpointError, RPCPool
+from solana_due_diligence.providers.solana_rpc import SolanaRPC
+
+
+class FakeNodes:
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = set(failing)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, payload, timeout):
+        with self.lock:
+            self.calls.append(url)
+        time.sleep(self.delays.get(url, 0))
+        if url in self.failing:
+            raise RPCEndpointError(f"HTTP 502 from {url}")
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": {"from": url}}
+
+
+def _pool(nodes, **kwargs):
+    endpoints = kwargs.pop("endpoints", [{"url": "a"}, {"url": "b"}])
+    return RPCPool(endpoints, transport=nodes, **kwargs)
+
+
+def test_routes_to_lowest_latency_endpoint():
+    """Test calls settle on the endpoint with the lower latency EWMA"""
+    nodes = FakeNodes({"a": 0.02, "b": 0.0})
+    pool = _pool(nodes, hedge=False)
+    for _ in range(10):
+        pool.call("getSlot", [])
+    assert nodes.calls[-5:] == ["b"] * 5
+
+
+def test_fails_over_and_penalizes_erroring_endpoint():
+    """Test a failing endpoint is retried elsewhere and then avoided"""
+    nodes = FakeNodes({}, failing={"a"})
+    pool = _pool(nodes, hedge=False, endpoints=[{"url": "a", "weight": 5}, {"url": "b"}])
+    for _ in range(5):
+        assert pool.call("getSlot", [])["result"] == {"from": "b"}
+    assert nodes.calls.count("a") == 1
+    assert pool.stats["failovers"] == 1
+
+    nodes.failing.add("b")
+    with pytest.raises(RPCEndpointError):
+        pool.call("getSlot", [])
+
+
+def test_quota_spills_over_to_weaker_endpoint():
+    """Test an endpoint out of quota is skipped even when it scores best"""
+    nodes = FakeNodes({})
+    pool = _pool(nodes, hedge=False, endpoints=[{"url": "a", "weight": 10, "rate": 0.01, "burst": 1}, {"url": "b"}])
+    pool.call("getSlot", [])
+    pool.call("getSlot", [])
+    assert nodes.calls == ["a", "b"]
+
+
+def test_hedged_read_takes_first_answer():
+    """Test a slow primary is hedged on the runner-up and the faster answer wins"""
+    nodes = FakeNodes({"a": 0.5, "b": 0.0})
+    pool = _pool(nodes, hedge_min_delay=0.02, hedge_default_delay=0.02, endpoints=[{"url": "a", "weight": 10}, {"url": "b"}])
+    t0 = time.perf_counter()
+    data = pool.call("getTokenSupply", ["MintA"])
+    assert time.perf_counter() - t0 < 0.3
+    assert data["result"] == {"from": "b"}
+    assert pool.stats["hedged"] == 1 and pool.stats["hedge_wins"] == 1
+
+
+def test_solana_rpc_uses_pool():
+    """Test SolanaRPC sends through the pool and unwraps the result"""
+    pool = _pool(FakeNodes({}), hedge=False)
+    rpc = SolanaRPC("https://unused.example", pool=pool)
+    assert rpc.get_token_supply("MintA") in ({"from": "a"}, {"from": "b"})
+
+
+def test_pool_failure_is_not_retried_on_top_of_failover():
+    """Test a call failing on every endpoint costs one request per endpoint and no retry sleeps"""
+    nodes = FakeNodes({}, failing={"a", "b"})
+    rpc = SolanaRPC("https://unused.example", pool=_pool(nodes, hedge=False))
+    started = time.monotonic()
+    with pytest.raises(Exception):
+        rpc.get_token_supply("MintA")
+    assert sorted(nodes.calls) == ["a", "b"]
+    assert time.monotonic() - started < 1
@@ -0,0 +1,79 @@
+import pytest
+
+from solana_due_diligence.signals.rules import RuleError, RuleSet, get_rule_set, parse_condition
+
+
+def _report(liquidity=30000, cluster_share=0.1, mint_revoked=True):
+    return {
+        "security": {"authorities": {"mint_revoked": mint_revoked, "freeze_revoked": True}, "lp": {"liquidity_usd": liquidity, "dex": "raydium"}},
+        "metrics": {"clusters": {"largest_cluster_share": cluster_share}},
+        "signal": {"passed": True, "reasons": []},
+    }
+
+
+PROFILES = [
+    {"name": "conservative", "chat_id": "desk-a",
+     "all": ["signal.passed == true", "security.lp.liquidity_usd >= 25000"],
+     "none": ["metrics.clusters.largest_cluster_share > 0.15"]},
+    {"name": "degen", "chat_id": "desk-b",
+     "all": ["security.authorities.mint_revoked == true", "security.lp.liquidity_usd >= 3000"]},
+    {"name": "venue", "any": ["security.lp.dex in [raydium, pumpswap]", "market.best_pair.dexId == orca"]},
+]
+
+
+def test_profiles_match_and_explain():
+    """Test each profile matches on its own conditions and explains a miss"""
+    rules = RuleSet(PROFILES)
+    assert [p.name for p in rules.matching(_report())] == ["conservative", "degen", "venue"]
+    assert [p.name for p in rules.matching(_report(liquidity=10000))] == ["degen", "venue"]
+    report = _report(cluster_share=0.4, mint_revoked=False)
+    assert [p.name for p in rules.matching(report)] == ["venue"]
+    conservative = rules.profiles[0]
+    assert rules.reasons(conservative, rules.evaluate(report)) == ["not: metrics.clusters.largest_cluster_share > 0.15"]
+
+
+def test_shared_conditions_compile_once():
+    """Test identical conditions and field paths across profiles are evaluated once"""
+    profiles = [{"name": f"p{i}", "all": ["signal.passed == true", f"security.lp.liquidity_usd >= {1000 * (i % 5)}"]}
+                for i in range(100)]
+    rules = RuleSet(profiles)
+    assert len(rules) == 100
+    assert len(rules.conditions) == 6
+    assert len(rules.paths) == 2
+    assert len(rules.matching(_report(liquidity=2500))) == 60
+
+
+def test_missing_fields_never_satisfy_comparisons():
+    """Test a condition on an absent field fails instead of raising"""
+    rules = RuleSet([{"name": "a", "all": ["metrics.moralis.concentration.top10 < 0.5"]},
+                     {"name": "b", "all": ["metrics.moralis missing"]}])
+    assert [p.name for p in rules.matching(_report())] == ["b"]
+
+
+@pytest.mark.parametrize("profiles", [
+    [{"all": ["signal.passed == true"]}],
+    [{"name": "a", "all": ["signal.passed ~ true"]}],
+    [{"name": "a", "all": ["security.lp.dex in raydium-only-number 5"]}, {"name": "a", "all": ["signal.passed == true"]}],
+    [{"name": "a", "none": ["signal.passed == false"]}],
+])
+def test_invalid_profiles_are_rejected(profiles):
+    """Test malformed profiles raise RuleError"""
+    with pytest.raises(RuleError):
+        RuleSet(profiles)
+
+
+def test_parse_condition_values_are_yaml_literals():
+    """Test condition values parse as YAML scalars and lists"""
+    assert parse_condition("a.b >= 1.5") == (("a", "b"), ">=", 1.5)
+    assert parse_condition("a in [x, y]") == (("a",), "in", ["x", "y"])
+    assert parse_condition("a exists") == (("a",), "exists", None)
+
+
+def test_rule_set_is_compiled_once_per_config():
+    """Test repeated lookups reuse the compiled set until the profiles list is replaced"""
+    config = {"signals": {"profiles": [{"name": "a", "all": ["market.liquidity_usd >= 1"]}]}}
+    rules = get_rule_set(config)
+    assert get_rule_set(config) is rules
+    config["signals"]["profiles"] = [dict(config["signals"]["profiles"][0])]
+    assert get_rule_set(config) is not rules
+    assert get_rule_set({"signals": {}}) is None
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import threading
+import time
+
+from solana_due_diligence.reporting.models import TokenReport, encode_report
+from solana_due_diligence.server.app import AnalysisService, APIServer
+
+
+MINT_A = "So11111111111111111111111111111111111111112"
+MINT_B = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+MINT_C = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+MISSING = "JUPyiwrYJFskUPiHa7hkeR8VUtAeFoSYbKedZNsDvCN"
+
+
+def _report(mint):
+    return {
+        "input": {"token": mint},
+        "security": {"authorities": {"mint_revoked": True, "freeze_revoked": True}, "lp": {"liquidity_usd": 50000}},
+        "metrics": {"moralis": {"concentration": {"top10": 0.2}}},
+    }
+
+
+def _slow_analyze(calls, delay=0.2):
+    lock = threading.Lock()
+
+    def analyze(config, mint, notify):
+        with lock:
+            calls.append(mint)
+        time.sleep(delay)
+        return _report(mint)
+    return analyze
+
+
+async def _request(reader, writer, method, path, body=None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+
+def _serve(config, service, client):
+    async def main():
+        server = APIServer(config, service)
+        srv = await server.start("127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            return await client(port)
+        finally:
+            srv.close()
+            await srv.wait_closed()
+            service.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_analysis(sample_config):
+    """Simultaneous requests for one mint run a single analysis; a later request hits the cache."""
+    calls = []
+    service = AnalysisService(sample_config, analyze=_slow_analyze(calls))
+
+    async def client(port):
+        async def one():
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            try:
+                return await _request(reader, writer, "GET", f"/analyze/{MINT_A}")
+            finally:
+                writer.close()
+                await writer.wait_closed()
+        results = await asyncio.gather(*(one() for _ in range(5)))
+        later = await one()
+        return results, later
+
+    results, later = _serve(sample_config, service, client)
+    assert calls == [MINT_A]
+    assert all(status == 200 and body["report"]["input"]["token"] == MINT_A for status, body in results)
+    assert sorted(body["source"] for _, body in results) == ["analysis"] + ["collapsed"] * 4
+    assert later[1]["source"] == "cache"
+
+
+def test_keep_alive_serves_several_routes(sample_config, temp_output_dir):
+    """One connection carries several requests; stored reports and signals are served without analysis."""
+    sample_config["report"]["output_dir"] = temp_output_dir
+    with open(f"{temp_output_dir}/{MINT_B}.json", "wb") as f:
+        f.write(encode_report(TokenReport.from_dict(_report(MINT_B))))
+    calls = []
+    service = AnalysisService(sample_config, analyze=_slow_analyze(calls, delay=0))
+
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            return [
+                await _request(reader, writer, "GET", "/health"),
+                await _request(reader, writer, "GET", f"/reports/{MINT_B}"),
+                await _request(reader, writer, "GET", f"/reports/{MISSING}"),
+                await _request(reader, writer, "POST", "/signal", {"mint": MINT_B}),
+                await _request(reader, writer, "POST", "/analyze", {"mint": MINT_C, "max_age": 0}),
+                await _request(reader, writer, "POST", "/analyze", {}),
+                await _request(reader, writer, "GET", "/analyze/..%2F..%2Fescape"),
+                await _request(reader, writer, "GET", "/reports/..%2F..%2Fetc%2Fpasswd"),
+            ]
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    health, stored, missing, signal, analyzed, invalid, traversal, read = _serve(sample_config, service, client)
+    assert health[0] == 200 and health[1]["ok"] is True
+    assert stored[0] == 200 and stored[1]["report"]["input"]["token"] == MINT_B
+    assert missing[0] == 404
+    assert signal[0] == 200 and signal[1]["signal"]["passed"] is True
+    assert analyzed[0] == 200 and calls == [MINT_C]
+    assert invalid[0] == 400
+    # Non-address mints never reach the cache, the report directory or the analysis pool
+    assert traversal[0] == 400 and read[0] == 400 and calls == [MINT_C]
+
+
+def test_invalid_content_length_is_rejected(sample_config):
+    """Non-numeric and negative Content-Length headers get a 400 instead of dropping the connection."""
+    service = AnalysisService(sample_config, analyze=_slow_analyze([], delay=0))
+
+    async def client(port):
+        replies = []
+        for length in ("abc", "-5"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            try:
+                writer.write(f"POST /analyze HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode())
+                await writer.drain()
+                replies.append(await reader.read())
+            finally:
+                writer.close()
+                await writer.wait_closed()
+        return replies
+
+    for reply in _serve(sample_config, service, client):
+        assert reply.startswith(b"HTTP/1.1 400") and b"invalid Content-Length" in reply
@@ -0,0 +1,47 @@
+import os
+from collections import Counter
+
+from solana_due_diligence.streaming.hashring import HashRing
+from solana_due_diligence.streaming.shared_state import SharedState
+
+
+def test_hash_ring_is_stable_and_balanced():
+    """Test mints map to the same worker and spread across all workers"""
+    ring = HashRing(range(4))
+    mints = [f"Mint{i:05d}" for i in range(4000)]
+    assignment = {m: ring.node_for(m) for m in mints}
+    assert all(HashRing(range(4)).node_for(m) == w for m, w in list(assignment.items())[:50])
+    counts = Counter(assignment.values())
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 500
+
+
+def test_hash_ring_removal_only_moves_removed_keys():
+    """Test removing a worker only reassigns the mints it owned"""
+    ring = HashRing(range(4))
+    mints = [f"Mint{i:05d}" for i in range(1000)]
+    before = {m: ring.node_for(m) for m in mints}
+    ring.remove(2)
+    moved = [m for m in mints if ring.node_for(m) != before[m]]
+    assert all(before[m] == 2 for m in moved)
+
+
+def test_shared_state_claims_and_stats(temp_output_dir):
+    """Test dedup claims are shared between connections and stats are summed"""
+    path = os.path.join(temp_output_dir, "stream.db")
+    a, b = SharedState(path), SharedState(path)
+    assert a.claim("MintA", window_seconds=60, worker=0) is True
+    assert b.claim("MintA", window_seconds=60, worker=1) is False
+    assert b.claim("MintA", window_seconds=0, worker=1) is True
+
+    a.put_worker_stats(0, {"analyzed": 3, "errors": 1})
+    b.put_worker_stats(1, {"analyzed": 2, "errors": 0})
+    assert a.aggregate_stats() == {"workers": 2, "analyzed": 5, "errors": 1}
+
+
+def test_shared_rate_bucket(temp_output_dir):
+    """Test the token bucket allows a burst then asks callers to wait"""
+    state = SharedState(os.path.join(temp_output_dir, "stream.db"))
+    assert state.take_token("api.example.com", rate=1.0, burst=2) == 0
+    assert state.take_token("api.example.com", rate=1.0, burst=2) == 0
+    assert state.take_token("api.example.com", rate=1.0, burst=2) > 0.5
@@ -1,5 +1,5 @@
 import pytest
-from solana_due_diligence.signals.engine import evaluate_buy_signal
+from solana_due_diligence.signals.engine import awaiting_data, evaluate_buy_signal, evaluate_gates
 
 
 def test_evaluate_buy_signal_passed():
@@ -86,3 +86,46 @@ def test_evaluate_buy_signal_custom_thresholds():
     
     result = evaluate_buy_signal(report_data, custom_thresholds)
     assert result["passed"] is True
+
+
+def test_evaluate_gates_ignores_concentration():
+    """Test hard gates only use authority and liquidity data"""
+    report_data = {
+        "security": {
+            "authorities": {
+                "mint_revoked": True,
+                "freeze_revoked": False
+            },
+            "lp": {
+                "liquidity_usd": 200
+            }
+        },
+        "metrics": {
+            "moralis": {
+                "concentration": {
+                    "top10": 0.9
+                }
+            }
+        }
+    }
+
+    result = evaluate_gates(report_data)
+    assert result["passed"] is False
+    assert result["reasons"] == ["Freeze authority not revoked", "Liquidity below $5000.0"]
+
+
+def test_awaiting_data_only_for_missing_liquidity():
+    """Test only liquidity failures without pairs are treated as not-yet-available data"""
+    fresh = {
+        "signal": {"passed": False, "reasons": ["Liquidity below $5000.0"]},
+        "market": {"pairs_found": 0, "best_pair": None},
+        "security": {"lp": {"liquidity_usd": None}},
+        "tokenomics": {"top_holders_sample": []},
+    }
+    assert awaiting_data(fresh) == ["no pairs", "no holders"]
+
+    thin = dict(fresh, market={"pairs_found": 1}, security={"lp": {"liquidity_usd": 800}})
+    assert awaiting_data(thin) == []
+
+    mintable = dict(fresh, signal={"passed": False, "reasons": ["Mint authority not revoked", "Liquidity below $5000.0"]})
+    assert awaiting_data(mintable) == []
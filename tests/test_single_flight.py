@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from solana_due_diligence.providers import http
+from solana_due_diligence.providers.github_api import GitHubClient
+
+
+def _run_concurrently(n, target):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(target())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_concurrent_identical_calls_share_one_request():
+    """Test concurrent calls with the same key run the function once and all get its result"""
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"pairs": [{"priceUsd": "1.0"}]}
+
+    key = http.flight_key("GET", "https://api.example/tokens", {"address": "MintA", "limit": 50})
+    threads, results, errors = _run_concurrently(5, lambda: http.coalesce(key, fetch))
+    while len(http._flights) == 0 or http._flights[key].waiters < 4:
+        pass
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert not errors
+    assert results == [{"pairs": [{"priceUsd": "1.0"}]}] * 5
+    assert len({id(r) for r in results}) == 5
+    assert http._flights == {}
+
+
+def test_leader_mutating_its_result_does_not_reach_waiters():
+    """Test waiters get the result as fetched even when the leader edits its copy straight away"""
+    release = threading.Event()
+    leader = []
+
+    def fetch():
+        leader.append(threading.get_ident())
+        release.wait(5)
+        return {"pairs": [{"priceUsd": "1.0"}]}
+
+    def call():
+        result = http.coalesce(key, fetch)
+        if leader == [threading.get_ident()]:
+            result["pairs"].clear()
+        return result
+
+    key = http.flight_key("GET", "https://api.example/tokens", {"address": "MintB"})
+    threads, results, errors = _run_concurrently(4, call)
+    while len(http._flights) == 0 or http._flights[key].waiters < 3:
+        pass
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert sorted(len(r["pairs"]) for r in results) == [0, 1, 1, 1]
+
+
+def test_single_flight_shares_errors_and_does_not_cache():
+    """Test waiters see the leader's error and a later call goes upstream again"""
+    release = threading.Event()
+    calls = []
+
+    @http.single_flight(lambda mint: ("https://api.example", mint))
+    def fetch(mint):
+        calls.append(mint)
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    threads, results, errors = _run_concurrently(3, lambda: fetch("MintA"))
+    key = http.flight_key(fetch.__wrapped__.__qualname__, "https://api.example", "MintA")
+    while key not in http._flights or http._flights[key].waiters < 2:
+        pass
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ["MintA"]
+    assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+    with pytest.raises(ValueError):
+        fetch("MintA")
+    assert calls == ["MintA", "MintA"]
+
+
+def test_flight_key_normalizes_params():
+    """Test param order, number-vs-string and None values do not split the key"""
+    assert http.flight_key("/v2/account/tokens", {"offset": 0, "limit": 50, "cursor": None}) == \
+        http.flight_key("/v2/account/tokens", {"limit": "50", "offset": "0"})
+    assert http.flight_key("/v2/account/tokens", {"address": "A"}) != http.flight_key("/v2/account/tokens", {"address": "B"})
+
+
+def test_github_client_get_runs_through_single_flight(monkeypatch):
+    """Test the GitHub client's flight key resolves and the request reaches the session"""
+    sent = []
+
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return {"items": [{"full_name": "org/repo"}]}
+
+    class Session:
+        def get(self, url, headers=None, params=None, timeout=None):
+            sent.append((url, params["q"]))
+            return Response()
+
+    monkeypatch.setattr(http, "session", lambda: Session())
+    assert GitHubClient().search_repos("DOG solana token") == [{"full_name": "org/repo"}]
+    assert sent == [("https://api.github.com/search/repositories", "DOG solana token")]
@@ -0,0 +1,52 @@
+from solana_due_diligence.streaming.tiers import TierSelector, launch_lag
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_tier_steps_down_at_once_and_recovers_gradually():
+    """Test load drops the tier immediately and calm brings it back one step per recover period"""
+    clock = _Clock()
+    config = {"stream": {"tiers": {"standard_backlog": 10, "minimal_backlog": 50, "recover_seconds": 30}}}
+    tiers = TierSelector(config, clock=clock)
+    assert tiers.observe(backlog=2, pressure=0.0) == "deep"
+    assert tiers.observe(backlog=80, pressure=0.0) == "minimal"
+
+    assert tiers.observe(backlog=0, pressure=0.0) == "minimal"
+    clock.now = 31
+    assert tiers.observe(backlog=0, pressure=0.0) == "standard"
+    clock.now = 45
+    assert tiers.observe(backlog=0, pressure=0.0) == "standard"
+    clock.now = 62
+    assert tiers.observe(backlog=0, pressure=0.0) == "deep"
+
+    assert tiers.observe(lag=120, pressure=0.0) == "standard"
+    assert tiers.observe(pressure=0.95) == "minimal"
+
+
+def test_tier_respects_ceiling_and_rate_limit_waits():
+    """Test the configured tier caps recovery and rate-limit waits count as pressure"""
+    class Limiter:
+        waited = 0.0
+
+    clock = _Clock()
+    limiter = Limiter()
+    config = {"pipeline": {"tier": "standard"}, "stream": {"tiers": {"recover_seconds": 0}}}
+    tiers = TierSelector(config, limiter=limiter, clock=clock)
+    assert tiers.observe() == "standard"
+
+    clock.now, limiter.waited = 10.0, 9.5
+    assert tiers.observe() == "minimal"
+    clock.now = 20.0
+    tiers.observe()
+    clock.now = 30.0
+    assert tiers.observe() == "standard"
+
+    assert TierSelector({"stream": {"tiers": {"auto": False}}}).observe(backlog=1000) == "deep"
+    assert launch_lag("2024-01-01T00:00:10Z", now=1704067230.0) == 20.0
+    assert launch_lag(None) == 0.0
@@ -0,0 +1,65 @@
+import threading
+
+from solana_due_diligence.market.watch import WatchEngine
+
+
+def _pair(price, liquidity):
+    return {"priceUsd": str(price), "liquidity": {"usd": liquidity}, "txns": {"h1": {"buys": 3, "sells": 1}}}
+
+
+class FakeDexscreener:
+    def __init__(self):
+        self.prices = {}
+        self.calls = []
+
+    def __call__(self, mints):
+        self.calls.append(list(mints))
+        return {m: [_pair(*self.prices[m])] for m in mints if m in self.prices}
+
+
+def test_watch_batches_due_tokens_into_one_request():
+    """Test due tokens are polled in batches of at most 30 per request"""
+    fake = FakeDexscreener()
+    engine = WatchEngine({}, fetcher=fake, on_alert=lambda a: None)
+    for i in range(45):
+        engine.add(f"Mint{i}", now=0.0)
+
+    assert engine.poll_once(now=1.0) == 30
+    assert engine.poll_once(now=1.0) == 15
+    assert engine.poll_once(now=1.0) == 0
+    assert [len(c) for c in fake.calls] == [30, 15]
+
+
+def test_watch_interval_grows_with_age_and_shrinks_with_volatility():
+    """Test old tokens are polled rarely and volatile ones more often"""
+    engine = WatchEngine({}, fetcher=FakeDexscreener(), on_alert=lambda a: None)
+    engine.add("Old", now=0.0)
+    token = engine.tokens["Old"]
+    assert engine._interval_for(token, now=7 * 3600) == 900
+    token.volatility = 0.3
+    assert engine._interval_for(token, now=7 * 3600) == 225
+
+
+def test_watch_alerts_once_per_crossing():
+    """Test threshold crossings alert once and re-arm after clearing"""
+    fake = FakeDexscreener()
+    alerts = []
+    engine = WatchEngine({"watch": {"price_up_pct": 100}}, fetcher=fake, on_alert=alerts.append)
+    engine.add("MintA", now=0.0)
+
+    t = 0.0
+    for price, liquidity in [(1.0, 1000), (2.5, 1000), (3.0, 1000), (1.0, 1000), (2.0, 50)]:
+        fake.prices["MintA"] = (price, liquidity)
+        t = engine.tokens["MintA"].next_due
+        engine.poll_once(now=t)
+
+    assert [a["kind"] for a in alerts] == ["price_up", "price_up", "liquidity_drop", "rugged"]
+
+
+def test_zero_request_budget_pauses_polling():
+    """Test max_requests_per_minute: 0 waits for stop instead of dividing by zero"""
+    engine = WatchEngine({"watch": {"max_requests_per_minute": 0}}, fetcher=FakeDexscreener(), on_alert=lambda a: None)
+    engine._bucket = 0.0
+    threading.Timer(0.05, engine._stop.set).start()
+    engine._wait_for_budget()
+    assert engine._stop.is_set()